@@ -0,0 +1,52 @@
+"""
+Measure how long a fresh interpreter takes to import valid_model.
+
+Each statement is run in a new process so nothing is cached in sys.modules;
+the interpreter startup time is measured separately and subtracted.
+
+    python benchmarks/import_time.py [--runs N]
+"""
+from __future__ import print_function
+
+import argparse
+import os
+import subprocess
+import sys
+import timeit
+
+STATEMENTS = [
+    ('baseline', 'pass'),
+    ('import valid_model', 'import valid_model'),
+    ('from valid_model import Object', 'from valid_model import Object'),
+    ('import valid_model.descriptors', 'import valid_model.descriptors'),
+]
+
+
+def run(statement, runs):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    command = [sys.executable, '-c', 'import sys; sys.path.insert(0, {!r}); {}'.format(root, statement)]
+    timings = []
+    for _ in range(runs):
+        start = timeit.default_timer()
+        subprocess.check_call(command)
+        timings.append(timeit.default_timer() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    baseline = None
+    for label, statement in STATEMENTS:
+        best = run(statement, args.runs)
+        if baseline is None:
+            baseline = best
+            print('{:<40} {:8.2f} ms'.format('interpreter startup', best * 1000))
+        else:
+            print('{:<40} {:8.2f} ms'.format(label, (best - baseline) * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Measure how construction and validation scale with threads.
+
+Runs the same amount of work on thread pools of increasing size and reports
+the throughput of each.  On a regular CPython build the GIL keeps throughput
+roughly flat; on a free-threaded build (3.13t and later) it should grow with
+the number of threads.  Runtime subclassing is included to stress class
+creation.
+
+    python benchmarks/threads.py [--ops N] [--threads 1,2,4,8]
+"""
+from __future__ import print_function
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from valid_model import Object  # noqa: E402
+from valid_model.base import ObjectMeta  # noqa: E402
+from valid_model.descriptors import (  # noqa: E402
+    Bool, EmbeddedObject, Float, Integer, List, String
+)
+
+
+class Address(Object):
+    street = String(nullable=False)
+    number = Integer(validator=lambda x: x > 0)
+
+
+class Person(Object):
+    name = String(nullable=False, mutator=lambda x: x.strip())
+    age = Integer()
+    score = Float()
+    active = Bool()
+    address = EmbeddedObject(Address)
+    tags = List(value=String())
+
+
+DOC = {
+    'name': ' someone ',
+    'age': 30,
+    'score': 1.5,
+    'active': True,
+    'address': {'street': 'main', 'number': 5},
+    'tags': ['a', 'b', 'c'],
+}
+
+
+def construct_and_validate(count):
+    for _ in range(count):
+        Person(**DOC).validate()
+
+
+def subclass(count):
+    for i in range(count):
+        cls = ObjectMeta(str('Tenant'), (Person,), {'tenant': Integer(default=i)})
+        cls(**DOC).validate()
+
+
+def run(work, ops, threads):
+    per_thread = ops // threads
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        start = timeit.default_timer()
+        futures = [pool.submit(work, per_thread) for _ in range(threads)]
+        for future in futures:
+            future.result()
+        elapsed = timeit.default_timer() - start
+    return per_thread * threads / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--ops', type=int, default=20000)
+    parser.add_argument('--threads', default='1,2,4,8')
+    args = parser.parse_args()
+
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', lambda: True)
+    print('python {} GIL {}'.format(
+        sys.version.split()[0], 'enabled' if is_gil_enabled() else 'disabled'
+    ))
+    for label, work, ops in (
+            ('construct+validate', construct_and_validate, args.ops),
+            ('subclass+construct', subclass, args.ops // 10)):
+        base = None
+        for threads in [int(n) for n in args.threads.split(',')]:
+            rate = run(work, ops, threads)
+            base = base or rate
+            print('{:<20} {:>2} threads {:>10.0f} ops/s  x{:.2f}'.format(
+                label, threads, rate, rate / base
+            ))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,13 @@
+from collections import OrderedDict
+import operator
+import threading
+import types
+import weakref
+
+import six
+
 from valid_model.utils import is_descriptor
 from valid_model.descriptors import *
-import types
 
 #TODO: figure how to bind C* functions such as NOW() to a value
 
@@ -27,7 +34,7 @@ def apply_cassandra_model_patch():
 #apply_cassandra_model_patch()
 
 def convert_field(col):
-    if isinstance(col, basestring):
+    if isinstance(col, six.string_types):
         col_str = col
     elif is_descriptor(col):
         col_str = col.name
@@ -35,13 +42,113 @@ def convert_field(col):
         raise TypeError('columns must be listed as a string or descriptor')
     return col_str
 
+class CachedStatement(object):
+    "Query text and the order its parameters must be bound in"
+    __slots__ = ('query', 'parameter_order', 'prepared')
+
+    def __init__(self, query, parameter_order):
+        self.query = query
+        self.parameter_order = tuple(parameter_order)
+        # prepared statements by session; dropped with the session, whose id
+        # a later session could reuse
+        self.prepared = weakref.WeakKeyDictionary()
+
+
+class StatementCache(object):
+    """
+    LRU cache of generated CQL keyed by table, column set and options.
+
+    The query text for a given model and option set never changes so it is
+    built once and every later call only has to bind the parameters.
+    """
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, build):
+        "Return the CachedStatement for key, calling build() on a miss"
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._entries[key] = entry
+                return entry
+        query, parameter_order = build()
+        entry = CachedStatement(query, parameter_order)
+        with self._lock:
+            self._entries[key] = entry
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return entry
+
+    def prepare(self, session, entry):
+        "Prepare entry on session once and reuse the result afterwards"
+        prepared = entry.prepared.get(session)
+        if prepared is None:
+            prepared = entry.prepared[session] = session.prepare(entry.query)
+        return prepared
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+statement_cache = StatementCache()
+
 class QueryBuilder(object):
-    def __init__(self, tablename):
+    cache = statement_cache
+
+    def __init__(self, tablename, cache=None):
         self.tablename = tablename
+        if cache is not None:
+            self.cache = cache
+
+    def cache_key(self):
+        raise NotImplementedError('cache_key')
+
+    def build(self):
+        "Return the query text and the names of its parameters in order"
+        raise NotImplementedError('build')
+
+    def bind(self, parameter_order):
+        "Return the parameter values in parameter_order"
+        raise NotImplementedError('bind')
+
+    def cached(self):
+        return self.cache.get(self.cache_key(), self.build)
+
+    def statement(self):
+        entry = self.cached()
+        return entry.query, self.bind(entry.parameter_order)
+
+    def execute(self, session):
+        "Prepare the statement once per session and execute it"
+        entry = self.cached()
+        prepared = self.cache.prepare(session, entry)
+        return session.execute(prepared, self.bind(entry.parameter_order))
+
+def option_names(options):
+    "The part of the cache key for USING options, whose values are bound"
+    return tuple(name for name, _ in options)
+
+def option_parameters(options):
+    "Names of the USING option parameters, as the driver gives bind markers"
+    return ['[{}]'.format(name.lower()) for name, _ in options]
+
+def using_clause(options):
+    return ' USING {}'.format(' AND '.join('{} %s'.format(name) for name, _ in options))
 
 class Insert(QueryBuilder):
-    def __init__(self, table):
-        QueryBuilder.__init__(self, table)
+    def __init__(self, table, cache=None):
+        QueryBuilder.__init__(self, table, cache)
         self.pieces = {
             'columns': [],
             'if_ne': False,
@@ -58,33 +165,43 @@ class Insert(QueryBuilder):
         return self
 
     def ttl(self, live):
-        self.pieces['options'].append('TTL {}'.format(live))
+        self.pieces['options'].append(('TTL', live))
         return self
 
     def timestamp(self, ts):
-        self.pieces['options'].append('TIMESTAMP {}'.format(ts))
+        self.pieces['options'].append(('TIMESTAMP', ts))
         return self
 
     def if_not_exists(self, value=True):
         self.pieces['if_ne'] = value
         return self
 
-    def statement(self):
-        columns = self.pieces['columns']
+    def cache_key(self):
+        return (
+            'INSERT',
+            self.tablename,
+            tuple(name for name, _ in self.pieces['columns']),
+            self.pieces['if_ne'],
+            option_names(self.pieces['options']),
+        )
+
+    def build(self):
+        names = [name for name, _ in self.pieces['columns']]
         query = 'INSERT INTO {}'.format(self.tablename)
-        query += ' ({})'.format(','.join(name for name, _ in columns))
-        query += ' VALUES ({})'.format(','.join('%s' for name, _ in columns))
+        query += ' ({})'.format(','.join(names))
+        query += ' VALUES ({})'.format(','.join('%s' for _ in names))
         if self.pieces['if_ne']:
             query += ' IF NOT EXISTS'
 
         if self.pieces['options']:
-            query += ' USING {}'.format(' AND '.join(self.pieces['options']))
+            query += using_clause(self.pieces['options'])
+        return query, names + option_parameters(self.pieces['options'])
 
-        parameters = [value for _, value in columns]
-        return query, parameters
+    def bind(self, parameter_order):
+        return [value for _, value in self.pieces['columns'] + self.pieces['options']]
 
-def insert(table, obj, ttl=None, timestamp=None, if_not_exists=False):
-    query = Insert(table)
+def insert_query(table, obj, ttl=None, timestamp=None, if_not_exists=False, cache=None):
+    query = Insert(table, cache)
     if ttl:
         query = query.ttl(ttl)
     if if_not_exists:
@@ -94,7 +211,10 @@ def insert(table, obj, ttl=None, timestamp=None, if_not_exists=False):
     model = obj.__class__
     for field in model.field_names:
         query = query.add_column(field, getattr(obj, field))
-    return query.statement()
+    return query
+
+def insert(table, obj, ttl=None, timestamp=None, if_not_exists=False, cache=None):
+    return insert_query(table, obj, ttl, timestamp, if_not_exists, cache).statement()
 
 class Delete(QueryBuilder):
     """
@@ -117,37 +237,52 @@ class Delete(QueryBuilder):
     <condition> ::= <identifier> '=' <term>
                   | <identifier> '[' <term> ']' '=' <term>
     """
-    def __init__(self, table):
-        QueryBuilder.__init__(self, table)
+    def __init__(self, table, cache=None):
+        QueryBuilder.__init__(self, table, cache)
         self.pieces = {
             'selection': set(),
             'where': [],
+            'where_fields': [],
             'options': [],
             'conditions':[],
         }
+        self.parameters = []
 
     def timestamp(self, ts):
-        self.pieces['options'].append('TIMESTAMP {}'.format(ts))
+        self.pieces['options'].append(('TIMESTAMP', ts))
         return self
 
     def where(self, expression):
         self.pieces['where'].append(where_clause(self, expression))
+        self.pieces['where_fields'].append(expression[0])
         return self
 
-    def statement(self):
+    def cache_key(self):
+        return (
+            'DELETE',
+            self.tablename,
+            tuple(sorted(self.pieces['selection'])),
+            tuple(self.pieces['where']),
+            option_names(self.pieces['options']),
+        )
+
+    def build(self):
         query = 'DELETE '
         if self.pieces['selection']:
-            query += ','.join(self.pieces['selection'])
+            query += ','.join(sorted(self.pieces['selection']))
         query += ' FROM {}'.format(self.tablename)
         if self.pieces['options']:
-            query += ' USING {}'.format(' AND '.join(self.pieces['options']))
+            query += using_clause(self.pieces['options'])
         query += ' WHERE {}'.format(' AND '.join(self.pieces['where']))
         if self.pieces['conditions']:
             pass
 
         #where
         #conditions
-        return query
+        return query, option_parameters(self.pieces['options']) + self.pieces['where_fields']
+
+    def bind(self, parameter_order):
+        return [value for _, value in self.pieces['options']] + self.parameters
 
     def add_selections(self, columns_list):
         self.pieces['selection'].update(convert_field(col) for col in columns_list)
@@ -170,21 +305,28 @@ _type_map = {
     DateTime: 'timestamp',
 }
 _container_map = {
-    ObjectList: lambda x: 'list',
-    ObjectDict: lambda x: 'map',
     EmbeddedObject: lambda x: x.class_obj.__name__.lower(),
     List: lambda x: 'list',
     Set: lambda x: 'set',
     Dict: lambda x: 'map',
 }
+def cassandra_table(cls):
+    tablename = getattr(cls, '__cassandra_table__', cls.__name__.lower())
+    if not tablename:
+        raise ValueError('__cassandra_table__ must be defined with a non-empty string')
+    return tablename
+
+def cassandra_partition(cls):
+    "Return the (partition key, clustering columns) pair for cls"
+    partition = getattr(cls, '__cassandra_partition__', None) or ([field for field in cls.field_names if not getattr(cls, field).nullable], tuple())
+    if not partition:
+        raise ValueError('__cassandra_partition__ must be defined as a tuple of 2 tuples')
+    return partition
+
 def cassandra_model(klass):
     def generate_ddl(cls):
-        tablename = getattr(cls, '__cassandra_table__', cls.__name__.lower())
-        if not tablename:
-            raise ValueError('__cassandra_table__ must be defined with a non-empty string')
-        partition = getattr(cls, '__cassandra_partition__', None) or ([field for field in cls.field_names if not getattr(cls, field).nullable], tuple())
-        if not partition:
-            raise ValueError('__cassandra_partition__ must be defined as a tuple of 2 tuples')
+        tablename = cassandra_table(cls)
+        partition = cassandra_partition(cls)
         ordering = getattr(cls, '__cassandra_order__', None) or None
         options = getattr(cls, '__cassandra_options__', None) or []
         columns = {}
@@ -211,7 +353,7 @@ def cassandra_model(klass):
                 columns[field] = _type_map[desc_class]
 
         ddl = "CREATE TABLE {} (".format(tablename)
-        for name, type_ in columns.iteritems():
+        for name, type_ in six.iteritems(columns):
             ddl += "\n\t{} {},".format(name, type_)
         ddl += "\n\tPRIMARY KEY (({})".format(','.join(partition[0]))
         if partition[1]:
@@ -234,6 +376,105 @@ def cassandra_model(klass):
     return klass
 
 
+class BatchInsert(object):
+    """
+    Group many instances of one model into `BEGIN UNLOGGED BATCH` blocks.
+
+    The column order, the INSERT text and the function pulling parameters out
+    of an instance are computed once for the model.  Batches hold at most
+    `max_size` rows and, with `by_partition`, only rows sharing the partition
+    key reported by `cassandra_partition`.
+    """
+    def __init__(self, model, table=None, max_size=50, by_partition=False,
+                 validate=True, cache=None):
+        if max_size < 1:
+            raise ValueError('max_size must be a positive number')
+        self.model = model
+        self.table = table or cassandra_table(model)
+        self.max_size = max_size
+        self.validate = validate
+        self.cache = cache if cache is not None else statement_cache
+        self.columns = tuple(sorted(model.field_names))
+        self.insert = Insert(self.table, self.cache).add_columns(
+            (column, None) for column in self.columns
+        ).cached().query
+        self._row = self._getter(self.columns)
+        if by_partition:
+            self._partition = self._getter(tuple(cassandra_partition(model)[0]))
+        else:
+            self._partition = None
+
+    @staticmethod
+    def _getter(columns):
+        "Return a function pulling the values of columns out of an instance"
+        # through the descriptors, as stored values may be e.g. Choice codes
+        # or undecoded lazy strings
+        get = operator.attrgetter(*columns)
+        if len(columns) == 1:
+            return lambda obj: (get(obj),)
+        return get
+
+    def validated(self, objects):
+        "Yield each of objects after checking its type and validating it"
+        for obj in objects:
+            if not isinstance(obj, self.model):
+                raise TypeError('expected an instance of {}'.format(self.model.__name__))
+            if self.validate:
+                obj.validate()
+            yield obj
+
+    def statement(self, size):
+        key = ('BATCH', self.table, self.columns, size)
+        return self.cache.get(key, lambda: (
+            'BEGIN UNLOGGED BATCH\n{};\nAPPLY BATCH'.format(';\n'.join([self.insert] * size)),
+            self.columns * size
+        ))
+
+    def _flush(self, rows):
+        entry = self.statement(len(rows))
+        parameters = []
+        for row in rows:
+            parameters.extend(row)
+        return entry, parameters
+
+    def _batches(self, objects):
+        row = self._row
+        if self._partition is None:
+            pending = []
+            for obj in self.validated(objects):
+                pending.append(row(obj))
+                if len(pending) == self.max_size:
+                    yield self._flush(pending)
+                    pending = []
+            if pending:
+                yield self._flush(pending)
+            return
+
+        groups = OrderedDict()
+        partition = self._partition
+        for obj in self.validated(objects):
+            pending = groups.setdefault(partition(obj), [])
+            pending.append(row(obj))
+            if len(pending) == self.max_size:
+                yield self._flush(pending)
+                del groups[partition(obj)]
+        for pending in six.itervalues(groups):
+            yield self._flush(pending)
+
+    def batches(self, objects):
+        "Yield (query, parameters) for each batch of objects"
+        for entry, parameters in self._batches(objects):
+            yield entry.query, parameters
+
+    def execute(self, session, objects):
+        "Prepare each distinct batch size once and execute every batch"
+        results = []
+        for entry, parameters in self._batches(objects):
+            prepared = self.cache.prepare(session, entry)
+            results.append(session.execute(prepared, parameters))
+        return results
+
+
 '''
 ########## NOT DONE START ###############
 
@@ -20,12 +20,10 @@ setup(name='valid_model',
       author_email='josh@yoshrote.com',
       url='https://github.com/yoshrote/valid_model',
       license='MIT',
-      packages=find_packages(exclude=['ez_setup', 'examples', 'tests']),
+      packages=find_packages(exclude=['ez_setup', 'examples', 'tests', 'benchmarks']),
       include_package_data=True,
       zip_safe=False,
-      install_requires=[
-            'six'
-      ],
+      install_requires=[],
       entry_points="""
       # -*- Entry points: -*-
       """,
@@ -22,6 +22,50 @@ class TestValidationError(unittest.TestCase):
             repr(self._make_one('foo', 'bar')),
             "ValidationError({0}'foo', {0}'bar')".format('u' if six.PY2 else ''))
 
+    def test_lazy_message(self):
+        from valid_model import ValidationError
+
+        class Expensive(object):
+            calls = 0
+
+            def __repr__(self):
+                Expensive.calls += 1
+                return '<expensive>'
+
+        error = ValidationError(field='x', value=Expensive(), reason='type', expected='an int')
+        error.push('outer')
+        self.assertEqual(Expensive.calls, 0)
+        self.assertEqual(error.path, ['outer', 'x'])
+        self.assertEqual(six.text_type(error), 'outer.x: <expensive> is not an int')
+        self.assertEqual(error.msg, '<expensive> is not an int')
+        self.assertEqual(Expensive.calls, 1)
+
+    def test_nested_paths(self):
+        from valid_model import Object, ValidationError
+        from valid_model.descriptors import Dict, EmbeddedObject, Integer, List
+
+        class Bar(Object):
+            x = Integer(validator=lambda x: x > 0)
+
+        class Foo(Object):
+            bar = EmbeddedObject(Bar)
+            bars = List(value=EmbeddedObject(Bar))
+            by_key = Dict(key=Integer(), value=EmbeddedObject(Bar))
+
+        cases = [
+            ({'bar': {'x': 0}}, 'bar.x', 'invalid'),
+            ({'bars': [{}, {'x': 'a'}]}, 'bars[1].x', 'type'),
+            ({'by_key': {1: {'x': -1}}}, "by_key['1'].x", 'invalid'),
+            ({'by_key': {'a': {}}}, 'by_key key a', 'type'),
+        ]
+        for doc, field, reason in cases:
+            try:
+                Foo(**doc)
+            except ValidationError as ex:
+                self.assertEqual((ex.field, ex.reason), (field, reason))
+            else:  # pragma: no cover
+                self.fail('{!r} should not validate'.format(doc))
+
 
 class TestObject(unittest.TestCase):
     @staticmethod
@@ -255,6 +299,45 @@ class TestObject(unittest.TestCase):
         Foo = self._make_one()
         self.assertEqual(str(Foo.basic), 'basic')
 
+    def test_descriptor_reused(self):
+        from valid_model.base import ObjectMeta
+        from valid_model.descriptors import Integer
+        shared = Integer()
+        Foo = ObjectMeta(str('Foo'), (Object,), {'a': shared})
+        Bar = ObjectMeta(str('Bar'), (Object,), {'b': shared})
+        self.assertIs(Foo.a, shared)
+        self.assertIsNot(Bar.b, shared)
+        self.assertEqual((Foo.a.name, Bar.b.name), ('a', 'b'))
+        self.assertEqual(Bar(b=5).__json__(), {'b': 5})
+        self.assertEqual(Foo(a=4).__json__(), {'a': 4})
+
+    def test_threaded_class_creation(self):
+        import threading
+        from valid_model.base import ObjectMeta
+        from valid_model.descriptors import Integer, String
+        shared = {'x': Integer(), 'y': String()}
+        Parent = ObjectMeta(str('Parent'), (Object,), {'base': Integer()})
+        errors = []
+
+        def worker(n):
+            try:
+                for i in range(50):
+                    name = 'f{}_{}'.format(n, i)
+                    attrs = {name: shared['x' if i % 2 else 'y']}
+                    cls = ObjectMeta(str('C'), (Parent,), attrs)
+                    if getattr(cls, name).name != name or cls.base.name != 'base':
+                        errors.append(name)
+                    cls(**{name: i if i % 2 else str(i), 'base': n}).validate()
+            except Exception as ex:  # pragma: no cover
+                errors.append(ex)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
     def test___str__(self):
         Foo = self._make_one()
         instance = Foo(basic='test')
@@ -309,6 +392,42 @@ class TestGeneric(unittest.TestCase):
         self.assertRaises(ValidationError, setattr, instance, 'test', 'NaN')
 
 
+class TestFastPath(unittest.TestCase):
+    def test_exact_type_still_validated(self):
+        from valid_model import Object, ValidationError
+        from valid_model.descriptors import Bool, Integer, String
+
+        class Foo(Object):
+            plain = Integer()
+            checked = Integer(validator=lambda x: x > 0)
+            mutated = String(mutator=lambda x: x.upper())
+            required = Bool(nullable=False)
+
+        instance = Foo(required=False)
+        instance.plain = 5
+        self.assertRaises(ValidationError, setattr, instance, 'checked', 0)
+        instance.mutated = 'abc'
+        self.assertEqual(instance.mutated, 'ABC')
+        self.assertRaises(ValidationError, setattr, instance, 'required', None)
+        self.assertEqual((Foo.plain._fast_type, Foo.checked._fast_type), (int, None))
+
+    def test_subclasses_take_slow_path(self):
+        from valid_model import Object
+        from valid_model.descriptors import Integer, String
+
+        class Text(six.text_type):
+            pass
+
+        class Foo(Object):
+            number = Integer()
+            text = String()
+
+        instance = Foo(number=1, text=Text('a'))
+        self.assertIsInstance(instance.text, Text)
+        instance.number = 2.9
+        self.assertIs(type(instance.number), int)
+
+
 class TestEmbeddedObject(unittest.TestCase):
     @staticmethod
     def _make_one():
@@ -324,6 +443,93 @@ class TestEmbeddedObject(unittest.TestCase):
         del instance.test
         self.assertEqual(instance.test, None)
 
+    @staticmethod
+    def _make_lazy():
+        from valid_model.descriptors import EmbeddedObject, Integer, List
+        from valid_model import Object
+
+        built = []
+
+        class Leaf(Object):
+            t1 = Integer(nullable=False)
+
+            def __init__(self, **kwargs):
+                built.append(kwargs)
+                Object.__init__(self, **kwargs)
+
+        class Foo(Object):
+            number = Integer()
+            embedded = EmbeddedObject(Leaf, lazy=True)
+            many = List(value=EmbeddedObject(Leaf, lazy=True))
+        return Foo, Leaf, built
+
+    def test_lazy_builds_on_first_read(self):
+        Foo, Leaf, built = self._make_lazy()
+        instance = Foo(number=1, embedded={'t1': 2})
+        self.assertEqual(instance.number, 1)
+        self.assertEqual(built, [])
+        embedded = instance.embedded
+        self.assertIsInstance(embedded, Leaf)
+        self.assertEqual(embedded.t1, 2)
+        self.assertIs(instance.embedded, embedded)
+        self.assertEqual(len(built), 1)
+
+    def test_lazy_error_path(self):
+        from valid_model import ValidationError
+        Foo, _, _ = self._make_lazy()
+        instance = Foo(embedded={'t1': 'x'})
+        with self.assertRaises(ValidationError) as ctx:
+            instance.embedded
+        self.assertEqual(ctx.exception.field, 'embedded.t1')
+        with self.assertRaises(ValidationError) as ctx:
+            Foo(embedded={'t1': 'x'}).validate()
+        self.assertEqual(ctx.exception.field, 'embedded.t1')
+        with self.assertRaises(ValidationError) as ctx:
+            Foo(embedded={'t1': 'x'}).__json__()
+        self.assertEqual(ctx.exception.field, 'embedded.t1')
+        with self.assertRaises(ValidationError) as ctx:
+            str(Foo(embedded={'t1': 'x'}))
+        self.assertEqual(ctx.exception.field, 'embedded.t1')
+
+    def test_lazy_stream(self):
+        import io
+        import json
+        from valid_model import ValidationError
+        from valid_model.jsonstream import dump
+        Foo, Leaf, _ = self._make_lazy()
+        instance = Foo(embedded={'t1': 2})
+        out = io.StringIO()
+        dump(instance, out)
+        self.assertEqual(json.loads(out.getvalue())['embedded'], {'t1': 2})
+        # built once and kept, as when the field is read
+        self.assertIsInstance(instance._fields['embedded'], Leaf)
+        with self.assertRaises(ValidationError) as ctx:
+            dump(Foo(embedded={'t1': 'x'}), io.StringIO())
+        self.assertEqual(ctx.exception.field, 'embedded.t1')
+
+    def test_lazy_json_validate_and_collect(self):
+        from valid_model import ErrorReport
+        Foo, Leaf, built = self._make_lazy()
+        instance = Foo(embedded={'t1': 2})
+        self.assertEqual(instance.__json__()['embedded'], {'t1': 2})
+        self.assertEqual(len(built), 1)
+        instance.validate()
+        self.assertIsInstance(instance._fields['embedded'], Leaf)
+        self.assertEqual(len(built), 1)
+
+        errors = ErrorReport()
+        Foo(embedded={'t1': 'x'}).collect_errors(errors)
+        self.assertEqual(list(errors.as_dict()), ['embedded.t1'])
+
+    def test_lazy_construct_and_collections(self):
+        Foo, Leaf, built = self._make_lazy()
+        instance = Foo.construct({'embedded': {'t1': 'trusted'}})
+        self.assertEqual(built, [])
+        self.assertEqual(instance.embedded.t1, 'trusted')
+        self.assertEqual(built, [])
+        instance = Foo(many=[{'t1': 1}])
+        self.assertIsInstance(instance.many[0], Leaf)
+
 
 class TestObjectList(unittest.TestCase):
     @staticmethod
@@ -388,12 +594,15 @@ class TestObjectDict(unittest.TestCase):
 
 class TestString(unittest.TestCase):
     @staticmethod
-    def _make_one(default=None, validator=None, mutator=None):
+    def _make_one(default=None, validator=None, mutator=None, max_length=None, lazy=False):
         from valid_model.descriptors import String
         from valid_model import Object
 
         class Foo(Object):
-            test = String(default=default, validator=validator, mutator=mutator)
+            test = String(
+                default=default, validator=validator, mutator=mutator,
+                max_length=max_length, lazy=lazy
+            )
         return Foo()
 
     def test___set___validator(self):
@@ -403,6 +612,100 @@ class TestString(unittest.TestCase):
         instance.test = 'hello'.encode('utf-8')
         self.assertTrue(isinstance(instance.test, six.text_type))
         self.assertRaises(ValidationError, setattr, instance, 'test', 10)
+        with self.assertRaises(ValidationError) as cm:
+            instance.test = b'\xff'
+        self.assertEqual(cm.exception.reason, 'encoding')
+
+    def test___set___max_length(self):
+        from valid_model import ValidationError
+        instance = self._make_one(max_length=3)
+        instance.test = 'abc'
+        self.assertRaises(ValidationError, setattr, instance, 'test', 'abcd')
+        instance = self._make_one(max_length=3, lazy=True)
+        # three characters in more than three bytes is decoded to be counted
+        instance.test = '\xe9\xe9\xe9'.encode('utf-8')
+        self.assertEqual(instance._fields['test'], '\xe9\xe9\xe9')
+        too_long = ('\xe9' * 4).encode('utf-8')
+        self.assertRaises(ValidationError, setattr, instance, 'test', too_long)
+        self.assertRaises(ValidationError, setattr, instance, 'test', b'a' * 13)
+
+    def test_lazy(self):
+        from valid_model import ValidationError
+        from valid_model.descriptors import LazyText
+        instance = self._make_one(lazy=True)
+        payload = bytearray('caf\xe9'.encode('utf-8'))
+        instance.test = payload
+        stored = instance._fields['test']
+        self.assertIsInstance(stored, LazyText)
+        self.assertIs(stored.raw, payload)
+        self.assertIs(instance.__class__.test.raw_value(instance), payload)
+        self.assertEqual(instance.__json__(), {'test': 'caf\xe9'})
+        self.assertEqual(instance.test, 'caf\xe9')
+        self.assertEqual(instance._fields['test'], 'caf\xe9')
+        # only lazy Strings check reads for undecoded values
+        from valid_model.base import Generic
+        from valid_model.descriptors import LazyString, String
+        self.assertIs(type(instance.__class__.test), LazyString)
+        self.assertIs(String.__get__, Generic.__get__)
+        self.assertIs(type(String(lazy=False)), String)
+        self.assertRaises(TypeError, String, None, None, None, True, None, True)
+
+        class Eager(String):
+            pass
+
+        class Lazy(LazyString):
+            pass
+        self.assertRaises(TypeError, Eager, lazy=True)
+        self.assertTrue(Lazy(max_length=3).lazy)
+        eager = self._make_one()
+        eager.test = bytes(payload)
+        self.assertEqual(eager._fields['test'], 'caf\xe9')
+        self.assertEqual(instance.__class__.test.raw_value(instance), b'caf\xc3\xa9')
+
+        instance.test = memoryview(b'\xff')
+        self.assertRaises(ValidationError, getattr, instance, 'test')
+        self.assertRaises(ValidationError, instance.validate)
+        self.assertEqual(len(instance.collect_errors()), 1)
+
+        instance = self._make_one(lazy=True, mutator=lambda value: value.upper())
+        instance.test = b'abc'
+        self.assertEqual(instance._fields['test'], 'ABC')
+
+    def test_lazy_pickle(self):
+        import pickle
+        from valid_model.descriptors import LazyText
+        value = pickle.loads(pickle.dumps(LazyText(memoryview(b'abc'))))
+        self.assertEqual(value.raw, b'abc')
+
+
+class TestBytes(unittest.TestCase):
+    @staticmethod
+    def _make_one(default=None, validator=None, mutator=None, max_length=None):
+        from valid_model.descriptors import Bytes
+        from valid_model import Object
+
+        class Foo(Object):
+            test = Bytes(
+                default=default, validator=validator, mutator=mutator, max_length=max_length
+            )
+        return Foo()
+
+    def test___set___validator(self):
+        from valid_model import ValidationError
+        instance = self._make_one()
+        for value in (b'abc', bytearray(b'abc'), memoryview(b'abc'), None):
+            instance.test = value
+            self.assertIs(instance.test, value)
+        self.assertRaises(ValidationError, setattr, instance, 'test', 'abc')
+        self.assertRaises(ValidationError, setattr, instance, 'test', 10)
+
+    def test___set___max_length(self):
+        from valid_model import ValidationError
+        instance = self._make_one(max_length=3)
+        instance.test = memoryview(b'abc')
+        with self.assertRaises(ValidationError) as cm:
+            instance.test = memoryview(bytearray(b'abcd'))
+        self.assertEqual(str(cm.exception), 'test: value is longer than 3')
 
 
 class TestInteger(unittest.TestCase):
@@ -448,6 +751,9 @@ class TestFloat(unittest.TestCase):
         self.assertEqual(instance.test, 5.0)
         instance.test = 10
         self.assertEqual(instance.test, 10.0)
+        self.assertIsInstance(instance.test, float)
+        instance.test = 3.5
+        self.assertEqual(instance.test, 3.5)
         instance.test = None
         self.assertEqual(instance.test, None)
         self.assertRaises(ValidationError, setattr, instance, 'test', True)
@@ -483,15 +789,115 @@ class TestBool(unittest.TestCase):
         self.assertRaises(ValidationError, setattr, instance, 'test', object())
 
 
+class TestChoice(unittest.TestCase):
+    @staticmethod
+    def _make_one(choices=('red', 'green'), aliases=None, case_insensitive=False,
+                  store_code=False, default=None, validator=None, mutator=None):
+        from valid_model.descriptors import Choice
+        from valid_model import Object
+
+        class Foo(Object):
+            test = Choice(
+                choices, aliases=aliases, case_insensitive=case_insensitive,
+                store_code=store_code, default=default, validator=validator, mutator=mutator
+            )
+        return Foo()
+
+    def test___set___validator(self):
+        from valid_model import ValidationError
+        instance = self._make_one(aliases={'r': 'red'})
+        instance.test = 'green'
+        self.assertEqual(instance.test, 'green')
+        instance.test = ''.join(['r'])
+        self.assertIs(instance.test, self._make_one(default='red').test)
+        instance.test = None
+        self.assertIsNone(instance.test)
+        with self.assertRaises(ValidationError) as cm:
+            instance.test = 'blue'
+        self.assertEqual(str(cm.exception), "test: 'blue' is not one of ['red', 'green']")
+        self.assertRaises(ValidationError, setattr, instance, 'test', ['red'])
+        self.assertRaises(ValidationError, setattr, instance, 'test', 'RED')
+
+    def test_case_insensitive(self):
+        instance = self._make_one(aliases={'Rouge': 'red'}, case_insensitive=True)
+        instance.test = 'GREEN'
+        self.assertEqual(instance.test, 'green')
+        instance.test = 'ROUGE'
+        self.assertEqual(instance.test, 'red')
+        self.assertRaises(
+            ValueError, self._make_one, choices=['a', 'A'], case_insensitive=True
+        )
+
+    def test_bad_options(self):
+        self.assertRaises(ValueError, self._make_one, choices=['a', 'a'])
+        self.assertRaises(ValueError, self._make_one, aliases={'x': 'blue'})
+        self.assertRaises(ValueError, self._make_one, choices=[1, 2], store_code=True)
+
+    def test_store_code(self):
+        from valid_model import ValidationError
+        instance = self._make_one(store_code=True, default='green')
+        self.assertEqual(instance._fields['test'], 1)
+        self.assertEqual(instance.test, 'green')
+        instance.test = 'red'
+        self.assertEqual(instance._fields['test'], 0)
+        self.assertEqual(instance.__json__(), {'test': 'red'})
+        instance.validate()
+        self.assertEqual(instance.test, 'red')
+        self.assertRaises(ValidationError, setattr, instance, 'test', 2)
+        # codes are only read back from storage, never accepted as input
+        self.assertRaises(ValidationError, setattr, instance, 'test', 1)
+        self.assertRaises(ValidationError, type(instance), test=0)
+        self.assertEqual(len(instance.collect_errors()), 0)
+        self.assertEqual(type(instance).construct({'test': 'green'})._fields['test'], 1)
+
+    def test_mutator_validator(self):
+        from valid_model import ValidationError
+        instance = self._make_one(validator=lambda value: value != 'green')
+        instance.test = 'red'
+        self.assertRaises(ValidationError, setattr, instance, 'test', 'green')
+        instance = self._make_one(mutator=lambda value: value + '!', store_code=True)
+        self.assertRaises(ValidationError, setattr, instance, 'test', 'red')
+
+    def test_collection(self):
+        from valid_model.descriptors import Choice, Dict, List
+        coded = Choice(['red', 'green'], store_code=True)
+        # collections would hand out the codes
+        self.assertRaises(ValueError, List, value=coded)
+        self.assertRaises(ValueError, Dict, key=coded)
+        self.assertRaises(ValueError, Dict, value=coded)
+        List(value=Choice(['red', 'green']))
+
+    def test_round_trip(self):
+        from valid_model import Object
+        from valid_model.columns import from_columns, to_columns
+        from valid_model.descriptors import Choice
+
+        class Foo(Object):
+            test = Choice(['red', 'green', 'blue'], store_code=True)
+        instance = Foo(test='blue')
+        instance.test = instance.test
+        copied = Foo(test=instance.test)
+        self.assertEqual((copied.test, copied._fields['test']), ('blue', 2))
+        self.assertEqual(len(instance.collect_errors()), 0)
+        columns = to_columns([instance])
+        self.assertEqual(columns, {'test': ['blue']})
+        self.assertEqual(from_columns(Foo, columns)[0]._fields['test'], 2)
+        from valid_model.transport import SharedBatch, shared_memory
+        if shared_memory is not None:
+            unpacked, = SharedBatch.pack([instance], validated=False).unpack()
+            self.assertEqual(unpacked.test, 'blue')
+
+
 class TestDateTime(unittest.TestCase):
     @staticmethod
-    def _make_one(default=None, validator=None, mutator=None):
+    def _make_one(default=None, validator=None, mutator=None, parse=None, json_format=None):
         from valid_model.descriptors import DateTime
         from valid_model import Object
 
         class Foo(Object):
             test = DateTime(
-                default=default, validator=validator, mutator=mutator
+                default=default, validator=validator, mutator=mutator,
+                parse=parse, json_format=json_format
             )
         return Foo()
 
@@ -504,16 +910,111 @@ class TestDateTime(unittest.TestCase):
         self.assertEqual(instance.test, today)
         self.assertRaises(ValidationError, setattr, instance, 'test', 10)
 
+    def test___set___parse_iso8601(self):
+        from valid_model import ValidationError
+        from datetime import datetime
+        instance = self._make_one(parse='iso8601')
+        instance.test = '2020-02-03T04:05:06.789Z'
+        self.assertEqual(instance.test, datetime(2020, 2, 3, 4, 5, 6, 789000))
+        instance.test = '2020-02-03T04:05:06+02:00'
+        self.assertEqual(instance.test, datetime(2020, 2, 3, 2, 5, 6))
+        instance.test = '2020-02-03'
+        self.assertEqual(instance.test, datetime(2020, 2, 3))
+        self.assertRaises(ValidationError, setattr, instance, 'test', 'yesterday')
+        self.assertRaises(ValidationError, setattr, instance, 'test', 10)
+        self.assertRaises(ValidationError, setattr, self._make_one(), 'test', '2020-02-03')
+
+    def test___set___parse_epoch(self):
+        from valid_model import ValidationError
+        from datetime import datetime
+        instance = self._make_one(parse=['iso8601', 'epoch'])
+        instance.test = 86400.5
+        self.assertEqual(instance.test, datetime(1970, 1, 2, 0, 0, 0, 500000))
+        self.assertRaises(ValidationError, setattr, instance, 'test', True)
+        self.assertRaises(ValidationError, setattr, instance, 'test', 1e20)
+        instance = self._make_one(parse='epoch_ms')
+        instance.test = 86400001
+        self.assertEqual(instance.test, datetime(1970, 1, 2, 0, 0, 0, 1000))
+        self.assertRaises(ValueError, self._make_one, parse=['epoch', 'epoch_ms'])
+        self.assertRaises(ValueError, self._make_one, parse='rfc822')
+
+    def test___json___format(self):
+        from datetime import datetime
+        when = datetime(1970, 1, 2, 0, 0, 0, 1000)
+        self.assertEqual(self._make_one(default=when).__json__(), {'test': when})
+        for json_format, expected in (
+            ('iso8601', '1970-01-02T00:00:00.001000'),
+            ('epoch', 86400.001),
+            ('epoch_ms', 86400001),
+        ):
+            instance = self._make_one(default=when, json_format=json_format)
+            self.assertEqual(instance.__json__(), {'test': expected})
+        self.assertEqual(self._make_one(json_format='epoch').__json__(), {'test': None})
+        self.assertRaises(ValueError, self._make_one, json_format='rfc822')
+
+    def test_collection_json_format(self):
+        from datetime import datetime
+        from valid_model import Object
+        from valid_model.descriptors import DateTime, Dict, List
+
+        class Foo(Object):
+            times = List(value=DateTime(json_format='epoch'))
+            by_time = Dict(key=DateTime(parse='iso8601', json_format='iso8601'))
+        instance = Foo(times=[datetime(1970, 1, 1, 0, 1), None], by_time={'1970-01-01': 1})
+        self.assertEqual(instance.__json__(), {
+            'times': [60.0, None], 'by_time': {'1970-01-01T00:00:00': 1}
+        })
+
+
+class TestTimeParsing(unittest.TestCase):
+    def test_parse_iso_datetime(self):
+        from datetime import datetime
+        from valid_model.utils import parse_iso_datetime
+        self.assertEqual(parse_iso_datetime('2020-02-03T04:05Z'), datetime(2020, 2, 3, 4, 5))
+        self.assertEqual(
+            parse_iso_datetime('2020-02-03 04:05:06,5-0130'),
+            datetime(2020, 2, 3, 5, 35, 6, 500000)
+        )
+        self.assertIs(
+            parse_iso_datetime('2020-02-03T04:05:00'), parse_iso_datetime('2020-02-03T04:05:00')
+        )
+        self.assertRaises(ValueError, parse_iso_datetime, '2020-02-30')
+        self.assertRaises(ValueError, parse_iso_datetime, '02/03/2020')
+
+    def test_parse_iso_duration(self):
+        from datetime import timedelta
+        from valid_model.utils import parse_iso_duration
+        self.assertEqual(
+            parse_iso_duration('P1W2DT3H4M5.5S'),
+            timedelta(days=9, hours=3, minutes=4, seconds=5.5)
+        )
+        self.assertEqual(parse_iso_duration('-PT90S'), timedelta(seconds=-90))
+        for bad in ('P', 'PT', 'P1DT', 'P1Y', '1D'):
+            self.assertRaises(ValueError, parse_iso_duration, bad)
+
+    def test_format_iso_duration(self):
+        from datetime import timedelta
+        from valid_model.utils import format_iso_duration, parse_iso_duration
+        for value, expected in (
+            (timedelta(0), 'PT0S'),
+            (timedelta(days=2), 'P2D'),
+            (timedelta(days=1, seconds=3661.25), 'P1DT1H1M1.25S'),
+            (timedelta(minutes=-5), '-PT5M'),
+        ):
+            self.assertEqual(format_iso_duration(value), expected)
+            self.assertEqual(parse_iso_duration(expected), value)
+
 
 class TestTimeDelta(unittest.TestCase):
     @staticmethod
-    def _make_one(default=None, validator=None, mutator=None):
+    def _make_one(default=None, validator=None, mutator=None, parse=None, json_format=None):
         from valid_model.descriptors import TimeDelta
         from valid_model import Object
 
         class Foo(Object):
             test = TimeDelta(
-                default=default, validator=validator, mutator=mutator
+                default=default, validator=validator, mutator=mutator,
+                parse=parse, json_format=json_format
             )
         return Foo()
 
@@ -526,6 +1027,35 @@ class TestTimeDelta(unittest.TestCase):
         self.assertEqual(instance.test, one_minute)
         self.assertRaises(ValidationError, setattr, instance, 'test', 10)
 
+    def test___set___parse(self):
+        from valid_model import ValidationError
+        from datetime import timedelta
+        instance = self._make_one(parse=('iso8601', 'seconds', 'days_seconds'))
+        instance.test = 'PT1M'
+        self.assertEqual(instance.test, timedelta(minutes=1))
+        instance.test = 1.5
+        self.assertEqual(instance.test, timedelta(seconds=1.5))
+        instance.test = [1, 30]
+        self.assertEqual(instance.test, timedelta(days=1, seconds=30))
+        instance.test = (0, 1, 5)
+        self.assertEqual(instance.test, timedelta(seconds=1, microseconds=5))
+        for bad in ('P1M', [1], [1, 'a'], True):
+            self.assertRaises(ValidationError, setattr, instance, 'test', bad)
+        self.assertRaises(ValidationError, setattr, self._make_one(parse='seconds'), 'test', [1, 2])
+
+    def test___json___format(self):
+        from datetime import timedelta
+        value = timedelta(days=1, seconds=30, microseconds=5)
+        for json_format, expected in (
+            ('iso8601', 'P1DT30.000005S'),
+            ('seconds', 86430.000005),
+            ('days_seconds', [1, 30, 5]),
+        ):
+            instance = self._make_one(default=value, json_format=json_format)
+            self.assertEqual(instance.__json__(), {'test': expected})
+        instance = self._make_one(default=timedelta(seconds=2), json_format='days_seconds')
+        self.assertEqual(instance.__json__(), {'test': [0, 2]})
+
 
 class TestList(unittest.TestCase):
     @staticmethod
@@ -551,6 +1081,76 @@ class TestList(unittest.TestCase):
         instance.test = None
         self.assertEqual(instance.test, [])
 
+    @staticmethod
+    def _make_lazy():
+        from valid_model.descriptors import EmbeddedObject, Integer, List
+        from valid_model import Object
+
+        class Leaf(Object):
+            t1 = Integer(nullable=False)
+
+            def validate(self):
+                Object.validate(self)
+                if self.t1 < 0:
+                    raise ValueError('negative')
+
+        class Foo(Object):
+            test = List(value=Integer(), lazy=True)
+            leaves = List(value=EmbeddedObject(Leaf), lazy=True)
+        return Foo, Leaf
+
+    def test_lazy_validates_on_read(self):
+        from valid_model import ValidationError
+        from valid_model.descriptors import LazyList
+        Foo, _ = self._make_lazy()
+        instance = Foo(test=[1, 2, 'x'])
+        self.assertIsInstance(instance.test, LazyList)
+        self.assertEqual(instance.test[0], 1)
+        self.assertEqual(instance.test[-2], 2)
+        self.assertEqual(instance.test[:2], [1, 2])
+        with self.assertRaises(ValidationError) as ctx:
+            instance.test[2]
+        self.assertEqual(ctx.exception.field, 'test[2]')
+        with self.assertRaises(ValidationError):
+            list(instance.test)
+        self.assertRaises(IndexError, instance.test.__getitem__, 3)
+
+        instance.test[2] = 3
+        instance.test.append(4)
+        instance.test.insert(0, 0)
+        del instance.test[1]
+        self.assertEqual(instance.test, [0, 2, 3, 4])
+        self.assertEqual(len(instance.test), 4)
+        self.assertEqual(instance.__json__()['test'], [0, 2, 3, 4])
+
+    def test_lazy_validate(self):
+        from valid_model import ErrorReport, ValidationError
+        Foo, Leaf = self._make_lazy()
+        instance = Foo(test=[1, 'x'])
+        with self.assertRaises(ValidationError) as ctx:
+            instance.validate()
+        self.assertEqual(ctx.exception.field, 'test[1]')
+
+        instance = Foo(leaves=[{'t1': 1}, Leaf(t1=-1)])
+        self.assertRaises(ValueError, instance.validate)
+        instance.leaves[1].t1 = 2
+        instance.validate()
+        self.assertIsInstance(instance.leaves[0], Leaf)
+
+        errors = ErrorReport()
+        Foo.load({'test': [1, 'x', 'y']}, errors)
+        self.assertEqual(sorted(errors.as_dict()), ['test[1]', 'test[2]'])
+
+    def test_lazy_copy_and_pickle(self):
+        import copy
+        import pickle
+        Foo, _ = self._make_lazy()
+        instance = Foo(test=[1, 2])
+        other = Foo(test=instance.test)
+        self.assertEqual(other.test, [1, 2])
+        self.assertEqual(pickle.loads(pickle.dumps(instance.test)), [1, 2])
+        self.assertEqual(copy.copy(instance.test), [1, 2])
+
 
 class TestSet(unittest.TestCase):
     @staticmethod
@@ -627,6 +1227,26 @@ class TestDescriptorFuncs(unittest.TestCase):
             descriptors_list.remove(cls.__name__)
         self.assertEqual(len(descriptors_list), 0)
 
+    def test___all__(self):
+        from valid_model import descriptors as module
+        self.assertEqual(
+            sorted(module.__all__),
+            sorted(['descriptor_classes'] + module.descriptors())
+        )
+
+
+class TestPackage(unittest.TestCase):
+    def test_lazy_attributes(self):
+        import valid_model
+        from valid_model.base import Object
+        from valid_model import descriptors, validators
+        self.assertIs(valid_model.Object, Object)
+        self.assertIs(valid_model.descriptors, descriptors)
+        self.assertIs(valid_model.validators, validators)
+        for name in valid_model.__all__:
+            self.assertIn(name, dir(valid_model))
+        self.assertRaises(AttributeError, getattr, valid_model, 'missing')
+
 
 class TestValidators(unittest.TestCase):
     def test_truthy(self):
@@ -726,5 +1346,1296 @@ class TestValidators(unittest.TestCase):
         self.assertFalse(v(10))
         self.assertFalse(v("hello"))
 
+    def test_matches(self):
+        from valid_model.validators import matches, search, compile_pattern
+        v = matches(r'[a-z]+\d')
+        self.assertTrue(v('abc1x'))
+        self.assertFalse(v('1abc1'))
+        self.assertFalse(v(None))
+        self.assertFalse(matches(r'[a-z]+\d', full=True)('abc1x'))
+        self.assertTrue(matches(r'[a-z]+\d', full=True)('abc1'))
+        self.assertTrue(search(r'\d')('abc1x'))
+        self.assertIs(matches(r'[a-z]+\d').regex, v.regex)
+        self.assertIs(compile_pattern(r'[a-z]+\d'), v.regex)
+
+    def test_length(self):
+        from valid_model.validators import length_between, min_length, max_length
+        self.assertTrue(length_between(1, 3)('abc'))
+        self.assertFalse(length_between(1, 3)(''))
+        self.assertFalse(length_between(1, 3)([1, 2, 3, 4]))
+        self.assertFalse(min_length(1)(5))
+        self.assertTrue(max_length(1)(''))
+
+    def test_affix(self):
+        from valid_model.validators import startswith, endswith
+        self.assertTrue(startswith('ab')('abc'))
+        self.assertTrue(startswith(('x', 'ab'))('abc'))
+        self.assertFalse(startswith('ab')(b'abc'))
+        self.assertTrue(endswith('bc')('abc'))
+        self.assertFalse(endswith('ab')('abc'))
+
+    def test_combinator_structure(self):
+        from valid_model.validators import (
+            Affix, Length, all_of, any_of, endswith, length_between, lt, max_length,
+            min_length, startswith
+        )
+        v = any_of(startswith('a'), any_of(endswith('z'), startswith('b')), lt('0'))
+        self.assertEqual(len(v.validators), 3)
+        self.assertIsInstance(v.validators[0], Affix)
+        self.assertEqual(v.validators[0].affixes, ('a', 'b'))
+        self.assertEqual(v.validators[1].affixes, ('z',))
+        for value, expected in (('a1', True), ('b1', True), ('1z', True), ('1', False)):
+            self.assertEqual(v(value), expected)
+
+        v = all_of([min_length(2), all_of(max_length(5), length_between(3, 9)), startswith('a')])
+        self.assertEqual(len(v.validators), 2)
+        self.assertIsInstance(v.validators[0], Length)
+        self.assertEqual((v.validators[0].min, v.validators[0].max), (3, 5))
+        self.assertTrue(v('abc'))
+        self.assertFalse(v('ab'))
+        self.assertFalse(v('abcdef'))
+
+    def test_adaptive(self):
+        import time
+        from valid_model.validators import AdaptiveAllOf, all_of, any_of, is_instance, lt
+
+        def slow(value):
+            time.sleep(0.0005)
+            return value > 0
+        cheap = is_instance(int)
+        v = all_of(slow, cheap, adaptive=True, sample_every=2, reorder_every=8)
+        self.assertIsInstance(v, AdaptiveAllOf)
+        self.assertEqual(v.ordering, (slow, cheap))
+        values = [1, 2.0, 3.0, -1, 4.0, 5, 6.0, 7.0] * 4
+        results = [v(value) for value in values]
+        self.assertEqual(results, [value > 0 and isinstance(value, int) for value in values])
+        self.assertEqual(v.ordering, (cheap, slow))
+        stats = v.stats()
+        self.assertIs(stats[0]['validator'], slow)
+        self.assertGreater(stats[0]['cost'], stats[1]['cost'])
+
+        v = any_of(lt(0), lt(10), adaptive=True, sample_every=1, reorder_every=4)
+        for value in range(5):
+            self.assertTrue(v(value))
+        self.assertEqual(v.ordering, v.validators[::-1])
+        self.assertFalse(v(20))
+        self.assertRaises(TypeError, any_of, lt(0), sample_every=1)
+
+    def test_adaptive_guard(self):
+        from valid_model.validators import all_of, is_instance
+        guarded = all_of(
+            is_instance(str), lambda value: value.startswith('a'),
+            adaptive=True, sample_every=1000, reorder_every=1000
+        )
+        guarded.reorder()
+        guarded._ordered = guarded.validators[::-1]
+        self.assertFalse(guarded(5))
+        self.assertTrue(guarded('abc'))
+        unguarded = all_of(lambda value: value.startswith('a'), adaptive=True, sample_every=1)
+        self.assertRaises(AttributeError, unguarded, 5)
+
+
+class FakeSession(object):
+    """Stand-in for a cassandra session which records what it was asked to do."""
+    def __init__(self):
+        self.prepared = []
+        self.executed = []
+
+    def prepare(self, query):
+        self.prepared.append(query)
+        return ('prepared', query)
+
+    def execute(self, statement, parameters=None):
+        self.executed.append((statement, parameters))
+
+
+class TestCassandraStatementCache(unittest.TestCase):
+    @staticmethod
+    def _make_model():
+        from valid_model import Object
+        from valid_model.descriptors import Integer, String
+
+        class Person(Object):
+            name = String(nullable=False)
+            age = Integer()
+        return Person
+
+    @staticmethod
+    def _make_cache(maxsize=256):
+        from examples.cassandra_example import StatementCache
+        return StatementCache(maxsize)
+
+    def test_insert(self):
+        from examples.cassandra_example import Insert
+        cache = self._make_cache()
+        query1, params1 = Insert('people', cache).add_columns(
+            [('name', 'a'), ('age', 1)]
+        ).ttl(10).statement()
+        query2, params2 = Insert('people', cache).add_columns(
+            [('name', 'b'), ('age', 2)]
+        ).ttl(10).statement()
+        self.assertEqual(query1, 'INSERT INTO people (name,age) VALUES (%s,%s) USING TTL %s')
+        self.assertIs(query1, query2)
+        self.assertEqual(params1, ['a', 1, 10])
+        self.assertEqual(params2, ['b', 2, 10])
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        # a different option set is a different statement
+        Insert('people', cache).add_columns([('name', 'c'), ('age', 3)]).statement()
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+        # option values are bound, so other values share the statement
+        entry = Insert('people', cache).add_columns(
+            [('name', 'c'), ('age', 3)]
+        ).ttl(20).timestamp(1234).cached()
+        self.assertEqual(
+            entry.query,
+            'INSERT INTO people (name,age) VALUES (%s,%s) USING TTL %s AND TIMESTAMP %s'
+        )
+        self.assertEqual(entry.parameter_order, ('name', 'age', '[ttl]', '[timestamp]'))
+        query, params = Insert('people', cache).add_columns(
+            [('name', 'd'), ('age', 4)]
+        ).ttl(30).timestamp(5678).statement()
+        self.assertIs(query, entry.query)
+        self.assertEqual(params, ['d', 4, 30, 5678])
+        self.assertEqual((cache.hits, cache.misses), (2, 3))
+
+    def test_lru_eviction(self):
+        from examples.cassandra_example import Insert
+        cache = self._make_cache(maxsize=2)
+        for table in ('a', 'b', 'a', 'c', 'a'):
+            Insert(table, cache).add_column('x', 1).statement()
+        self.assertEqual(len(cache), 2)
+        self.assertEqual((cache.hits, cache.misses), (2, 3))
+        Insert('b', cache).add_column('x', 1).statement()
+        self.assertEqual(cache.misses, 4)
+
+    def test_delete(self):
+        from examples.cassandra_example import Delete
+        cache = self._make_cache()
+        query, params = Delete('people', cache).where(('name', '=', 'a')).statement()
+        self.assertEqual(query, 'DELETE  FROM people WHERE  name=%s')
+        self.assertEqual(params, ['a'])
+        entry = Delete('people', cache).where(('name', '=', 'b')).cached()
+        self.assertEqual(entry.parameter_order, ('name',))
+        self.assertEqual(cache.hits, 1)
+
+        query, params = Delete('people', cache).timestamp(5).where(('name', '=', 'c')).statement()
+        self.assertEqual(query, 'DELETE  FROM people USING TIMESTAMP %s WHERE  name=%s')
+        self.assertEqual(params, [5, 'c'])
+        entry = Delete('people', cache).timestamp(6).where(('name', '=', 'd')).cached()
+        self.assertEqual(entry.parameter_order, ('[timestamp]', 'name'))
+        self.assertEqual(cache.hits, 2)
+
+    def test_prepare_once_execute_many(self):
+        from examples.cassandra_example import insert_query
+        Person = self._make_model()
+        cache = self._make_cache()
+        session = FakeSession()
+        for i in range(5):
+            insert_query('people', Person(name='p{}'.format(i), age=i), cache=cache).execute(session)
+        self.assertEqual(len(session.prepared), 1)
+        self.assertEqual(len(session.executed), 5)
+        self.assertTrue(all(stmt == ('prepared', session.prepared[0]) for stmt, _ in session.executed))
+        self.assertEqual(cache.misses, 1)
+        self.assertEqual(cache.hits, 4)
+
+
+class TestCassandraBatchInsert(unittest.TestCase):
+    @staticmethod
+    def _make_model():
+        from valid_model import Object
+        from valid_model.descriptors import Integer, String
+
+        class Reading(Object):
+            __cassandra_table__ = 'readings'
+            __cassandra_partition__ = (('sensor',), ('seq',))
+            sensor = String(nullable=False)
+            seq = Integer(nullable=False)
+            value = Integer()
+        return Reading
+
+    @staticmethod
+    def _make_one(model, **kwargs):
+        from examples.cassandra_example import BatchInsert, StatementCache
+        return BatchInsert(model, cache=StatementCache(), **kwargs)
+
+    def test_batches(self):
+        Reading = self._make_model()
+        batch = self._make_one(Reading, max_size=2)
+        rows = [Reading(sensor='a', seq=i, value=i * 10) for i in range(5)]
+        batches = list(batch.batches(rows))
+        self.assertEqual([len(params) for _, params in batches], [6, 6, 3])
+        query, params = batches[-1]
+        self.assertEqual(
+            query,
+            'BEGIN UNLOGGED BATCH\n'
+            'INSERT INTO readings (sensor,seq,value) VALUES (%s,%s,%s);\n'
+            'APPLY BATCH'
+        )
+        self.assertEqual(params, ['a', 4, 40])
+        self.assertIs(batches[0][0], batches[1][0])
+
+    def test_reads_through_descriptors(self):
+        from valid_model import Object
+        from valid_model.descriptors import Choice, Integer, String
+
+        class Event(Object):
+            seq = Integer(nullable=False)
+            level = Choice(['debug', 'info', 'error'], store_code=True)
+            text = String(lazy=True)
+
+        batch = self._make_one(Event)
+        event = Event(seq=1, level='error', text=b'caf\xc3\xa9')
+        self.assertEqual(event._fields['level'], 2)
+        _, params = next(batch.batches([event]))
+        self.assertEqual(params, ['error', 1, u'caf\xe9'])
+
+    def test_by_partition(self):
+        Reading = self._make_model()
+        batch = self._make_one(Reading, max_size=2, by_partition=True)
+        rows = [Reading(sensor=s, seq=i) for i, s in enumerate('abab' 'a')]
+        sensors = [set(params[0::3]) for _, params in batch.batches(rows)]
+        self.assertEqual(sensors, [{'a'}, {'b'}, {'a'}])
+
+    def test_validates(self):
+        from valid_model import ValidationError
+        Reading = self._make_model()
+        batch = self._make_one(Reading)
+        bad = Reading(sensor='a', seq=1)
+        bad._fields['seq'] = None
+        self.assertRaises(ValidationError, list, batch.batches([bad]))
+        self.assertRaises(TypeError, list, batch.batches([object()]))
+
+    def test_execute(self):
+        Reading = self._make_model()
+        batch = self._make_one(Reading, max_size=3)
+        session = FakeSession()
+        batch.execute(session, (Reading(sensor='a', seq=i) for i in range(9)))
+        self.assertEqual(len(session.prepared), 1)
+        self.assertEqual(len(session.executed), 3)
+
+
+class TestDynamic(unittest.TestCase):
+    SPEC = {
+        'a': {'type': 'string', 'required': True},
+        'b': {'type': 'integer', 'default': 5},
+        'c': {'type': 'boolean', 'default': 'true'},
+        'd': {'type': 'datetime', 'default': '1970-01-01T00:00:00'},
+        'e': {'type': 'list', 'value': {'type': 'integer', 'required': True}},
+        'f': {'type': 'map', 'key': {'type': 'string'}, 'value': {'type': 'float'}},
+    }
+
+    @staticmethod
+    def _make_one():
+        from valid_model.dynamic import ObjectMaker
+        return ObjectMaker()
+
+    def _check_class(self, Bar):
+        from datetime import datetime
+        from valid_model import ValidationError
+        instance = Bar(a='x', e=[1, 2])
+        self.assertEqual(instance.b, 5)
+        self.assertIs(instance.c, True)
+        self.assertEqual(instance.d, datetime(1970, 1, 1))
+        self.assertRaises(ValidationError, setattr, instance, 'a', None)
+        self.assertRaises(ValidationError, setattr, instance, 'e', [None])
+        self.assertRaises(ValidationError, setattr, instance, 'f', {'x': 'y'})
+
+    def test_create_class_from_spec(self):
+        maker = self._make_one()
+        Bar = maker.create_class_from_spec('Bar', self.SPEC)
+        self._check_class(Bar)
+        self.assertIs(maker.create_class_from_spec('Bar', dict(self.SPEC)), Bar)
+        self.assertIsNot(maker.create_class_from_spec('Baz', self.SPEC), Bar)
+        self.assertEqual((maker.hits, maker.misses), (1, 2))
+
+    def test_class_source(self):
+        from valid_model.dynamic import ObjectPrinter
+        from valid_model.descriptors import DateTime, String
+        Bar = self._make_one().create_class_from_spec('Bar', self.SPEC)
+        source = ObjectPrinter.class_source(Bar)
+        self.assertIn('    a = String(nullable=False)\n', source)
+        self.assertIn('    e = List(value=Integer(nullable=False))\n', source)
+        namespace = {}
+        exec(ObjectPrinter.module_source([Bar]), namespace)
+        self._check_class(namespace['Bar'])
+
+        Foo = self._make_one().create_class('Foo', {'a': String(mutator=lambda x: x)})
+        self.assertRaises(TypeError, ObjectPrinter.class_source, Foo)
+
+        Baz = self._make_one().create_class(
+            'Baz', {'a': DateTime(parse='iso8601', json_format='epoch')}
+        )
+        self.assertIn(
+            "    a = DateTime(parse=('iso8601',), json_format='epoch')\n",
+            ObjectPrinter.class_source(Baz)
+        )
+
+    def test_precompiled(self):
+        import os
+        import shutil
+        import tempfile
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'tenant_models.py')
+
+        first = self._make_one()
+        Bar = first.precompiled(path, {'Bar': self.SPEC})['Bar']
+        self.assertTrue(os.path.exists(path))
+        self.assertEqual(first.misses, 1)
+
+        # a fresh process imports the module instead of building the class
+        second = self._make_one()
+        Loaded = second.precompiled(path, {'Bar': self.SPEC})['Bar']
+        self.assertIsNot(Loaded, Bar)
+        self.assertEqual((second.hits, second.misses), (1, 0))
+        self.assertEqual(Loaded.__module__, 'tenant_models')
+        self._check_class(Loaded)
+
+        # a changed spec rebuilds and rewrites the module
+        spec = dict(self.SPEC, g={'type': 'string'})
+        third = self._make_one()
+        self.assertIn('g', third.precompiled(path, {'Bar': spec})['Bar'].field_names)
+        self.assertEqual(third.misses, 1)
+        self.assertIn('g', self._make_one().precompiled(path, {'Bar': spec})['Bar'].field_names)
+        # written through a temporary file which is gone afterwards
+        self.assertEqual(sorted(name for name in os.listdir(directory) if name.endswith('.tmp')), [])
+
+
+# pickle finds classes by name so these have to live at module level
+from valid_model import Object  # noqa: E402
+from valid_model.descriptors import EmbeddedObject, Integer, List, String  # noqa: E402
+
+
+class Point(Object):
+    x = Integer(validator=lambda x: x >= 0)
+    y = Integer()
+
+
+class Shape(Object):
+    name = String()
+    points = List(value=EmbeddedObject(Point))
+    origin = EmbeddedObject(Point)
+
+
+class TestPickle(unittest.TestCase):
+    def test_round_trip(self):
+        import pickle
+        shape = Shape(name='tri', points=[{'x': 1, 'y': 2}, {'x': 3}], origin={'x': 0})
+        shape.extra = 'kept'
+        for protocol in range(2, pickle.HIGHEST_PROTOCOL + 1):
+            copy = pickle.loads(pickle.dumps(shape, protocol))
+            self.assertEqual(copy.__json__(), shape.__json__())
+            self.assertIsInstance(copy.points[0], Point)
+            self.assertEqual(copy.extra, 'kept')
+
+    def test_compact(self):
+        import pickle
+        points = [Point(x=i, y=i) for i in range(100)]
+        compact = pickle.dumps(points, pickle.HIGHEST_PROTOCOL)
+        self.assertNotIn(b'_fields', compact)
+        state = pickle.dumps([p.__dict__ for p in points], pickle.HIGHEST_PROTOCOL)
+        self.assertLess(len(compact), len(state))
+
+    def test_not_revalidated(self):
+        import pickle
+        point = Point(x=1)
+        point._fields['x'] = -1
+        self.assertEqual(pickle.loads(pickle.dumps(point)).x, -1)
+
+    def test_fields_changed(self):
+        from valid_model import ValidationError
+        import pickle
+        from valid_model.base import restore
+        point = Point(x=1, y=2)
+        restorer = pickle.loads(pickle.dumps(point.__reduce__()[0]))
+        self.assertEqual((restorer.cls, restorer.names), (Point, ('x', 'y')))
+        # saved by a version of Point with its fields in another order
+        copy = restore(Point, (2, 1), None, ('y', 'x'))
+        self.assertEqual((copy.x, copy.y), (1, 2))
+        # or with a field since removed and one not yet added
+        copy = restore(Point, (1, 'gone'), {'extra': 'kept'}, ('x', 'z'))
+        self.assertEqual((copy.x, copy.y, copy.extra), (1, None, 'kept'))
+        # the values are validated again
+        self.assertRaises(ValidationError, restore, Point, (-1,), None, ('x',))
+        # pickles with no field order are trusted
+        self.assertEqual(restore(Point, (-1, 2)).x, -1)
+
+
+class TestSharedBatch(unittest.TestCase):
+    def setUp(self):
+        try:
+            from multiprocessing import shared_memory  # noqa: F401
+        except ImportError:
+            self.skipTest('multiprocessing.shared_memory is not available')
+
+    def test_round_trip(self):
+        import pickle
+        from valid_model.transport import SharedBatch
+        shapes = [Shape(name=str(i), points=[{'x': i}]) for i in range(10)]
+        handle = pickle.loads(pickle.dumps(SharedBatch.pack(shapes)))
+        self.assertEqual(len(handle), 10)
+        copies = handle.unpack()
+        self.assertEqual([s.__json__() for s in copies], [s.__json__() for s in shapes])
+        self.assertRaises(Exception, handle.unpack)
+
+    def test_validated_flag(self):
+        from valid_model import ValidationError
+        from valid_model.transport import SharedBatch
+        point = Point(x=1)
+        point._fields['x'] = -1
+        trusted = SharedBatch.pack([point])
+        self.assertEqual(trusted.unpack()[0].x, -1)
+        untrusted = SharedBatch.pack([point], validated=False)
+        self.assertRaises(ValidationError, untrusted.unpack)
+
+    def test_mixed_models(self):
+        from valid_model.transport import SharedBatch
+        self.assertRaises(TypeError, SharedBatch.pack, [Point(), Shape()])
+        self.assertRaises(ValueError, SharedBatch.pack, [])
+        empty = SharedBatch.pack([], model=Point)
+        self.assertEqual(empty.unpack(), [])
+
+
+class TestConstruct(unittest.TestCase):
+    @staticmethod
+    def _make_one(version=None):
+        from valid_model import Object
+        from valid_model.descriptors import Dict, EmbeddedObject, Integer, List, Set, String
+
+        class Bar(Object):
+            t1 = Integer(validator=lambda x: x > 0)
+            t2 = Integer(default=10)
+
+        class Foo(Object):
+            __schema_version__ = version
+            name = String(mutator=lambda x: x.upper())
+            embedded = EmbeddedObject(Bar)
+            bars = List(value=EmbeddedObject(Bar))
+            by_key = Dict(value=EmbeddedObject(Bar))
+            tags = Set()
+        return Foo, Bar
+
+    def test_construct(self):
+        Foo, Bar = self._make_one()
+        doc = {
+            'name': 'skipped mutator',
+            'embedded': {'t1': -1},
+            'bars': [{'t1': 1}, Bar(t1=2), None],
+            'by_key': {'a': {'t2': 3}},
+            'tags': ['a', 'b'],
+            'unknown': 'ignored',
+        }
+        instance = Foo.construct(doc)
+        self.assertEqual(instance.name, 'skipped mutator')
+        self.assertIsInstance(instance.embedded, Bar)
+        self.assertEqual(instance.embedded.t1, -1)
+        self.assertEqual(instance.embedded.t2, 10)
+        self.assertEqual([type(b) for b in instance.bars], [Bar, Bar, type(None)])
+        self.assertEqual(instance.by_key['a'].t2, 3)
+        self.assertEqual(instance.tags, {'a', 'b'})
+        self.assertNotIn('unknown', instance._fields)
+        self.assertIsNot(instance.bars, doc['bars'])
+
+    def test_defaults(self):
+        Foo, Bar = self._make_one()
+        self.assertEqual(Foo.construct({}).__json__(), Foo().__json__())
+
+    def test_schema_version(self):
+        from valid_model import ValidationError
+        Foo, Bar = self._make_one(version=2)
+        self.assertEqual(Foo.construct({'name': 'a'}, schema_version=2).name, 'a')
+        self.assertEqual(Foo.construct({'name': 'a'}, schema_version=1).name, 'A')
+        self.assertRaises(
+            ValidationError, Foo.construct, {'embedded': {'t1': -1}}, schema_version=1
+        )
+
+
+class TestErrorReport(unittest.TestCase):
+    @staticmethod
+    def _make_one():
+        from valid_model import Object, ValidationError
+        from valid_model.descriptors import Dict, EmbeddedObject, Integer, List, String
+
+        class Bar(Object):
+            x = Integer(validator=lambda x: x > 0)
+            name = String(nullable=False, default='bar')
+
+        class Foo(Object):
+            count = Integer()
+            bar = EmbeddedObject(Bar)
+            bars = List(value=EmbeddedObject(Bar))
+            by_key = Dict(key=String(), value=Integer())
+            low = Integer(default=0)
+            high = Integer(default=10)
+
+            def validate(self):
+                Object.validate(self)
+                if self.low > self.high:
+                    raise ValidationError('low must not exceed high')
+        return Foo, Bar
+
+    BAD = {
+        'count': 'many',
+        'bar': {'x': 0, 'name': None},
+        'bars': [{'x': 1}, {'x': -1}, 5],
+        'by_key': {'a': 1, 'b': 'two', 3: 4},
+    }
+
+    def test_load(self):
+        from valid_model import ErrorReport
+        Foo, Bar = self._make_one()
+        errors = ErrorReport()
+        instance = Foo.load(self.BAD, errors)
+        self.assertEqual(sorted(errors.as_dict()), sorted([
+            'count', 'bar.x', 'bar.name', 'bars[1].x', 'bars[2]',
+            "by_key['b']", 'by_key key 3',
+        ]))
+        self.assertEqual(errors.as_dict()['bars[1].x'], '-1 failed validation')
+        self.assertEqual(instance.count, None)
+        self.assertEqual(instance.bars, [])
+        self.assertEqual(len(errors.__json__()), len(errors))
+
+    def test_fail_fast_unchanged(self):
+        from valid_model import ValidationError
+        Foo, Bar = self._make_one()
+        self.assertRaises(ValidationError, Foo.load, self.BAD)
+        self.assertIsNone(Foo().update({'count': 1}))
+
+    def test_max_errors(self):
+        from valid_model import ErrorReport
+        Foo, Bar = self._make_one()
+        errors = Foo().update(self.BAD, ErrorReport(max_errors=2))
+        self.assertEqual(len(errors), 2)
+        self.assertTrue(errors.exhausted)
+
+    def test_collect_errors(self):
+        from valid_model import ValidationError
+        Foo, Bar = self._make_one()
+        instance = Foo(bars=[{'x': 1}], bar={'x': 1})
+        self.assertFalse(instance.collect_errors())
+        instance.bar._fields['x'] = -5
+        instance.bars[0]._fields['name'] = None
+        instance._fields['count'] = 'bad'
+        errors = instance.collect_errors()
+        self.assertEqual(sorted(errors.as_dict()), ['bar.x', 'bars[0].name', 'count'])
+        self.assertRaises(ValidationError, errors.raise_first)
+
+        # multi-field rules run once the fields are valid
+        instance = Foo(low=5, high=1)
+        self.assertEqual(instance.collect_errors().as_dict(), {None: 'low must not exceed high'})
+
+    def test_collect_errors_graph(self):
+        from valid_model import Object
+        from valid_model.descriptors import Generic, Integer
+        Foo, Bar = self._make_one()
+
+        class Node(Object):
+            x = Integer()
+            kids = Generic()
+
+        leaf = Bar(x=1)
+        node = Node(x=1, kids=[[leaf], set([Bar(x=2)])])
+        node.kids.append(node)
+        self.assertFalse(node.collect_errors())
+
+        leaf._fields['x'] = -1
+        for bar in node.kids[1]:
+            bar._fields['name'] = None
+        node._fields['x'] = 'bad'
+        self.assertEqual(sorted(node.collect_errors().as_dict()), ['kids[0][0].x', 'kids[1].name', 'x'])
+
+        # errors below an Object keep its own checks from running
+        instance = Foo(low=5, high=1, bar={'x': 1})
+        instance.bar._fields['x'] = -1
+        self.assertEqual(list(instance.collect_errors().as_dict()), ['bar.x'])
+
+
+class TestDeepValidate(unittest.TestCase):
+    @staticmethod
+    def _make_one():
+        from valid_model import Object, ValidationError
+        from valid_model.descriptors import Dict, EmbeddedObject, Integer, List
+
+        class Node(Object):
+            value = Integer()
+            children = List()
+            by_name = Dict()
+            visits = 0
+
+            def validate(self):
+                Object.validate(self)
+                self.visits += 1
+                if self.value is not None and self.value < 0:
+                    raise ValidationError('negative', 'value')
+
+        Node.parent = EmbeddedObject(Node)
+        Node.parent.name = 'parent'
+        return Node
+
+    def test_dict_values(self):
+        from valid_model import ValidationError
+        Node = self._make_one()
+        root = Node(by_name={'a': Node(value=1), 'b': Node(value=2)})
+        root.validate()
+        root.by_name['b']._fields['value'] = -1
+        with self.assertRaises(ValidationError) as cm:
+            root.validate()
+        self.assertEqual(cm.exception.field, "by_name['b'].value")
+
+    def test_shared_and_cycles(self):
+        Node = self._make_one()
+        shared = Node(value=1)
+        root = Node(children=[shared, shared, [shared]], by_name={'s': shared})
+        shared._fields['children'] = [root]
+        root.validate()
+        self.assertEqual((root.visits, shared.visits), (1, 1))
+
+    def test_deep_graph(self):
+        from valid_model.base import deep_validate
+        Node = self._make_one()
+        root = node = Node(value=0)
+        for value in range(5000):
+            node._fields['children'] = [Node(value=value)]
+            node = node._fields['children'][0]
+        self.assertIs(deep_validate(root), root)
+        self.assertEqual(node.visits, 1)
+
+    def test_override_sees_nested_errors(self):
+        from valid_model import Object, ValidationError
+        from valid_model.descriptors import EmbeddedObject, Integer, List
+        Node = self._make_one()
+
+        class Guard(Object):
+            child = EmbeddedObject(Node)
+            caught = None
+
+            def validate(self):
+                try:
+                    Object.validate(self)
+                except ValidationError as ex:
+                    self.caught = ex.field
+                    raise ValidationError('bad child', 'child')
+
+        class Holder(Object):
+            guards = List(value=EmbeddedObject(Guard))
+            count = Integer()
+
+        shared = Node(value=1)
+        guard = Guard(child=Node(value=1, children=[shared]))
+        holder = Holder(guards=[guard])
+        shared._fields['value'] = -2
+        # the same whether the guard is validated itself or nested
+        for obj, field in ((guard, 'child'), (holder, 'guards[0].child')):
+            guard.caught = None
+            with self.assertRaises(ValidationError) as cm:
+                obj.validate()
+            self.assertEqual(cm.exception.field, field)
+            self.assertEqual(guard.caught, 'child.children[0].value')
+
+    def test_deferred_override(self):
+        from valid_model import Object, ValidationError
+        from valid_model.base import deep_validate
+        from valid_model.descriptors import EmbeddedObject, Integer
+
+        class Leaf(Object):
+            x = Integer(validator=lambda x: x > 0)
+
+        class Wrapper(Object):
+            inner = EmbeddedObject(Leaf)
+            caught = None
+
+            def validate(self):
+                try:
+                    Object.validate(self)
+                except ValidationError as ex:
+                    self.caught = ex.field
+                    raise ValidationError('wrapped', 'inner')
+
+        class Outer(Object):
+            w = EmbeddedObject(Wrapper)
+
+        w = Wrapper(inner=Leaf(x=1))
+        w.inner._fields['x'] = -1
+        with self.assertRaises(ValidationError) as cm:
+            Outer(w=w).validate()
+        self.assertEqual(cm.exception.field, 'w.inner')
+        self.assertEqual(w.caught, 'inner.x')
+        # the leaf is validated after the override returns
+        w.caught = None
+        with self.assertRaises(ValidationError) as cm:
+            deep_validate(Outer(w=w))
+        self.assertEqual(cm.exception.field, 'w.inner.x')
+        self.assertIsNone(w.caught)
+
+    def test_executor(self):
+        from concurrent.futures import ThreadPoolExecutor
+        from valid_model import ValidationError
+        from valid_model.base import deep_validate
+        Node = self._make_one()
+        shared = Node(value=1)
+        leaves = [Node(value=i, children=[shared]) for i in range(50)]
+        root = Node(children=[Node(children=leaves[i::5]) for i in range(5)])
+        with ThreadPoolExecutor(4) as executor:
+            deep_validate(root, executor=executor, split=8)
+            self.assertEqual([leaf.visits for leaf in leaves], [1] * 50)
+            self.assertEqual(shared.visits, 1)
+            leaves[7]._fields['value'] = -1
+            with self.assertRaises(ValidationError) as cm:
+                deep_validate(root, executor=executor, split=8)
+            self.assertEqual(cm.exception.field, 'children[2].children[1].value')
+
+
+class TestRules(unittest.TestCase):
+    @staticmethod
+    def _make_one():
+        from valid_model import Object, rule
+        from valid_model.descriptors import Integer, String
+
+        class Booking(Object):
+            start = Integer()
+            end = Integer()
+            nights = Integer()
+            note = String()
+            runs = None
+
+            def _count(self, name):
+                self.__dict__.setdefault('runs', []).append(name)
+
+            @rule('nights')
+            def short(self):
+                self._count('short')
+                return self.nights is None or self.nights < 10
+
+            @rule('start', 'end', provides='nights')
+            def count_nights(self):
+                self._count('count_nights')
+                if self.start is not None and self.end is not None:
+                    self.nights = self.end - self.start
+
+            @rule('start', 'end')
+            def ordered(self):
+                self._count('ordered')
+                return self.start is None or self.end is None or self.start <= self.end
+        return Booking
+
+    def test_order(self):
+        Booking = self._make_one()
+        self.assertEqual(
+            [declared.name for declared in Booking._rules], ['count_nights', 'short', 'ordered']
+        )
+        self.assertEqual(Booking._field_rules, frozenset(['start', 'end', 'nights']))
+
+    def test_init_and_update(self):
+        from valid_model import ValidationError
+        Booking = self._make_one()
+        booking = Booking(start=1, end=3, note='x')
+        self.assertEqual(booking.nights, 2)
+        self.assertEqual(booking.runs, ['count_nights', 'short', 'ordered'])
+        booking.runs = []
+        booking.note = 'y'
+        self.assertEqual(booking.runs, [])
+        booking.update({'start': 2, 'note': 'z'})
+        self.assertEqual(booking.runs, ['count_nights', 'short', 'ordered'])
+        self.assertEqual(booking.nights, 1)
+        booking.runs = []
+        booking.nights = 5
+        self.assertEqual(booking.runs, ['short'])
+
+        with self.assertRaises(ValidationError) as cm:
+            booking.end = 1
+        self.assertEqual(str(cm.exception), 'rule ordered failed for end, start')
+        self.assertEqual(booking.end, 3)
+        self.assertRaises(ValidationError, setattr, booking, 'nights', 20)
+        self.assertEqual(booking.nights, 5)
+        self.assertRaises(ValidationError, Booking, start=0, end=20)
+
+    def test_errors(self):
+        from valid_model import ErrorReport
+        Booking = self._make_one()
+        booking = Booking()
+        errors = booking.update({'start': 5, 'end': 1}, ErrorReport())
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors.errors[0].reason, 'rule')
+
+        booking = Booking(start=1, end=2)
+        booking._fields['start'] = 5
+        self.assertEqual(len(booking.collect_errors()), 1)
+
+    def test_validate(self):
+        from valid_model import ValidationError
+        Booking = self._make_one()
+        booking = Booking(start=1, end=2)
+        booking.validate()
+        booking._fields['end'] = 0
+        self.assertRaises(ValidationError, booking.validate)
+
+    def test_inheritance(self):
+        from valid_model import rule
+        Booking = self._make_one()
+
+        class Stay(Booking):
+            @rule('start')
+            def ordered(self):
+                return self.start is None or self.start >= 0
+
+            @rule('note')
+            def noted(self):
+                return self.note != 'bad'
+        self.assertEqual(
+            [declared.name for declared in Stay._rules],
+            ['count_nights', 'short', 'ordered', 'noted']
+        )
+        stay = Stay(start=5, end=1)
+        self.assertEqual(stay.nights, -4)
+
+    def test_bad_rules(self):
+        from valid_model import Object, rule
+        from valid_model.descriptors import Integer
+        with self.assertRaises(ValueError):
+            class Unknown(Object):
+                a = Integer()
+
+                @rule('b')
+                def check(self):
+                    return True
+        with self.assertRaises(ValueError):
+            class Cycle(Object):
+                a = Integer()
+                b = Integer()
+
+                @rule('a', provides='b')
+                def one(self):
+                    pass
+
+                @rule('b', provides='a')
+                def two(self):
+                    pass
+        self.assertRaises(TypeError, rule, 'a', provide='b')
+
+
+class TestSampler(unittest.TestCase):
+    def test_every(self):
+        from valid_model.sampling import Sampler
+        sampler = Sampler(Point, every=3)
+        docs = [{'x': 1, 'y': i} for i in range(6)]
+        points = list(sampler.build_many(docs))
+        self.assertEqual([p.y for p in points], list(range(6)))
+        self.assertEqual((sampler.seen, sampler.checked), (6, 2))
+
+    def test_failure_boosts(self):
+        from valid_model import ValidationError
+        from valid_model.sampling import Sampler
+        sampler = Sampler(Point, every=100, boost=2)
+        self.assertRaises(ValidationError, sampler.build, {'x': -1, 'y': 'a'})
+        self.assertEqual(sampler.failure_rates(), {'x': 1.0, 'y': 1.0})
+        # the next two are validated, then sampling resumes
+        sampler.build({'x': 1})
+        self.assertRaises(ValidationError, sampler.build, {'x': -2})
+        self.assertEqual(sampler.boosted, 2)
+        for _ in range(2):
+            sampler.build({'x': 1})
+        trusted = sampler.build({'x': -3})
+        self.assertEqual(trusted.x, -3)
+        self.assertEqual((sampler.seen, sampler.checked, sampler.failed), (6, 5, 2))
+        self.assertEqual(sampler.failure_rates(), {'x': 0.4, 'y': 0.2})
+
+    def test_rate_and_validate(self):
+        from valid_model import ValidationError
+        from valid_model.sampling import Sampler
+        self.assertRaises(ValueError, Sampler, Point)
+        self.assertRaises(ValueError, Sampler, Point, rate=0.5, every=2)
+        self.assertRaises(ValueError, Sampler, Point, rate=2)
+        sampler = Sampler(Point, rate=0.25, seed=1)
+        for i in range(400):
+            sampler.build({'x': i})
+        self.assertTrue(60 < sampler.checked < 140)
+
+        sampler = Sampler(Point, rate=1)
+        point = Point(x=1)
+        point._fields['x'] = -1
+        self.assertRaises(ValidationError, sampler.validate, point)
+        self.assertEqual(sampler.field_failures, {'x': 1})
+        Sampler(Point, rate=0).validate(point)
+
+    def test_trusted_records_are_parsed(self):
+        import datetime
+        from valid_model import Object
+        from valid_model.descriptors import DateTime, TimeDelta
+        from valid_model.sampling import Sampler
+
+        class Reading(Object):
+            at = DateTime(parse='iso8601')
+            took = TimeDelta(parse='seconds')
+
+        reading = Sampler(Reading, rate=0).build({'at': '2024-01-02T03:04:05Z', 'took': 2})
+        self.assertEqual(reading.at, datetime.datetime(2024, 1, 2, 3, 4, 5))
+        self.assertEqual(reading.took, datetime.timedelta(seconds=2))
+
+
+class TestJsonStream(unittest.TestCase):
+    @staticmethod
+    def _make_one():
+        import datetime
+        from valid_model import Object
+        from valid_model.descriptors import (
+            DateTime, Dict, EmbeddedObject, Float, List, String
+        )
+
+        class Foo(Object):
+            name = String()
+            when = DateTime(json_format='iso8601')
+            ratio = Float()
+            origin = EmbeddedObject(Point, lazy=True)
+            shapes = List(value=EmbeddedObject(Shape), lazy=True)
+            tags = Dict(value=List())
+        return Foo(
+            name='caf\xe9 "x"', when=datetime.datetime(2024, 1, 2), ratio=float('nan'),
+            origin={'x': 1}, shapes=[{'name': 'a', 'points': [{'x': 2, 'y': 3}]}],
+            tags={'a': [1, 2.5, None, True]},
+        )
+
+    def test_dump_matches_json(self):
+        import io
+        import json
+        from valid_model.jsonstream import dump
+        for options in ({}, {'ensure_ascii': False, 'separators': (',', ':')}):
+            fp = io.StringIO()
+            dump(self._make_one(), fp, **options)
+            self.assertEqual(fp.getvalue(), json.dumps(self._make_one().__json__(), **options))
+
+    def test_array_and_ndjson(self):
+        import io
+        import json
+        from valid_model.jsonstream import dump_array, dump_ndjson
+        points = [Point(x=i, y=i) for i in range(3)]
+        fp = io.StringIO()
+        dump_array(iter(points), fp)
+        self.assertEqual(json.loads(fp.getvalue()), [p.__json__() for p in points])
+        fp = io.StringIO()
+        dump_ndjson(points, fp, buffer_size=2)
+        lines = fp.getvalue().splitlines()
+        self.assertEqual([json.loads(line) for line in lines], [p.__json__() for p in points])
+
+    def test_not_serializable(self):
+        import io
+        from valid_model.jsonstream import dump
+        self.assertRaises(TypeError, dump, {'a': object()}, io.StringIO())
+        self.assertRaises(TypeError, dump, {(1, 2): 1}, io.StringIO())
+
+
+class TestColumns(unittest.TestCase):
+    def test_to_columns(self):
+        from valid_model.columns import to_columns
+        shapes = [
+            Shape(name='a', points=[{'x': 1}], origin={'x': 1, 'y': 2}),
+            Shape(name='b', origin=None),
+        ]
+        columns = to_columns(shapes)
+        self.assertEqual(sorted(columns), ['name', 'origin.x', 'origin.y', 'points'])
+        self.assertEqual(columns['name'], ['a', 'b'])
+        self.assertEqual(columns['origin.x'], [1, None])
+        self.assertEqual(len(columns['points'][0]), 1)
+        self.assertRaises(ValueError, to_columns, [])
+        self.assertRaises(TypeError, to_columns, [shapes[0], Point()])
+        self.assertRaises(ValueError, to_columns, shapes, kind='parquet')
+
+    def test_arrays(self):
+        from array import array
+        from valid_model.columns import to_columns
+        points = [Point(x=i, y=2 ** 70 if i else 0) for i in range(3)]
+        columns = to_columns(points, kind='array')
+        self.assertEqual(columns['x'], array('q', [0, 1, 2]))
+        # too large for a 64 bit array
+        self.assertIsInstance(columns['y'], list)
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            self.assertRaises(RuntimeError, to_columns, points, kind='numpy')
+        else:
+            self.assertEqual(to_columns(points, kind='numpy')['x'].dtype.name, 'int64')
+
+    def test_round_trip(self):
+        from valid_model.columns import from_columns, to_columns
+        shapes = [
+            Shape(name='a', points=[{'x': 1}], origin={'x': 1, 'y': 2}),
+            Shape(name='b', origin=None),
+        ]
+        copies = from_columns(Shape, to_columns(shapes, kind='array'))
+        self.assertEqual([s.__json__() for s in copies], [s.__json__() for s in shapes])
+        self.assertEqual(from_columns(Shape, {}), [])
+        points = from_columns(Point, {'y': [1, 2]})
+        self.assertEqual([(p.x, p.y) for p in points], [(None, 1), (None, 2)])
+
+    def test_errors(self):
+        from valid_model import ValidationError
+        from valid_model.columns import from_columns
+        with self.assertRaises(ValidationError) as ctx:
+            from_columns(Shape, {'name': ['a', 'b', 'c'], 'origin.x': [1, None, -1]})
+        self.assertEqual(ctx.exception.field, '[2].origin.x')
+        with self.assertRaises(ValidationError) as ctx:
+            from_columns(Point, {'x': [1, 'a']})
+        self.assertEqual(ctx.exception.field, '[1].x')
+        self.assertRaises(ValueError, from_columns, Point, {'x': [1], 'y': [1, 2]})
+        self.assertRaises(ValueError, from_columns, Point, {'z': [1]})
+        self.assertRaises(ValueError, from_columns, Point, {'x.a': [1]})
+
+
+class TestCSVLoad(unittest.TestCase):
+    CSV = (
+        'name,points,origin.x,origin.y,extra\n'
+        'a,"[{""x"": 1}]",1,2,z\n'
+        'b,[],,,z\n'
+        'c,[],-1,q,z\n'
+        'd,[]\n'
+    )
+
+    def test_load(self):
+        import io
+        from valid_model.csvload import RowError, load_csv
+        loaded = list(load_csv(Shape, io.StringIO(self.CSV), on_error='yield', chunk_size=2))
+        self.assertEqual(loaded[0].origin.x, 1)
+        self.assertEqual(loaded[0].points[0].x, 1)
+        self.assertIsNone(loaded[1].origin)
+        self.assertIsInstance(loaded[2], RowError)
+        self.assertEqual(loaded[2].row, 3)
+        self.assertEqual(loaded[2].cells[0], 'c')
+        self.assertEqual(sorted(loaded[2].errors.as_dict()), ['origin.y'])
+        self.assertEqual(loaded[3].row, 4)
+        self.assertEqual(list(load_csv(Shape, io.StringIO(''))), [])
+
+    def test_raise(self):
+        import io
+        from valid_model import ValidationError
+        from valid_model.csvload import load_csv
+        rows = iter(load_csv(Shape, io.StringIO(self.CSV)))
+        self.assertEqual(next(rows).name, 'a')
+        next(rows)
+        with self.assertRaises(ValidationError) as ctx:
+            next(rows)
+        self.assertEqual(ctx.exception.field, '[3].origin.y')
+        self.assertRaises(ValueError, list, load_csv(Shape, io.StringIO(self.CSV), on_error='skip'))
+
+    def test_converters(self):
+        import datetime
+        from valid_model import Object
+        from valid_model.csvload import CSVLoader
+        from valid_model.descriptors import Bool, Choice, DateTime, Float, String, TimeDelta
+
+        class Reading(Object):
+            note = String()
+            value = Float()
+            ok = Bool()
+            at = DateTime(parse='epoch')
+            took = TimeDelta()
+            level = Choice([1, 2, 3])
+
+        loader = CSVLoader(Reading, ['note', 'value', 'ok', 'at', 'took', 'level'])
+        rows = [
+            ['', '1.5', 'Yes', '2024-01-01T00:00:00Z', 'PT1S', '2'],
+            ['x', '', 'f', '86400', '2.5', ''],
+        ]
+        first, second = list(loader.load(rows))
+        self.assertEqual(first.note, '')
+        self.assertEqual(
+            (first.value, first.ok, first.at, first.took, first.level),
+            (1.5, True, datetime.datetime(2024, 1, 1), datetime.timedelta(seconds=1), 2)
+        )
+        self.assertIsNone(second.value)
+        self.assertIsNone(second.level)
+        self.assertEqual(second.at, datetime.datetime(1970, 1, 2))
+        self.assertEqual(second.took, datetime.timedelta(seconds=2.5))
+        reading, = CSVLoader(Reading, ['value'], null_values=('NA',)).load([['NA']])
+        self.assertIsNone(reading.value)
+        error, = loader.load([['x', 'y', 'maybe', 'z', 'w', 'v']], on_error='yield')
+        self.assertEqual(sorted(error.errors.as_dict()), ['at', 'level', 'ok', 'took', 'value'])
+
+    def test_collections(self):
+        from valid_model import Object
+        from valid_model.csvload import CSVLoader
+        from valid_model.descriptors import Dict, List, Set
+
+        class Tagged(Object):
+            tags = Set()
+            scores = List()
+            meta = Dict()
+
+        loader = CSVLoader(Tagged, ['tags', 'scores', 'meta'])
+        tagged, error = loader.load([
+            ['["x", "y", "x"]', '[1, 2]', '{"a": 1}'],
+            ['[["x"]]', '[]', '{}'],
+        ], on_error='yield')
+        self.assertEqual(tagged.tags, set(['x', 'y']))
+        self.assertEqual(tagged.scores, [1, 2])
+        self.assertEqual(tagged.meta, {'a': 1})
+        # a list in a set is unhashable
+        self.assertEqual(sorted(error.errors.as_dict()), ['tags'])
+
+
+class TestObjectCollection(unittest.TestCase):
+    @staticmethod
+    def _make_one(objects=()):
+        from valid_model import Object, rule
+        from valid_model.collection import ObjectCollection
+        from valid_model.descriptors import Choice, Integer, String
+
+        class Person(Object):
+            name = String()
+            age = Integer()
+            band = String()
+            size = Choice(['small', 'large'], store_code=True)
+
+            @rule('age', provides=('band',))
+            def banding(self):
+                self.band = None if self.age is None else 'adult' if self.age >= 18 else 'minor'
+
+        people = [Person(name=str(i), age=i, size='small') for i in range(40)]
+        collection = ObjectCollection(
+            Person, people, indexes={'name': 'hash', Person.age: 'sorted', 'band': 'hash',
+                                     'size': 'hash'}
+        )
+        return Person, people, collection
+
+    def test_lookups(self):
+        _, people, collection = self._make_one()
+        self.assertEqual(len(collection), 40)
+        self.assertIn(people[3], collection)
+        self.assertEqual(collection.get('name', '3'), [people[3]])
+        self.assertEqual(collection.get('name', 'x'), [])
+        self.assertEqual(len(collection.get('band', 'minor')), 18)
+        self.assertEqual(len(collection.get('size', 'small')), 40)
+        self.assertEqual(
+            sorted(p.age for p in collection.get_in('name', ['1', '2', 'x'])), [1, 2]
+        )
+        self.assertEqual([p.age for p in collection.between('age', 10, 13)], [10, 11, 12, 13])
+        self.assertEqual(
+            [p.age for p in collection.between('age', 10, 13, include_low=False,
+                                               include_high=False)],
+            [11, 12]
+        )
+        self.assertEqual([p.age for p in collection.between('age', high=1)], [0, 1])
+        # without an index the collection is scanned
+        collection.drop_index('name')
+        self.assertEqual(collection.get('name', '3'), [people[3]])
+        # '1', '10' to '19' and '2'
+        self.assertEqual(len(collection.between('name', '1', '2')), 12)
+
+    def test_maintained_on_assignment(self):
+        _, people, collection = self._make_one()
+        person = people[5]
+        person.age = 30
+        self.assertEqual(collection.get('age', 5), [])
+        self.assertIn(person, collection.get('age', 30))
+        # changed by the rule
+        self.assertIn(person, collection.get('band', 'adult'))
+        person.size = 'large'
+        self.assertEqual(collection.get('size', 'large'), [person])
+        del person.age
+        self.assertIn(person, collection.get('age', None))
+        self.assertNotIn(person, collection.between('age'))
+
+        person._fields['name'] = 'direct'
+        self.assertEqual(collection.get('name', 'direct'), [])
+        collection.reindex(person)
+        self.assertEqual(collection.get('name', 'direct'), [person])
+
+        collection.remove(person)
+        self.assertNotIn(person, collection)
+        person.age = 131
+        self.assertEqual(collection.get('age', 131), [])
+        self.assertRaises(KeyError, collection.remove, person)
+        collection.discard(person)
+
+    def test_add_and_memory(self):
+        import copy
+        import pickle
+        from valid_model.collection import ObjectCollection
+        Person, people, collection = self._make_one()
+        collection.extend(people)
+        self.assertEqual(len(collection), 40)
+        self.assertRaises(TypeError, collection.add, object())
+        self.assertRaises(ValueError, collection.add_index, 'missing')
+        self.assertRaises(ValueError, collection.add_index, 'name', 'btree')
+        usage = collection.memory_usage()
+        self.assertEqual(sorted(usage), ['age', 'band', 'name', 'size'])
+        self.assertTrue(all(size > 0 for size in usage.values()))
+        # copies are not in the collection
+        clone = copy.copy(people[0])
+        clone.age = 99
+        self.assertEqual(collection.get('age', 99), [])
+        points = ObjectCollection(Point, [Point(x=1)], indexes={'x': 'hash'})
+        point = pickle.loads(pickle.dumps(next(iter(points))))
+        point.x = 2
+        self.assertEqual(points.get('x', 2), [])
+
+        big = ObjectCollection(Person, indexes={'age': 'sorted'})
+        big.extend(Person(age=i % 7) for i in range(2000))
+        big.extend(list(big) + list(big))
+        self.assertEqual(len(big), 2000)
+        self.assertEqual(len(big.get('age', 3)), 286)
+        self.assertEqual(len(big.between('age', 5)), 570)
+
+
+class TestQuery(unittest.TestCase):
+    @staticmethod
+    def _people():
+        from valid_model import Object
+        from valid_model.descriptors import Choice, Integer, String
+
+        class Person(Object):
+            name = String()
+            age = Integer()
+            size = Choice(['small', 'large'], store_code=True)
+
+        people = [
+            Person(name=str(i), age=None if i % 10 == 0 else i,
+                   size='large' if i % 2 else 'small')
+            for i in range(50)
+        ]
+        return Person, people
+
+    def test_expressions(self):
+        Person, people = self._people()
+        adults = (Person.age >= 18) & Person.size.eq('large')
+        self.assertEqual(repr(adults), "(age >= 18 & size == 'large')")
+        self.assertTrue(adults(people[19]))
+        self.assertFalse(adults(people[18]))
+        self.assertEqual(repr(~Person.age.between(1, 2) | Person.name.in_(['b', 'a'])),
+                         "(~age between 1 and 2 | name in ['a', 'b'])")
+        # range comparisons never match None, != does
+        self.assertFalse((Person.age < 5)(people[0]))
+        self.assertTrue(Person.age.ne(3)(people[0]))
+        self.assertTrue(Person.age.eq(None)(people[0]))
+        # descriptors still compare and hash as themselves
+        self.assertFalse(Person.age == 5)
+        self.assertEqual({Person.age: 1}[Person.age], 1)
+        self.assertRaises(TypeError, bool, Person.age > 1)
+        self.assertRaises(TypeError, lambda: (Person.age > 1) & True)
+
+    def test_select(self):
+        from valid_model.collection import ObjectCollection
+        from valid_model.query import explain, select
+        Person, people = self._people()
+        collection = ObjectCollection(Person, people, indexes={'age': 'sorted', 'size': 'hash'})
+        queries = [
+            ((Person.age > 12) & (Person.age <= 16), [13, 14, 15, 16]),
+            (Person.age.between(high=3) | Person.age.in_([48, 49, 50]), [1, 2, 3, 48, 49]),
+            (Person.size.eq('large') & (5 < Person.age) & (Person.age < 12), [7, 9, 11]),
+            (Person.age.in_([7, 8]) & ~Person.size.eq('large'), [8]),
+            (Person.name.eq('3'), [3]),
+        ]
+        for where, ages in queries:
+            self.assertEqual([p.age for p in select(people, where)], ages)
+            self.assertEqual(sorted(p.age for p in select(collection, where)), ages)
+        self.assertEqual(len(select(collection, Person.age.eq(None))), 5)
+        self.assertEqual(explain(people, Person.age.eq(3)), 'scan')
+        self.assertEqual(explain(collection, Person.name.eq('3')), 'scan')
+        self.assertEqual(explain(collection, ~Person.age.eq(3)), 'scan')
+        self.assertEqual(explain(collection, queries[0][0]), 'index: age > 12 & age <= 16')
+        self.assertEqual(explain(collection, queries[2][0]), "index: size == 'large'")
+        self.assertEqual(explain(collection, Person.age.in_([7]) | Person.name.eq('3')), 'scan')
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,6 +1,32 @@
-from valid_model import descriptors
-from valid_model import validators
-from valid_model.base import Object
-from valid_model.exc import ValidationError
-__all__ = ['descriptors', 'validators', 'Object', 'ValidationError']
+import sys
 
+from valid_model.exc import ErrorReport, ValidationError
+__all__ = ['descriptors', 'validators', 'Object', 'ValidationError', 'ErrorReport', 'rule']
+
+# name -> (module, attribute) imported on first access
+_lazy = {
+    'descriptors': ('valid_model.descriptors', None),
+    'validators': ('valid_model.validators', None),
+    'Object': ('valid_model.base', 'Object'),
+    'rule': ('valid_model.base', 'rule'),
+}
+
+if sys.version_info < (3, 7):  # pragma: no cover
+    from valid_model import descriptors
+    from valid_model import validators
+    from valid_model.base import Object, rule
+else:
+    def __getattr__(name):
+        try:
+            module_name, attr = _lazy[name]
+        except KeyError:
+            raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+        __import__(module_name)
+        value = sys.modules[module_name]
+        if attr is not None:
+            value = getattr(value, attr)
+        globals()[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(globals()) | set(__all__))
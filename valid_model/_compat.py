@@ -0,0 +1,42 @@
+"""
+The handful of Python 2/3 helpers valid_model needs.
+
+These used to come from six; importing six dominated the time taken by
+`import valid_model` and every descriptor paid for its indirections, so on
+Python 3 the names here are the builtins themselves.
+"""
+import sys
+
+PY2 = sys.version_info[0] == 2
+
+if PY2:  # pragma: no cover
+    text_type = unicode  # noqa: F821
+    binary_type = str
+    string_types = (basestring,)  # noqa: F821
+    integer_types = (int, long)  # noqa: F821
+
+    from collections import MutableSequence, Sequence
+
+    def python_2_unicode_compatible(klass):
+        klass.__unicode__ = klass.__str__
+        klass.__str__ = lambda self: self.__unicode__().encode('utf-8')
+        return klass
+else:
+    text_type = str
+    binary_type = bytes
+    string_types = (str,)
+    integer_types = (int,)
+    from collections.abc import MutableSequence, Sequence
+
+    def python_2_unicode_compatible(klass):
+        return klass
+
+
+def add_metaclass(metaclass):
+    """Class decorator creating the class with metaclass on Python 2 and 3."""
+    def wrapper(cls):
+        orig_vars = cls.__dict__.copy()
+        orig_vars.pop('__dict__', None)
+        orig_vars.pop('__weakref__', None)
+        return metaclass(cls.__name__, cls.__bases__, orig_vars)
+    return wrapper
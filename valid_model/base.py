@@ -22,12 +22,37 @@ multiple attributes within an Object.
 """
 from __future__ import unicode_literals
 
-import six
+import copy
+import threading
 
-from .exc import ValidationError
+from ._compat import (
+    Sequence, add_metaclass, binary_type, integer_types, python_2_unicode_compatible,
+    string_types, text_type
+)
+from .exc import ErrorReport, ValidationError
 
 
-@six.python_2_unicode_compatible
+# returned by Generic.collect when a value was rejected
+INVALID = object()
+
+
+def no_validator(value):
+    """Validator used when a descriptor is not given one."""
+    return True
+
+
+def no_mutator(value):
+    """Mutator used when a descriptor is not given one."""
+    return value
+
+
+def _comparison(descriptor, op, value):
+    # imported here as query needs the rest of this module
+    from .query import Comparison
+    return Comparison(descriptor, op, value)
+
+
+@python_2_unicode_compatible
 class Generic(object):
     """
     Base descriptor class for all valid_model descriptors.
@@ -39,109 +64,822 @@ class Generic(object):
     validator: function that must return truthy or a ValidationError will be
                raised
     nullable: determines if None is a valid value for this attribute
+
+    Subclasses may set `json_encoder` to convert values that are not JSON
+    types, e.g. datetimes, when an Object is converted to a dict.
+
+    Subclasses may set `_exact_type` to the type they store unchanged.  When a
+    descriptor has neither a mutator nor a validator, assigning a value of
+    exactly that type is only a type check and a store.
     """
     name = None
+    _exact_type = None
+    # True for descriptors whose values never contain Objects
+    _scalar = False
+    # True for descriptors storing values __set__ would not accept, see as_input
+    _encoded = False
+    # function converting a non-None value for Object.__json__
+    json_encoder = None
 
     def __init__(self, default=None, validator=None, mutator=None, nullable=True):
         self.default = default
         self.nullable = nullable
         if validator is None:
-            self.validator = lambda x: True
+            self.validator = no_validator
         elif not callable(validator):
             raise TypeError('validator must be callable')
         else:
             self.validator = validator
 
         if mutator is None:
-            self.mutator = lambda x: x
+            self.mutator = no_mutator
         elif not callable(mutator):
             raise TypeError('mutator must be callable')
         else:
             self.mutator = mutator
 
-    def get_default(self):
-        if not callable(self.default):
-            default = lambda: self.default
+        if validator is None and mutator is None:
+            self._fast_type = self._exact_type
         else:
-            default = self.default
-        return default()
+            self._fast_type = None
+
+    def get_default(self):
+        default = self.default
+        if callable(default):
+            return default()
+        return default
+
+    def as_input(self, value):
+        """
+        Return the stored value in the form given to __set__, for setting it
+        again when an Object is validated.  Descriptors setting `_encoded`
+        override this.
+        """
+        return value
+
+    def construct(self, value):
+        """
+        Return value as it would be stored without validating it.
+
+        Used by `Object.construct` for documents which already passed
+        validation; descriptors holding nested Objects override this.
+        """
+        return value
 
     def __get__(self, instance, klass=None):
         if instance is None:
             return self
-        return getattr(instance, '_fields')[self.name]
+        return instance._fields[self.name]
 
     def __set__(self, instance, value):
-        if value is None and not self.nullable:
-            raise ValidationError("{} is not nullable".format(self.name))
-        elif value is not None:
-            try:
-                value = self.mutator(value)
-            except (TypeError, ValueError, ValidationError) as ex:
-                raise ValidationError("{}: {}".format(self.name, ex))
-            if not self.validator(value):
-                raise ValidationError(self.name)
-        getattr(instance, '_fields')[self.name] = value
+        if value is None:
+            if not self.nullable:
+                raise ValidationError(field=self.name, value=value, reason='null')
+        else:
+            mutator = self.mutator
+            if mutator is not no_mutator:
+                try:
+                    value = mutator(value)
+                except ValidationError as ex:
+                    raise ex.push(self.name)
+                except (TypeError, ValueError) as ex:
+                    raise ValidationError(
+                        field=self.name, value=value, reason='mutator', error=ex
+                    )
+            validator = self.validator
+            if validator is not no_validator and not validator(value):
+                raise ValidationError(field=self.name, value=value, reason='invalid')
+        instance._fields[self.name] = value
         return value
 
+    def collect(self, instance, value, errors):
+        """
+        Set value like __set__ but add any ValidationError to errors, an
+        ErrorReport, instead of raising it.  Returns the value set or INVALID.
+        """
+        try:
+            return self.__set__(instance, value)
+        except ValidationError as ex:
+            errors.add(ex)
+            return INVALID
+
+    def bind(self, name):
+        """
+        Return a descriptor named name, copying self if it is already bound
+        under a different name.  Must be called holding `ObjectMeta._lock`.
+        """
+        if self.name is None:
+            self.name = name
+            return self
+        if self.name == name:
+            return self
+        descriptor = copy.copy(self)
+        descriptor.name = name
+        return descriptor
+
     def __delete__(self, instance):
-        getattr(instance, '_fields')[self.name] = None
+        instance._fields[self.name] = None
+
+    # comparisons build query expressions, see valid_model.query; == and !=
+    # are left alone so descriptors can still be used as dict keys
+    def __lt__(self, value):
+        return _comparison(self, '<', value)
+
+    def __le__(self, value):
+        return _comparison(self, '<=', value)
+
+    def __gt__(self, value):
+        return _comparison(self, '>', value)
+
+    def __ge__(self, value):
+        return _comparison(self, '>=', value)
+
+    def eq(self, value):
+        return _comparison(self, '==', value)
+
+    def ne(self, value):
+        return _comparison(self, '!=', value)
+
+    def in_(self, values):
+        return _comparison(self, 'in', values)
+
+    def between(self, low=None, high=None):
+        """Match values from low to high inclusive; either may be None for no bound."""
+        return _comparison(self, 'between', (low, high))
 
     def __str__(self):
         return self.name
 
 
+class Rule(object):
+    """
+    An object-level validator declared with the `rule` decorator.
+
+    `func` takes the Object and fails by returning False or raising a
+    ValidationError; any other result, including None, passes.  It is run
+    when any of `fields` changes and may set the `provides` fields, which
+    are then treated as changed for the rules reading them.
+    """
+
+    def __init__(self, func, fields, provides=()):
+        self.func = func
+        self.name = func.__name__
+        self.fields = frozenset(fields)
+        if isinstance(provides, string_types):
+            provides = (provides,)
+        self.provides = frozenset(provides)
+
+    def __get__(self, instance, klass=None):
+        if instance is None:
+            return self
+        return self.func.__get__(instance, klass)
+
+    def check(self, obj):
+        if self.func(obj) is False:
+            raise ValidationError(
+                reason='rule', rule=self.name, fields=', '.join(sorted(self.fields))
+            )
+
+    def __repr__(self):
+        return 'Rule({}, {})'.format(self.name, sorted(self.fields))
+
+
+def rule(*fields, **options):
+    """
+    Declare a method of an Object as a validator of the fields it reads.
+
+        @rule('start', 'end')
+        def ordered(self):
+            return self.start < self.end
+
+    `provides` names fields the method sets from the ones it reads; rules
+    reading those run after it.
+    """
+    provides = options.pop('provides', ())
+    if options:
+        raise TypeError('unexpected options {}'.format(', '.join(sorted(options))))
+
+    def decorator(func):
+        return Rule(func, fields, provides)
+    return decorator
+
+
+def _order_rules(rules):
+    """
+    Sort rules so those providing a field come before those reading it,
+    otherwise keeping their declaration order.
+    """
+    remaining = list(rules)
+    ordered = []
+    while remaining:
+        for candidate in remaining:
+            if not any(
+                other is not candidate and other.provides & candidate.fields
+                for other in remaining
+            ):
+                break
+        else:
+            raise ValueError('rules {} depend on each other'.format(
+                ', '.join(sorted(r.name for r in remaining))
+            ))
+        ordered.append(candidate)
+        remaining.remove(candidate)
+    return tuple(ordered)
+
+
+def _setattr_with_rules(self, name, value):
+    """__setattr__ of Objects with rules, re-running those depending on name."""
+    if name not in self._field_rules:
+        object.__setattr__(self, name, value)
+        return
+    pending = self.__dict__.get('_pending')
+    if pending is not None:
+        object.__setattr__(self, name, value)
+        pending.add(name)
+        return
+    # rules may set other fields before one fails
+    fields = self._fields
+    previous = dict(fields)
+    object.__setattr__(self, name, value)
+    try:
+        self._run_rules((name,))
+    except ValidationError:
+        fields.update(previous)
+        raise
+
+
+def _notify(obj, observers, before):
+    fields = obj._fields
+    for observer, values in zip(observers, before):
+        for field, old in values:
+            new = fields.get(field)
+            if new is not old and new != old:
+                observer.field_changed(obj, field)
+
+
+def _observing(setattr_, delattr_):
+    """
+    Wrap the __setattr__ and __delattr__ of a class so that observers of an
+    instance hear about the fields in their `fields` which changed.
+    """
+    def watched(obj, name):
+        """The values of the fields which setting name could change, per observer."""
+        observers = obj._observers
+        if not observers:
+            return None
+        fields = obj._fields
+        if obj._rules:
+            # rules may change fields besides name
+            return [[(field, fields.get(field)) for field in o.fields] for o in observers]
+        if any(name in o.fields for o in observers):
+            values = [(name, fields.get(name))]
+            return [values if name in o.fields else () for o in observers]
+        return None
+
+    def __setattr__(self, name, value):
+        before = watched(self, name)
+        if before is None:
+            return setattr_(self, name, value)
+        try:
+            setattr_(self, name, value)
+        finally:
+            _notify(self, self._observers, before)
+
+    def __delattr__(self, name):
+        before = watched(self, name)
+        if before is None:
+            return delattr_(self, name)
+        try:
+            delattr_(self, name)
+        finally:
+            _notify(self, self._observers, before)
+
+    __setattr__.observing = True
+    return __setattr__, __delattr__
+
+
+def add_observer(obj, observer):
+    """
+    Call `observer.field_changed(obj, field)` after a field of obj in
+    `observer.fields` gets a different value by being set or deleted.
+
+    The first observer of an instance of a class wraps the __setattr__ and
+    __delattr__ of the class, which then check for observers of the instance
+    being changed.  Changes made to `_fields` directly are not seen.
+    """
+    cls = obj.__class__
+    if not getattr(cls.__setattr__, 'observing', False):
+        cls.__setattr__, cls.__delattr__ = _observing(cls.__setattr__, cls.__delattr__)
+    observers = obj._observers
+    if observer not in observers:
+        # a tuple, so observers can be added while they are being told of a change
+        obj.__dict__['_observers'] = observers + (observer,)
+
+
+def add_observer_to_all(objects, observer):
+    """add_observer for each of objects, faster for many of them."""
+    # instances with no other observer share one tuple
+    alone = (observer,)
+    for obj in objects:
+        if obj._observers:
+            add_observer(obj, observer)
+        else:
+            if not getattr(obj.__class__.__setattr__, 'observing', False):
+                add_observer(obj, observer)
+            obj.__dict__['_observers'] = alone
+
+
+def remove_observer(obj, observer):
+    """Stop telling observer about changes to obj."""
+    observers = tuple(o for o in obj._observers if o is not observer)
+    if observers:
+        obj.__dict__['_observers'] = observers
+    else:
+        obj.__dict__.pop('_observers', None)
+
+
 class ObjectMeta(type):
     """
     Metaclass used to set the attribute name to each descriptor in the Object
     class
+
+    A descriptor is only ever named once.  If it is already bound under a
+    different name, e.g. the same instance reused across dynamically created
+    classes, the class gets its own copy instead of renaming the original.
+    Inherited descriptors keep the name their parent gave them.  Binding is
+    done under a lock so classes can be created from several threads.
+
+    Rules, own and inherited, are sorted so that rules providing a field
+    run before the rules reading it, and indexed by the fields they read.
+    Classes with rules get a __setattr__ re-running the rules depending on
+    the field assigned.
     """
+    _lock = threading.RLock()
+
     def __new__(mcs, name, bases, attrs):
         field_names = set()
-        for attr, value in six.iteritems(attrs):
-            if isinstance(value, Generic):
-                value.name = attr
-                attrs[attr] = value
-                field_names.add(attr)
-
-        for base in bases:
-            parent = base.__mro__[0]
-            for attr, value in six.iteritems(vars(parent)):
-                if isinstance(value, Generic) and attr not in attrs:
-                    value.name = attr
-                    attrs[attr] = value
+        with mcs._lock:
+            for attr, value in list(attrs.items()):
+                if isinstance(value, Generic):
+                    attrs[attr] = value.bind(attr)
                     field_names.add(attr)
+
+            for base in bases:
+                parent = base.__mro__[0]
+                for attr, value in list(vars(parent).items()):
+                    if isinstance(value, Generic) and attr not in attrs:
+                        attrs[attr] = value.bind(attr)
+                        field_names.add(attr)
         attrs['field_names'] = field_names
+        # stable across processes, unlike iteration order of field_names
+        attrs['_field_order'] = tuple(sorted(field_names))
+        # (name, descriptor, needs Generic.construct to be called)
+        attrs['_constructors'] = tuple(
+            (field, attrs[field], type(attrs[field]).construct is not Generic.construct)
+            for field in attrs['_field_order']
+        )
+        # fields deep validation has to look inside
+        attrs['_nested_fields'] = tuple(
+            field for field in attrs['_field_order'] if not attrs[field]._scalar
+        )
+        # fields whose stored values have to be converted to be set again
+        attrs['_encoded_fields'] = tuple(
+            field for field in attrs['_field_order'] if attrs[field]._encoded
+        )
+        attrs['_json_encoders'] = dict(
+            (field, attrs[field].json_encoder) for field in attrs['_field_order']
+            if attrs[field].json_encoder is not None
+        )
+
+        rules = []
+        for base in bases:
+            for inherited in getattr(base, '_rules', ()):
+                if inherited.name not in attrs and inherited not in rules:
+                    rules.append(inherited)
+        rules.extend(value for value in attrs.values() if isinstance(value, Rule))
+        for declared in rules:
+            unknown = (declared.fields | declared.provides) - field_names
+            if unknown:
+                raise ValueError('rule {} uses unknown fields {}'.format(
+                    declared.name, ', '.join(sorted(unknown))
+                ))
+        attrs['_rules'] = _order_rules(rules)
+        attrs['_field_rules'] = frozenset(
+            field for declared in rules for field in declared.fields
+        )
+        if rules and '__setattr__' not in attrs:
+            attrs['__setattr__'] = _setattr_with_rules
         return type.__new__(mcs, name, bases, attrs)
 
 
-@six.python_2_unicode_compatible
-@six.add_metaclass(ObjectMeta)
+# the deep validation running in this thread, if any
+_local = threading.local()
+# kinds of value, see _DeepValidation.kind
+_LEAF = 'leaf'
+_PLAIN = 'plain'
+_VISIT = 'visit'
+_IGNORE = 'ignore'
+
+# values deep validation never needs to look inside
+_LEAF_TYPES = frozenset([type(None), bool, float, text_type, binary_type] + list(integer_types))
+
+
+def _children(node):
+    """The (path segment, value) pairs deep validation looks at inside node."""
+    if isinstance(node, dict):
+        return ((('item', key), value) for key, value in node.items())
+    if isinstance(node, Sequence):
+        return ((('index', index), value) for index, value in enumerate(node))
+    if isinstance(node, Object):
+        fields = node._fields
+        return ((name, fields[name]) for name in node._nested_fields)
+    if hasattr(node, 'validate'):
+        return ()
+    return ((None, value) for value in node)
+
+
+class _DeepValidation(object):
+    """
+    One iterative walk over the object graph below root.
+
+    Nodes are Objects (anything with a validate method) and the lists,
+    tuples, sets and dicts holding them.  Every node is claimed in `seen`,
+    keyed by id, when it is visited so shared nodes are visited once and
+    cycles end.  The walks of `Object.validate` calls made during a walk,
+    and walks working on parts of one graph in several threads, share
+    `seen`; threads claim nodes under `lock`.
+
+    No paths are kept while walking; the path to a node which failed is
+    found again from root, as errors are rare.
+
+    A walk made by `deep_validate` defers: `Object.validate` called on a
+    node during it only queues the node's children on the walk, so chains
+    of Objects overriding validate do not recurse.
+    """
+
+    def __init__(self, root, seen=None, lock=None, defer=False):
+        self.root = root
+        self.seen = {} if seen is None else seen
+        self.lock = lock
+        self.defer = defer
+        self.stack = []
+        # type -> kind, see kind()
+        self.kinds = {}
+        # the node being validated
+        self.node = None
+
+    def claim(self, node):
+        """Mark node seen, returning False if it already was."""
+        key = id(node)
+        seen = self.seen
+        if self.lock is None:
+            if key in seen:
+                return False
+            seen[key] = node
+            return True
+        with self.lock:
+            if key in seen:
+                return False
+            seen[key] = node
+            return True
+
+    def kind(self, node):
+        """
+        Return how node is handled: _LEAF for Objects validated with
+        Object.validate which have no nested fields, _PLAIN for others
+        validated with it, _VISIT for other Objects and collections and
+        _IGNORE for values which are not nodes.
+        """
+        klass = type(node)
+        kind = self.kinds.get(klass)
+        if kind is None:
+            if klass in _LEAF_TYPES:
+                kind = _IGNORE
+            elif issubclass(klass, Object) and klass.validate is Object.validate:
+                kind = _PLAIN if klass._nested_fields else _LEAF
+            elif issubclass(klass, _NODE_TYPES) or hasattr(klass, 'validate'):
+                kind = _VISIT
+            else:
+                kind = _IGNORE
+            self.kinds[klass] = kind
+        return kind
+
+    def enqueue(self, values):
+        """
+        Queue the nodes among values to be visited in the order given.
+        Unless deferring, those which cannot lead to other nodes are
+        validated straight away.
+        """
+        seen = self.seen
+        stack = self.stack
+        kinds = self.kinds
+        # leaves are queued too when deferring, as this may be called by an
+        # override which must not see their errors
+        defer = self.defer
+        start = len(stack)
+        for value in values:
+            kind = kinds.get(type(value)) or self.kind(value)
+            if kind is _IGNORE or id(value) in seen:
+                continue
+            if kind is not _LEAF or defer:
+                stack.append(value)
+                continue
+            if self.lock is None:
+                seen[id(value)] = value
+            elif not self.claim(value):
+                continue
+            self.node = value
+            value._reset_fields()
+        if len(stack) - start > 1:
+            stack[start:] = stack[:start - 1 if start else None:-1]
+
+    def visit(self, node):
+        """Validate an Object which overrides validate or queue a collection's elements."""
+        if isinstance(node, dict):
+            self.enqueue(node.values())
+        elif isinstance(node, Sequence):
+            # before validate, which a LazyList also has
+            self.enqueue(node)
+        elif hasattr(node, 'validate'):
+            node.validate()
+        else:
+            self.enqueue(node)
+
+    def path_to(self, target):
+        """Return the path from root to target, or () if it is not found."""
+        stack = [(self.root, ())]
+        seen = set()
+        while stack:
+            node, path = stack.pop()
+            if node is target:
+                return path
+            if type(node) in _LEAF_TYPES or id(node) in seen:
+                continue
+            if not (isinstance(node, _NODE_TYPES) or hasattr(node, 'validate')):
+                continue
+            seen.add(id(node))
+            found = [
+                (value, path if segment is None else path + (segment,))
+                for segment, value in _children(node)
+            ]
+            stack.extend(reversed(found))
+        return ()
+
+    def run(self, values=(), breadth=None):
+        """
+        Queue the nodes among values, then visit queued nodes depth first
+        until none are left or, if breadth is given, breadth first until
+        that many are queued.
+        """
+        previous = getattr(_local, 'run', None)
+        _local.run = self
+        stack = self.stack
+        seen = self.seen
+        locked = self.lock is not None
+        self.node = None
+        try:
+            self.enqueue(values)
+            while stack:
+                if breadth is None:
+                    node = stack.pop()
+                elif len(stack) < breadth:
+                    node = stack.pop(0)
+                else:
+                    break
+                if locked:
+                    if not self.claim(node):
+                        continue
+                elif id(node) in seen:
+                    continue
+                else:
+                    seen[id(node)] = node
+                self.node = node
+                kind = self.kind(node)
+                if kind is _PLAIN or kind is _LEAF:
+                    # skip starting another walk
+                    node._reset_fields()
+                    fields = node._fields
+                    self.enqueue([fields[name] for name in node._nested_fields])
+                else:
+                    self.visit(node)
+        except ValidationError as ex:
+            for segment in reversed(self.path_to(self.node)):
+                ex.push(segment)
+            raise
+        finally:
+            _local.run = previous
+
+    def fork(self, node):
+        """Return a walk of the subtree at node sharing this walk's memo."""
+        walk = _DeepValidation(self.root, self.seen, self.lock, self.defer)
+        walk.stack.append(node)
+        return walk
+
+
+def deep_validate(obj, executor=None, split=64):
+    """
+    Call validate on obj and every Object reachable from it through fields,
+    lists, tuples, sets and dict values, each exactly once.
+
+    The graph is walked iteratively so deep documents cannot exhaust the
+    stack, and shared sub-objects and cycles are handled by an identity
+    memo.  Errors raised by nested Objects get the path to them pushed on.
+
+    Unlike `Object.validate`, overrides calling `Object.validate(self)` on
+    nested Objects do not validate the Objects below them there and then:
+    those are queued and validated after the override returns, so errors
+    from them cannot be caught by the override.
+
+    Given an executor, e.g. a ThreadPoolExecutor, the graph is expanded
+    breadth first until `split` independent subtrees are found and those
+    are validated by the executor, still visiting shared nodes once.  This
+    only helps on builds without a GIL or when validators release it.
+    """
+    walk = _DeepValidation(obj, defer=True)
+    if executor is None:
+        walk.run([obj])
+        return obj
+
+    walk.lock = threading.Lock()
+    walk.run([obj], breadth=split)
+    futures = [executor.submit(walk.fork(node).run) for node in walk.stack]
+    del walk.stack[:]
+    error = None
+    for future in futures:
+        try:
+            future.result()
+        except ValidationError as ex:
+            if error is None:
+                error = ex
+    if error is not None:
+        raise error
+    return obj
+
+
+def restore(cls, values, state=None, names=None):
+    """
+    Rebuild an instance of cls from values ordered by `cls._field_order`.
+
+    The values are trusted to have been validated already so no descriptor is
+    run; this is what unpickling an Object calls.  If names, the field order
+    the values were saved in, is given and no longer matches, the fields of
+    cls changed since and the values are validated with `revalidate` instead.
+    """
+    if names is not None and tuple(names) != cls._field_order:
+        obj = revalidate(cls, names, values)
+    else:
+        obj = cls.__new__(cls)
+        obj._fields = dict(zip(cls._field_order, values))
+    if state:
+        obj.__dict__.update(state)
+    return obj
+
+
+class _Restorer(object):
+    """
+    Calls restore for instances of one class.  Being one object per class,
+    a pickle stores it, along with the field order, once for all of them.
+    """
+
+    def __init__(self, cls, names=None):
+        self.cls = cls
+        self.names = cls._field_order if names is None else names
+
+    def __call__(self, values, state=None):
+        return restore(self.cls, values, state, self.names)
+
+    def __reduce__(self):
+        return _Restorer, (self.cls, self.names)
+
+
+def revalidate(cls, names, values):
+    """
+    Build an instance of cls from the stored values of the fields named
+    names, validating them.  Fields cls does not have are ignored.
+    """
+    field_names = cls.field_names
+    return cls(**dict(
+        (name, getattr(cls, name).as_input(value))
+        for name, value in zip(names, values) if name in field_names
+    ))
+
+
+@python_2_unicode_compatible
+@add_metaclass(ObjectMeta)
 class Object(object):
     """
     Base class for creating object models
     """
     field_names = None  # stub gets set in ObjectMeta.__new__
+    _field_order = ()  # stub gets set in ObjectMeta.__new__
+    _constructors = ()  # stub gets set in ObjectMeta.__new__
+    _json_encoders = {}  # stub gets set in ObjectMeta.__new__
+    _nested_fields = ()  # stub gets set in ObjectMeta.__new__
+    _encoded_fields = ()  # stub gets set in ObjectMeta.__new__
+    _rules = ()  # stub gets set in ObjectMeta.__new__
+    _field_rules = frozenset()  # stub gets set in ObjectMeta.__new__
+    _observers = ()  # set on instances by add_observer
+    __schema_version__ = None
 
     def __init__(self, **kwargs):
         self._fields = {}
         cls = self.__class__
         for field in self.field_names:  # pylint: disable=E1135,E1133
             self._fields[field] = getattr(cls, field).get_default()
+        if cls._rules:
+            self.update(kwargs)
+            return
         for key, value in kwargs.items():
             if key in self.field_names:  # pylint: disable=E1135,E1133
                 setattr(self, key, value)
 
+    def _run_rules(self, changed, errors=None):
+        """
+        Run the rules reading any of the changed fields, in dependency
+        order.  Errors are added to errors, an ErrorReport, if given.
+        """
+        state = self.__dict__
+        batched = '_pending' in state
+        if not batched:
+            # fields set by rules are covered by their provides
+            state['_pending'] = set()
+        changed = set(changed)
+        try:
+            for declared in self._rules:
+                if declared.fields.isdisjoint(changed):
+                    continue
+                if errors is None:
+                    declared.check(self)
+                else:
+                    try:
+                        declared.check(self)
+                    except ValidationError as ex:
+                        errors.add(ex)
+                        if errors.exhausted:
+                            return
+                        continue
+                changed.update(declared.provides)
+        finally:
+            if not batched:
+                del state['_pending']
+
+    @classmethod
+    def construct(cls, doc, schema_version=None):
+        """
+        Create an instance from a trusted dict without validating it.
+
+        Values are stored as they are; nested dicts for EmbeddedObject fields
+        and collection elements are built the same way.  Missing fields get
+        their defaults and unknown keys are ignored.  If schema_version is
+        given and does not match `__schema_version__` the document is
+        considered stale and goes through full validation instead.
+        """
+        if schema_version is not None and schema_version != cls.__schema_version__:
+            return cls(**doc)
+        fields = {}
+        for name, descriptor, nested in cls._constructors:
+            if name in doc:
+                value = doc[name]
+                if nested and value is not None:
+                    value = descriptor.construct(value)
+                fields[name] = value
+            else:
+                fields[name] = descriptor.get_default()
+        obj = cls.__new__(cls)
+        obj._fields = fields
+        return obj
+
     def __str__(self):
         return str(self.__json__())
 
+    def __reduce__(self):
+        fields = self._fields
+        values = tuple([fields[name] for name in self._field_order])
+        state = dict(self.__dict__)
+        del state['_fields']
+        # observers watch this instance, not copies of it
+        state.pop('_observers', None)
+        cls = self.__class__
+        restorer = cls.__dict__.get('_restorer')
+        if restorer is None:
+            restorer = cls._restorer = _Restorer(cls)
+        if state:
+            return restorer, (values, state)
+        return restorer, (values,)
+
     def __json__(self):
         """
         Convert the Object instance and any nested Objects into a dict.
         """
         json_doc = {}
-        for key, value in six.iteritems(self._fields):
-            if hasattr(value, '__json__'):
+        encoders = self._json_encoders
+        for key, value in self._fields.items():
+            if key in encoders and value is not None:
+                json_doc[key] = encoders[key](value)
+            elif hasattr(value, 'materialize'):
+                # a lazy EmbeddedObject, built by the descriptor so errors get the field
+                json_doc[key] = getattr(self, key).__json__()
+            elif hasattr(value, '__json__'):
                 json_doc[key] = value.__json__()
             elif isinstance(value, list):
                 json_doc[key] = [
@@ -151,34 +889,184 @@ class Object(object):
             elif isinstance(value, dict):
                 json_doc[key] = dict(
                     (k, v.__json__()) if hasattr(v, '__json__') else (k, v)
-                    for k, v in six.iteritems(value)
+                    for k, v in value.items()
                 )
             else:
                 json_doc[key] = value
 
         return json_doc
 
-    def update(self, doc):
+    @classmethod
+    def load(cls, doc, errors=None):
+        """
+        Create an instance from a dict.
+
+        Without errors this is the same as `cls(**doc)`.  Given an ErrorReport
+        every invalid field is added to it instead of raising the first
+        ValidationError, and the fields which failed keep their defaults.
+        """
+        if errors is None:
+            return cls(**doc)
+        obj = cls()
+        obj.update(doc, errors)
+        return obj
+
+    def update(self, doc, errors=None):
         """
         Update attributes from a dict-like object
+
+        If errors, an ErrorReport, is given every invalid field is added to it
+        rather than raising the first ValidationError.
         """
-        for key, value in six.iteritems(doc):
+        cls = self.__class__
+        if errors is None:
+            if not cls._rules or '_pending' in self.__dict__:
+                for key, value in doc.items():
+                    if key in self._fields:
+                        setattr(self, key, value)
+                return None
+            # run the rules once every field is set
+            state = self.__dict__
+            state['_pending'] = changed = set()
+            try:
+                for key, value in doc.items():
+                    if key in self._fields:
+                        setattr(self, key, value)
+            finally:
+                del state['_pending']
+            if changed:
+                self._run_rules(changed)
+            return None
+
+        changed = set()
+        found = len(errors)
+        for key, value in doc.items():
+            if errors.exhausted:
+                break
             if key in self._fields:
+                if getattr(cls, key).collect(self, value, errors) is not INVALID:
+                    changed.add(key)
+        if cls._rules and changed and len(errors) == found:
+            self._run_rules(changed, errors)
+        return errors
+
+    def collect_errors(self, errors=None):
+        """
+        Validate like `validate` but return an ErrorReport holding every
+        problem found, including those in nested Objects, instead of raising
+        the first.  The multi-field checks of an overridden `validate` only
+        run once every field, and every Object below it, is valid.
+
+        Like `deep_validate` the graph is walked iteratively with an identity
+        memo, so shared Objects are checked once and cycles end.
+        """
+        if errors is None:
+            errors = ErrorReport()
+        seen = {}
+        # (node, report for it, errors found before its fields were checked
+        # or None if it still has to be visited)
+        stack = [(self, errors, None)]
+        while stack and not errors.exhausted:
+            node, report, found = stack.pop()
+            if found is not None:
+                node._check_whole(report, found)
+                continue
+            if type(node) in _LEAF_TYPES or id(node) in seen:
+                continue
+            if isinstance(node, Object):
+                seen[id(node)] = node
+                stack.append((node, report, len(errors)))
+                children = node._collect_fields(report)
+            elif isinstance(node, _NODE_TYPES):
+                seen[id(node)] = node
+                children = [(report.nested(segment), value) for segment, value in _children(node)]
+            elif hasattr(node, 'collect_errors'):
+                node.collect_errors(report)
+                continue
+            else:
+                continue
+            stack.extend((value, child, None) for child, value in reversed(children))
+        return errors
+
+    def _collect_fields(self, errors):
+        """
+        Set every field to its current value again, adding any problem to
+        errors, and return the (report, value) pairs of the valid fields
+        which may hold Objects.
+        """
+        cls = self.__class__
+        fields = self._fields
+        nested = []
+        for key in self._field_order:
+            if errors.exhausted:
+                break
+            descriptor = getattr(cls, key)
+            value = descriptor.collect(self, descriptor.as_input(fields[key]), errors)
+            if value is not INVALID and not descriptor._scalar:
+                nested.append((errors.nested(key), value))
+        return nested
+
+    def _check_whole(self, errors, found):
+        """Run the rules and an overridden validate if no error was found since found."""
+        cls = self.__class__
+        if cls._rules and len(errors) == found and not errors.exhausted:
+            self._run_rules(self._field_rules, errors)
+        if len(errors) == found and not errors.exhausted and \
+                cls.validate is not Object.validate:
+            try:
+                self.validate()
+            except ValidationError as ex:
+                errors.add(ex)
+
+    def _reset_fields(self):
+        """Set every field to its current value again, validating it, then run every rule."""
+        fields = self._fields
+        encoded = self._encoded_fields
+        if encoded:
+            fields = dict(fields)
+            cls = self.__class__
+            for key in encoded:
+                fields[key] = getattr(cls, key).as_input(fields[key])
+        if not self._rules:
+            for key, value in fields.items():
                 setattr(self, key, value)
+            return
+        for key, value in fields.items():
+            object.__setattr__(self, key, value)
+        self._run_rules(self._field_rules)
 
     def validate(self):
         """
         Allows for multi-field validation
+
+        Every field is set again, then every Object reachable from this one
+        is validated once, see `deep_validate`, before this returns.  Called
+        while another Object is validating, e.g. by an override calling
+        `Object.validate(self)`, Objects already validated are skipped.
         """
-        for key in self._fields:
-            setattr(self, key, self._fields[key])
-        for key, value in six.iteritems(self._fields):
-            if hasattr(value, 'validate'):
-                value.validate()
-            elif isinstance(value, list):
-                for v in value:
-                    if hasattr(v, 'validate'):
-                        v.validate()
+        outer = getattr(_local, 'run', None)
+        if outer is None:
+            walk = _DeepValidation(self)
+        elif outer.defer:
+            walk = outer
+        else:
+            walk = _DeepValidation(self, outer.seen, outer.lock)
+        # already claimed if the outer walk is visiting self
+        walk.claim(self)
+        self._reset_fields()
+        nested = self._nested_fields
+        if nested:
+            fields = self._fields
+            values = [fields[name] for name in nested]
+            if walk is outer:
+                walk.enqueue(values)
+            else:
+                walk.run(values)
+
 
+# what deep validation looks inside, besides anything with a validate method
+_NODE_TYPES = (Object, list, tuple, set, frozenset, dict)
 
-__all__ = ['Object']
+__all__ = [
+    'Object', 'add_observer', 'add_observer_to_all', 'deep_validate', 'remove_observer', 'rule'
+]
@@ -0,0 +1,344 @@
+"""
+Keep Objects of one model in memory with indexes on some of their fields.
+
+An `ObjectCollection` finds instances by the value of a field without
+scanning every one of them.  Hash indexes answer equality and IN lookups,
+sorted indexes answer ranges too.  Indexes are kept up to date as indexed
+fields of the instances in the collection are assigned, deleted or changed
+by rules.
+
+    people = ObjectCollection(Person, indexes={'city': 'hash', Person.age: 'sorted'})
+    people.extend(load_people())
+    people.get('city', 'Lisbon')
+    people.get_in('city', ['Lisbon', 'Porto'])
+    people.between('age', 18, 30)
+    people.memory_usage()  # {'age': 8812000, 'city': 1180000}
+
+Values of indexed fields must be hashable, and for sorted indexes
+comparable with each other apart from None, which range lookups never
+return.
+"""
+import sys
+from bisect import bisect_left, bisect_right, insort
+
+from .base import Generic, add_observer, add_observer_to_all, remove_observer
+
+
+class _Index(object):
+    """Instances by the value of one field."""
+
+    def __init__(self, model, field):
+        self.field = field
+        descriptor = getattr(model, field)
+        if type(descriptor).__get__ is Generic.__get__:
+            self.key = lambda obj: obj._fields[field]
+        else:
+            # e.g. Choice storing codes gives back the value
+            self.key = lambda obj: descriptor.__get__(obj, model)
+        # key -> the instance, or {id(obj): obj} if there are several
+        self.buckets = {}
+        # id(obj) -> key, to find the bucket of a changed instance
+        self.keys = {}
+
+    def add(self, obj):
+        key = self.key(obj)
+        buckets = self.buckets
+        bucket = buckets.get(key)
+        if bucket is None:
+            # raises TypeError for values a sorted index cannot order
+            self.new_key(key)
+            buckets[key] = obj
+        elif type(bucket) is dict:
+            bucket[id(obj)] = obj
+        else:
+            buckets[key] = {id(bucket): bucket, id(obj): obj}
+        self.keys[id(obj)] = key
+
+    def remove(self, obj):
+        key = self.keys.pop(id(obj))
+        buckets = self.buckets
+        bucket = buckets[key]
+        if type(bucket) is not dict:
+            del buckets[key]
+            self.removed_key(key)
+            return
+        del bucket[id(obj)]
+        if len(bucket) == 1:
+            buckets[key], = bucket.values()
+
+    def fill(self, objects):
+        """Index objects, replacing whatever was indexed."""
+        objects = list(objects)
+        idents = [id(obj) for obj in objects]
+        values = [self.key(obj) for obj in objects]
+        self.keys = dict(zip(idents, values))
+        buckets = self.buckets = {}
+        get = buckets.get
+        for obj, ident, key in zip(objects, idents, values):
+            bucket = get(key)
+            if bucket is None:
+                buckets[key] = obj
+            elif type(bucket) is dict:
+                bucket[ident] = obj
+            else:
+                buckets[key] = {id(bucket): bucket, ident: obj}
+        self.filled()
+
+    def new_key(self, key):
+        pass
+
+    def removed_key(self, key):
+        pass
+
+    def filled(self):
+        pass
+
+    @staticmethod
+    def members(bucket):
+        if type(bucket) is dict:
+            return list(bucket.values())
+        return [bucket]
+
+    def get(self, value):
+        bucket = self.buckets.get(value)
+        return [] if bucket is None else self.members(bucket)
+
+    def memory_usage(self):
+        size = sys.getsizeof(self.buckets) + sys.getsizeof(self.keys)
+        return size + sum(
+            sys.getsizeof(bucket) for bucket in self.buckets.values() if type(bucket) is dict
+        )
+
+
+class HashIndex(_Index):
+    """Equality and IN lookups."""
+    kind = 'hash'
+
+
+class SortedIndex(_Index):
+    """Equality, IN and range lookups, in order of value."""
+    kind = 'sorted'
+
+    def __init__(self, model, field):
+        _Index.__init__(self, model, field)
+        # the distinct values other than None, in order
+        self.order = []
+
+    def new_key(self, key):
+        if key is not None:
+            insort(self.order, key)
+
+    def removed_key(self, key):
+        if key is not None:
+            order = self.order
+            del order[bisect_left(order, key)]
+
+    def filled(self):
+        self.order = sorted(key for key in self.buckets if key is not None)
+
+    def between(self, low=None, high=None, include_low=True, include_high=True):
+        order = self.order
+        if low is None:
+            start = 0
+        else:
+            start = (bisect_left if include_low else bisect_right)(order, low)
+        if high is None:
+            stop = len(order)
+        else:
+            stop = (bisect_right if include_high else bisect_left)(order, high)
+        buckets = self.buckets
+        members = self.members
+        found = []
+        for key in order[start:stop]:
+            found.extend(members(buckets[key]))
+        return found
+
+    def memory_usage(self):
+        return _Index.memory_usage(self) + sys.getsizeof(self.order)
+
+
+_INDEX_TYPES = {'hash': HashIndex, 'sorted': SortedIndex}
+
+
+def _field_name(field):
+    # a field name or the descriptor, e.g. Person.age
+    return getattr(field, 'name', field)
+
+
+class ObjectCollection(object):
+    """
+    A set of instances of model, by identity, with indexes on fields.
+
+    indexes: dict of field name, or descriptor, to 'hash' or 'sorted'.
+    """
+
+    def __init__(self, model, objects=(), indexes=None):
+        self.model = model
+        self._objects = {}
+        self._indexes = {}
+        # the fields observed for changes
+        self.fields = frozenset()
+        for field, kind in (indexes or {}).items():
+            self.add_index(field, kind)
+        self.extend(objects)
+
+    def add_index(self, field, kind='hash'):
+        """Index field, 'hash' for equality and IN or 'sorted' for ranges too."""
+        field = _field_name(field)
+        if field not in self.model.field_names:
+            raise ValueError('{} has no field {!r}'.format(self.model.__name__, field))
+        if kind not in _INDEX_TYPES:
+            raise ValueError('unknown index kind {!r}'.format(kind))
+        index = _INDEX_TYPES[kind](self.model, field)
+        index.fill(self._objects.values())
+        self._indexes[field] = index
+        self.fields = frozenset(self._indexes)
+
+    def drop_index(self, field):
+        del self._indexes[_field_name(field)]
+        self.fields = frozenset(self._indexes)
+
+    def index(self, field):
+        """Return the index on field, or None."""
+        return self._indexes.get(_field_name(field))
+
+    def add(self, obj):
+        if not isinstance(obj, self.model):
+            raise TypeError('expected an instance of {}'.format(self.model.__name__))
+        if id(obj) in self._objects:
+            return
+        added = []
+        try:
+            for index in self._indexes.values():
+                index.add(obj)
+                added.append(index)
+        except TypeError:
+            # an unhashable value
+            for index in added:
+                index.remove(obj)
+            raise
+        self._objects[id(obj)] = obj
+        add_observer(obj, self)
+
+    def extend(self, objects):
+        objects = list(objects)
+        if len(objects) < max(len(self._objects), 1024):
+            for obj in objects:
+                self.add(obj)
+            return
+        # many at once: index everything again, sorting each sorted index once
+        model = self.model
+        added = {}
+        for obj in objects:
+            if not isinstance(obj, model):
+                raise TypeError('expected an instance of {}'.format(model.__name__))
+            if id(obj) not in self._objects:
+                added[id(obj)] = obj
+        objects = list(added.values())
+        previous = dict(self._objects)
+        self._objects.update(added)
+        try:
+            self._rebuild()
+        except TypeError:
+            # an unhashable value
+            self._objects = previous
+            self._rebuild()
+            raise
+        add_observer_to_all(objects, self)
+
+    def _rebuild(self):
+        for index in self._indexes.values():
+            index.fill(self._objects.values())
+
+    def remove(self, obj):
+        """Remove obj, raising KeyError if it is not in the collection."""
+        if id(obj) not in self._objects:
+            raise KeyError(obj)
+        for index in self._indexes.values():
+            index.remove(obj)
+        del self._objects[id(obj)]
+        remove_observer(obj, self)
+
+    def discard(self, obj):
+        if id(obj) in self._objects:
+            self.remove(obj)
+
+    def field_changed(self, obj, field):
+        """Move obj within the index on field; called by its __setattr__."""
+        index = self._indexes.get(field)
+        if index is not None:
+            index.remove(obj)
+            index.add(obj)
+
+    def reindex(self, obj):
+        """Index obj again, e.g. after its `_fields` were changed directly."""
+        for index in self._indexes.values():
+            index.remove(obj)
+            index.add(obj)
+
+    def __len__(self):
+        return len(self._objects)
+
+    def __iter__(self):
+        return iter(list(self._objects.values()))
+
+    def __contains__(self, obj):
+        return id(obj) in self._objects
+
+    def _scan(self, field, test):
+        get = getattr(self.model, field).__get__
+        model = self.model
+        return [obj for obj in self._objects.values() if test(get(obj, model))]
+
+    def get(self, field, value):
+        """Return the instances whose field equals value."""
+        field = _field_name(field)
+        index = self._indexes.get(field)
+        if index is not None:
+            return index.get(value)
+        return self._scan(field, lambda found: found == value)
+
+    def get_in(self, field, values):
+        """Return the instances whose field equals any of values."""
+        field = _field_name(field)
+        values = set(values)
+        index = self._indexes.get(field)
+        if index is not None:
+            return [obj for value in values for obj in index.get(value)]
+        return self._scan(field, values.__contains__)
+
+    def between(self, field, low=None, high=None, include_low=True, include_high=True):
+        """
+        Return the instances whose field is between low and high, either of
+        which may be None for no bound.  None values are never returned.
+        """
+        field = _field_name(field)
+        index = self._indexes.get(field)
+        if isinstance(index, SortedIndex):
+            return index.between(low, high, include_low, include_high)
+
+        def test(found):
+            if found is None:
+                return False
+            if low is not None and (found < low if include_low else found <= low):
+                return False
+            if high is not None and (found > high if include_high else found >= high):
+                return False
+            return True
+        return self._scan(field, test)
+
+    def memory_usage(self):
+        """
+        Map each indexed field to the bytes used by its index's own dicts and
+        lists, not counting the values and instances they refer to.
+        """
+        return dict((field, index.memory_usage()) for field, index in self._indexes.items())
+
+    def __repr__(self):
+        return 'ObjectCollection({}, {} objects, indexes={!r})'.format(
+            self.model.__name__, len(self),
+            dict((field, index.kind) for field, index in self._indexes.items())
+        )
+
+
+__all__ = ['HashIndex', 'ObjectCollection', 'SortedIndex']
@@ -0,0 +1,207 @@
+"""
+Convert between lists of Objects and columns of field values.
+
+`to_columns` reads the field values of a list of instances of one model
+straight into one list per field, or for numeric and time fields into an
+`array.array` or NumPy array, rather than going through `__json__` and
+transposing.  The fields of `EmbeddedObject` fields are flattened into
+columns named with dots, e.g. 'origin.x'.  `from_columns` validates each
+column with its descriptor and builds the instances.
+
+    columns = to_columns(shapes, kind='numpy')
+    columns['origin.x'].mean()
+    shapes = from_columns(Shape, columns)
+"""
+from array import array
+
+from .base import Generic, Object, restore
+from .descriptors import Bool, DateTime, EmbeddedObject, Float, Integer, TimeDelta
+from .exc import ValidationError
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+# descriptor type -> array typecode, most specific first
+_ARRAY_TYPES = ((Bool, 'B'), (Integer, 'q'), (Float, 'd'))
+_NUMPY_TYPES = (
+    (Bool, 'bool'), (Integer, 'int64'), (Float, 'float64'),
+    (DateTime, 'datetime64[us]'), (TimeDelta, 'timedelta64[us]'),
+)
+
+
+def _numpy():
+    if numpy is None:
+        raise RuntimeError("kind='numpy' requires numpy")
+    return numpy
+
+
+def _field_values(model, name, objects):
+    descriptor = getattr(model, name)
+    if type(descriptor).__get__ is Generic.__get__:
+        return [None if obj is None else obj._fields[name] for obj in objects]
+    get = descriptor.__get__
+    return [None if obj is None else get(obj, model) for obj in objects]
+
+
+def _column(descriptor, values, kind):
+    """Pack values into the container for kind, or leave them a list."""
+    if kind == 'list':
+        return values
+    for klass, dtype in (_ARRAY_TYPES if kind == 'array' else _NUMPY_TYPES):
+        if isinstance(descriptor, klass):
+            break
+    else:
+        return values
+    if None in values:
+        return values
+    try:
+        if kind == 'array':
+            return array(dtype, values)
+        return _numpy().array(values, dtype=dtype)
+    except (OverflowError, TypeError, ValueError):
+        return values
+
+
+def _extract(model, objects, prefix, columns, kind):
+    for name in model._field_order:
+        descriptor = getattr(model, name)
+        values = _field_values(model, name, objects)
+        if isinstance(descriptor, EmbeddedObject):
+            _extract(descriptor.class_obj, values, prefix + name + '.', columns, kind)
+        else:
+            columns[prefix + name] = _column(descriptor, values, kind)
+
+
+def to_columns(objects, model=None, kind='list'):
+    """
+    Return a dict of column name to the values of that field in objects.
+
+    objects must all be instances of model, by default the class of the
+    first of them.  kind is 'list' for lists of values, or 'array' or
+    'numpy' to put Integer, Float and Bool columns, and for NumPy DateTime
+    and TimeDelta too, in an `array.array` or a NumPy array.  Columns
+    holding None or values the array type cannot hold stay lists.  Where an
+    EmbeddedObject field is None its columns hold None.
+    """
+    if kind not in ('list', 'array', 'numpy'):
+        raise ValueError('unknown kind {!r}'.format(kind))
+    if kind == 'numpy':
+        _numpy()
+    objects = list(objects)
+    if model is None:
+        if not objects:
+            raise ValueError('model is required for an empty list of objects')
+        model = objects[0].__class__
+    for obj in objects:
+        if not isinstance(obj, model):
+            raise TypeError('expected an instance of {}'.format(model.__name__))
+    columns = {}
+    _extract(model, objects, '', columns, kind)
+    return columns
+
+
+def _validate_column(descriptor, values):
+    dummy = Object()
+    setter = descriptor.__set__
+    validated = []
+    for row, value in enumerate(values):
+        try:
+            validated.append(setter(dummy, value))
+        except ValidationError as ex:
+            # from_columns pushes the row once the path below it is complete
+            ex.row = row
+            raise
+    return validated
+
+
+def _as_list(name, values, count):
+    if len(values) != count:
+        raise ValueError('column {!r} has {} values, expected {}'.format(
+            name, len(values), count
+        ))
+    if isinstance(values, list):
+        return values
+    # array.array and NumPy arrays give back Python values
+    return values.tolist()
+
+
+def _build_nested(descriptor, columns, count):
+    """Build the values of an EmbeddedObject field, None where all its columns are."""
+    columns = dict((name, _as_list(name, values, count)) for name, values in columns.items())
+    present = [
+        row for row in range(count)
+        if any(values[row] is not None for values in columns.values())
+    ]
+    try:
+        built = _build(descriptor.class_obj, dict(
+            (name, [values[row] for row in present]) for name, values in columns.items()
+        ), len(present))
+    except ValidationError as ex:
+        ex.row = present[ex.row]
+        raise ex.push(descriptor.name)
+    values = [None] * count
+    for row, obj in zip(present, built):
+        values[row] = obj
+    return values
+
+
+def _build(model, columns, count):
+    nested = {}
+    for name, values in columns.items():
+        field, dot, rest = name.partition('.')
+        if dot:
+            nested.setdefault(field, {})[rest] = values
+        elif field not in model.field_names:
+            raise ValueError('{} has no field {!r}'.format(model.__name__, field))
+
+    ordered = []
+    for name in model._field_order:
+        descriptor = getattr(model, name)
+        if name in nested and name not in columns:
+            if not isinstance(descriptor, EmbeddedObject):
+                raise ValueError('{}.{} is not an EmbeddedObject'.format(model.__name__, name))
+            values = _build_nested(descriptor, nested[name], count)
+        elif name in columns:
+            values = _as_list(name, columns[name], count)
+        else:
+            ordered.append([descriptor.get_default() for _ in range(count)])
+            continue
+        ordered.append(_validate_column(descriptor, values))
+
+    objects = [restore(model, row) for row in zip(*ordered)] if ordered else [
+        restore(model, ()) for _ in range(count)
+    ]
+    if model._rules:
+        for row, obj in enumerate(objects):
+            try:
+                obj._run_rules(model.field_names)
+            except ValidationError as ex:
+                ex.row = row
+                raise
+    return objects
+
+
+def from_columns(model, columns):
+    """
+    Build instances of model from a dict of columns as made by `to_columns`.
+
+    Every value is validated by the descriptor of its field, column by
+    column, and cross-field rules are run for each instance.  Fields with
+    no column get their defaults.  The first ValidationError found is
+    raised with the row index on its path, e.g. '[3].origin.x'.  Where every
+    column of an EmbeddedObject field is None the field is set to None.
+    """
+    if not columns:
+        return []
+    count = len(next(iter(columns.values())))
+    try:
+        return _build(model, columns, count)
+    except ValidationError as ex:
+        if hasattr(ex, 'row'):
+            ex.push(('index', ex.row))
+        raise
+
+
+__all__ = ['to_columns', 'from_columns']
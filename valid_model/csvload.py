@@ -0,0 +1,314 @@
+"""
+Load the rows of a CSV file into Objects.
+
+The header is matched to the model's fields once, and each column gets a
+converter chosen by the type of its descriptor, e.g. `int` for Integer and
+the cached ISO-8601 parser for DateTime, so no per-field mutators are
+needed to turn the strings of a CSV file into values.  Rows are read and
+converted in chunks, and each row is then validated by the model.
+
+    with open('readings.csv') as fp:
+        for reading in load_csv(Reading, fp, on_error='yield'):
+            if isinstance(reading, RowError):
+                log.warning('row %s: %s', reading.row, reading.errors.as_dict())
+            else:
+                store(reading)
+
+Header names with dots, e.g. 'origin.x', fill the fields of EmbeddedObject
+fields.  Columns which are not fields are ignored.
+"""
+import csv
+import json
+from datetime import timedelta
+from itertools import islice
+
+from ._compat import integer_types
+from .descriptors import (
+    Bool, Bytes, Choice, DateTime, Dict, EmbeddedObject, Float, Integer, List, Set,
+    String, TimeDelta
+)
+from .exc import ErrorReport, ValidationError
+from .utils import parse_iso_datetime, parse_iso_duration
+
+_BOOLS = {
+    'true': True, 't': True, 'yes': True, 'y': True, '1': True,
+    'false': False, 'f': False, 'no': False, 'n': False, '0': False,
+}
+
+
+def _bool(cell):
+    return _BOOLS[cell.strip().lower()]
+
+
+def _datetime(descriptor):
+    def convert(cell):
+        try:
+            return parse_iso_datetime(cell)
+        except ValueError:
+            if not descriptor.parse:
+                raise
+        # the descriptor converts any epoch number
+        return descriptor.parse_value(float(cell))
+    return convert
+
+
+def _timedelta(cell):
+    try:
+        return parse_iso_duration(cell)
+    except ValueError:
+        return timedelta(seconds=float(cell))
+
+
+def _choice(descriptor):
+    lookup = descriptor._lookup
+    if not any(isinstance(choice, integer_types) for choice in descriptor.choices):
+        return None
+
+    def convert(cell):
+        return cell if cell in lookup else int(cell)
+    return convert
+
+
+def _bytes(cell):
+    return cell.encode('utf-8')
+
+
+def _set(cell):
+    # JSON has no sets, so they are written as arrays
+    return set(json.loads(cell))
+
+
+def converter(descriptor):
+    """
+    Return the function converting a CSV cell for descriptor, or None to keep
+    the string.
+    """
+    if isinstance(descriptor, String):
+        return None
+    if isinstance(descriptor, Bool):
+        return _bool
+    if isinstance(descriptor, Integer):
+        return int
+    if isinstance(descriptor, Float):
+        return float
+    if isinstance(descriptor, DateTime):
+        return _datetime(descriptor)
+    if isinstance(descriptor, TimeDelta):
+        return _timedelta
+    if isinstance(descriptor, Choice):
+        return _choice(descriptor)
+    if isinstance(descriptor, Bytes):
+        return _bytes
+    if isinstance(descriptor, Set):
+        return _set
+    if isinstance(descriptor, (List, Dict)):
+        # collections are written as JSON
+        return json.loads
+    return None
+
+
+def _expected(descriptor):
+    label = getattr(descriptor, '_number_label', None) or getattr(descriptor, '_type_label', None)
+    if label:
+        return label
+    if isinstance(descriptor, Bool):
+        return 'a bool'
+    if isinstance(descriptor, (List, Set, Dict)):
+        return 'JSON'
+    # Choice of integers
+    return 'an int'
+
+
+class RowError(object):
+    """A row which could not be loaded: its number, raw cells and errors."""
+
+    def __init__(self, row, cells, errors):
+        self.row = row
+        self.cells = cells
+        self.errors = errors
+
+    def __repr__(self):
+        return 'RowError({}, {!r})'.format(self.row, self.errors.as_dict())
+
+
+class _Column(object):
+    __slots__ = ('index', 'path', 'descriptor', 'convert', 'nullable')
+
+    def __init__(self, index, path, descriptor, null_values):
+        self.index = index
+        self.path = path
+        self.descriptor = descriptor
+        self.convert = converter(descriptor)
+        # strings keep empty cells, anything else reads them as None
+        self.nullable = None if isinstance(descriptor, String) else frozenset(null_values)
+
+    def cells(self, values, errors):
+        """
+        Convert the cells of this column in a chunk of rows.  Cells which
+        cannot be converted are None and their error is put in errors, a
+        dict of row position to ErrorReport.
+        """
+        convert = self.convert
+        nullable = self.nullable
+        if convert is None:
+            return values
+        if not nullable or nullable.isdisjoint(values):
+            try:
+                return list(map(convert, values))
+            except (KeyError, TypeError, ValueError, OverflowError):
+                pass  # find the bad cells one at a time
+        converted = []
+        for position, cell in enumerate(values):
+            if nullable and cell in nullable:
+                converted.append(None)
+                continue
+            try:
+                converted.append(convert(cell))
+            except (KeyError, TypeError, ValueError, OverflowError):
+                converted.append(None)
+                report = errors.setdefault(position, ErrorReport())
+                report.nested(*self.path[:-1]).add(ValidationError(
+                    field=self.path[-1], value=cell, reason='type',
+                    expected=_expected(self.descriptor)
+                ))
+        return converted
+
+
+class CSVLoader(object):
+    """
+    Builds instances of model from CSV rows laid out as in header.
+
+    null_values: cells read as None, except in String columns.
+    """
+
+    def __init__(self, model, header, null_values=('',)):
+        self.model = model
+        self.header = list(header)
+        self.columns = []
+        for index, name in enumerate(self.header):
+            path = tuple(name.split('.'))
+            descriptor = self._descriptor(model, path)
+            if descriptor is not None:
+                self.columns.append(_Column(index, path, descriptor, null_values))
+
+    @staticmethod
+    def _descriptor(model, path):
+        for depth, name in enumerate(path):
+            if name not in model.field_names:
+                return None
+            descriptor = getattr(model, name)
+            if depth == len(path) - 1:
+                return descriptor
+            if not isinstance(descriptor, EmbeddedObject):
+                return None
+            model = descriptor.class_obj
+
+    def documents(self, rows):
+        """
+        Convert a chunk of rows to a list of dicts for the model, giving an
+        ErrorReport instead for rows with cells that could not be converted.
+        """
+        width = len(self.header)
+        errors = {}
+        for position, row in enumerate(rows):
+            if len(row) != width:
+                report = errors[position] = ErrorReport()
+                report.add(ValidationError(
+                    'row has {} cells, expected {}'.format(len(row), width)
+                ))
+        if errors:
+            # pad short rows so every column has a cell for each row
+            rows = [row if len(row) >= width else row + [''] * (width - len(row)) for row in rows]
+        cells = list(zip(*rows)) if rows else []
+        converted = [
+            column.cells(list(cells[column.index]), errors) for column in self.columns
+        ]
+        names = [column.path[0] for column in self.columns]
+        if converted:
+            documents = [dict(zip(names, values)) for values in zip(*converted)]
+        else:
+            documents = [{} for _ in rows]
+        nested = [
+            (position, column.path) for position, column in enumerate(self.columns)
+            if len(column.path) > 1
+        ]
+        if nested:
+            for doc, values in zip(documents, zip(*converted)):
+                for position, path in nested:
+                    doc.pop(path[0], None)
+                for position, path in nested:
+                    inner = doc
+                    for name in path[:-1]:
+                        inner = inner.setdefault(name, {})
+                    inner[path[-1]] = values[position]
+                _drop_empty(doc)
+        for position, report in errors.items():
+            documents[position] = report
+        return documents
+
+    def build(self, doc, collect=True):
+        """
+        Return an instance of the model from doc, or an ErrorReport of every
+        field which failed, or only the first if collect is False.
+        """
+        try:
+            return self.model(**doc)
+        except ValidationError as ex:
+            errors = ErrorReport()
+            if collect:
+                self.model.load(doc, errors)
+            if not errors:
+                errors.add(ex)
+            return errors
+
+    def load(self, rows, start=1, on_error='raise', chunk_size=1000):
+        """
+        Yield an instance, or a RowError if on_error is 'yield', for each of
+        rows.  Rows are numbered from start; with on_error 'raise' the first
+        error is raised with the row number on its path.
+        """
+        if on_error not in ('raise', 'yield'):
+            raise ValueError("on_error must be 'raise' or 'yield'")
+        collect = on_error == 'yield'
+        rows = iter(rows)
+        number = start
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                return
+            for row, doc in zip(chunk, self.documents(chunk)):
+                item = doc if isinstance(doc, ErrorReport) else self.build(doc, collect)
+                if isinstance(item, ErrorReport):
+                    if not collect:
+                        raise next(iter(item)).push(('index', number))
+                    item = RowError(number, row, item)
+                yield item
+                number += 1
+
+
+def _drop_empty(doc):
+    """Set nested dicts whose values are all None to None."""
+    for key, value in doc.items():
+        if isinstance(value, dict):
+            _drop_empty(value)
+            if all(item is None for item in value.values()):
+                doc[key] = None
+
+
+def load_csv(model, fp, on_error='raise', chunk_size=1000, null_values=('',), **fmtparams):
+    """
+    Yield instances of model from the CSV file fp, whose first row is the
+    header.  fmtparams are passed to `csv.reader`; see `CSVLoader.load` for
+    the others.  Rows are numbered from 1 after the header.
+    """
+    reader = csv.reader(fp, **fmtparams)
+    try:
+        header = next(reader)
+    except StopIteration:
+        return
+    loader = CSVLoader(model, header, null_values)
+    for item in loader.load(reader, on_error=on_error, chunk_size=chunk_size):
+        yield item
+
+
+__all__ = ['CSVLoader', 'RowError', 'load_csv']
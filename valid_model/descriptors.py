@@ -1,30 +1,140 @@
 from datetime import datetime, timedelta
+import copy
 
-import six
-
-from .base import Generic, Object
+from ._compat import MutableSequence, binary_type, integer_types, string_types, text_type
+from .base import INVALID, Generic, Object
 from .exc import ValidationError
-from .utils import is_descriptor
+from .utils import (
+    EPOCH, format_iso_duration, is_descriptor, parse_iso_datetime, parse_iso_duration
+)
+
+
+def _formats(option, value, allowed):
+    """Normalize a parse option, a format name or names, to a tuple."""
+    if not value:
+        return ()
+    if isinstance(value, string_types):
+        value = (value,)
+    value = tuple(value)
+    for name in value:
+        if name not in allowed:
+            raise ValueError('unknown {} format {!r}'.format(option, name))
+    return value
+
+
+def _is_number(value):
+    return isinstance(value, (integer_types, float)) and not isinstance(value, bool)
+
+
+def _datetime_epoch(value):
+    utc = value if value.utcoffset() is None else value.replace(tzinfo=None) - value.utcoffset()
+    return utc - EPOCH
+
+
+def _datetime_to_iso8601(value):
+    return value.isoformat()
+
+
+def _datetime_to_epoch(value):
+    return _datetime_epoch(value).total_seconds()
+
+
+def _datetime_to_epoch_ms(value):
+    delta = _datetime_epoch(value)
+    return (delta.days * 86400 + delta.seconds) * 1000 + delta.microseconds // 1000
+
+
+try:
+    from sys import intern as _intern_str
+except ImportError:  # pragma: no cover
+    _intern_str = None
+
+_fold = getattr(text_type, 'casefold', text_type.lower)
+
+
+def _intern(value):
+    if _intern_str is not None and type(value) is str:
+        return _intern_str(value)
+    return value
+
+
+def _timedelta_to_seconds(value):
+    return value.total_seconds()
+
+
+def _timedelta_to_days_seconds(value):
+    if value.microseconds:
+        return [value.days, value.seconds, value.microseconds]
+    return [value.days, value.seconds]
 
 
 class SimpleType(Generic):
     """This descriptor will not attempt to coerce the value on __set__."""
+    _scalar = True
 
     _type_klass = None
     _type_label = None
 
     def __set__(self, instance, value):
+        if type(value) is self._fast_type:
+            instance._fields[self.name] = value
+            return value
         if value is not None and not isinstance(value, self._type_klass):
             raise ValidationError(
-                "{!r} is not {}".format(value, self._type_label),
-                self.name
+                field=self.name, value=value, reason='type', expected=self._type_label
             )
         return Generic.__set__(self, instance, value)
 
 
+class LazyObject(object):
+    """A dict held by a lazy EmbeddedObject until the field is used."""
+    __slots__ = ('class_obj', 'raw', 'trusted', 'obj')
+
+    def __init__(self, class_obj, raw, trusted=False):
+        self.class_obj = class_obj
+        self.raw = raw
+        self.trusted = trusted
+        self.obj = None
+
+    def materialize(self):
+        """Build, and unless trusted validate, the Object; done only once."""
+        obj = self.obj
+        if obj is None:
+            if self.trusted:
+                obj = self.class_obj.construct(self.raw)
+            else:
+                obj = self.class_obj(**self.raw)
+            self.obj = obj
+        return obj
+
+    def validate(self):
+        self.materialize().validate()
+
+    def __json__(self):
+        return self.materialize().__json__()
+
+    def __reduce__(self):
+        return LazyObject, (self.class_obj, self.raw, self.trusted)
+
+    def __repr__(self):
+        return 'LazyObject({}, {} keys)'.format(self.class_obj.__name__, len(self.raw))
+
+
 class EmbeddedObject(Generic):
-    def __init__(self, class_obj):
+    """
+    This descriptor holds an instance of class_obj, built from a dict if
+    given one.
+
+    lazy: keep dicts as they are and only build and validate the Object the
+          first time the field is read, set again by validate() or converted
+          by __json__, and likewise for the default instance.  Errors raised
+          then have the same field path.  Loading
+          with an ErrorReport still builds the Object right away, as do List,
+          Set and Dict elements.
+    """
+    def __init__(self, class_obj, lazy=False):
         self.class_obj = class_obj
+        self.lazy = lazy
 
         def validator(obj):
             return isinstance(obj, class_obj)
@@ -32,17 +142,94 @@ class EmbeddedObject(Generic):
         Generic.__init__(
             self, default=class_obj, validator=validator
         )
+        # validator only checks the type
+        self._fast_type = class_obj
 
-    def __set__(self, instance, value):
+    def get_default(self):
+        if self.lazy and self.default is self.class_obj:
+            return LazyObject(self.class_obj, {})
+        return Generic.get_default(self)
+
+    def materialize(self, value):
         try:
-            if isinstance(value, dict):
+            return value.materialize()
+        except ValidationError as ex:
+            raise ex.push(self.name)
+
+    def __get__(self, instance, klass=None):
+        if instance is None:
+            return self
+        value = instance._fields[self.name]
+        if value.__class__ is LazyObject:
+            value = instance._fields[self.name] = self.materialize(value)
+        return value
+
+    def __set__(self, instance, value):
+        if type(value) is self._fast_type:
+            instance._fields[self.name] = value
+            return value
+        if value.__class__ is LazyObject:
+            value = self.materialize(value)
+        elif isinstance(value, dict):
+            if self.lazy:
+                value = instance._fields[self.name] = LazyObject(self.class_obj, value)
+                return value
+            try:
                 value = self.class_obj(**value)
+            except ValidationError as ex:
+                raise ex.push(self.name)
+        try:
             return Generic.__set__(self, instance, value)
         except ValidationError as ex:
-            raise ValidationError(
-                ex.msg,
-                '{}.{}'.format(self.name, ex.field) if ex.field else self.name
-            )
+            raise ex.push(self.name)
+
+    def collect(self, instance, value, errors):
+        if value.__class__ is LazyObject:
+            value = value.obj if value.obj is not None else value.raw
+        if isinstance(value, dict):
+            found = len(errors)
+            value = self.class_obj.load(value, errors.nested(self.name))
+            if len(errors) != found:
+                return INVALID
+        return Generic.collect(self, instance, value, errors)
+
+    def construct(self, value):
+        if isinstance(value, dict):
+            if self.lazy:
+                return LazyObject(self.class_obj, value, trusted=True)
+            return self.class_obj.construct(value)
+        return value
+
+
+_BUFFER_TYPES = (binary_type, bytearray, memoryview)
+
+
+def _size(value):
+    """Length in bytes of a bytes, bytearray or memoryview value."""
+    if isinstance(value, memoryview):
+        return value.nbytes
+    return len(value)
+
+
+class LazyText(object):
+    """UTF-8 bytes held by a lazy String until the field is read."""
+    __slots__ = ('raw',)
+
+    def __init__(self, raw):
+        self.raw = raw
+
+    def __len__(self):
+        return _size(self.raw)
+
+    def __json__(self):
+        return text_type(self.raw, 'utf-8')
+
+    def __reduce__(self):
+        # memoryviews cannot be pickled
+        return LazyText, (bytes(self.raw),)
+
+    def __repr__(self):
+        return 'LazyText({} bytes)'.format(len(self))
 
 
 class String(Generic):
@@ -50,18 +237,146 @@ class String(Generic):
     This descriptor attempts to set a unicode string value.
 
     If the value is type(str) it will be decoded using utf-8.
+
+    max_length: the most characters allowed
+    lazy: keep bytes, bytearray and memoryview values undecoded, without
+          copying them, until the field is first read.  Invalid UTF-8 is
+          only reported then or by validate().  Values are still decoded
+          right away for a mutator or validator since they need the text.
+          Only taken by keyword.  `String(lazy=True)` gives a LazyString,
+          so reads of other Strings do not check for undecoded values;
+          subclasses of String subclass LazyString to be lazy.
     """
+    _exact_type = text_type
+    _scalar = True
+
+    def __new__(cls, *args, **kwargs):
+        if cls is String and kwargs.get('lazy'):
+            cls = LazyString
+        return Generic.__new__(cls)
+
+    def __init__(self, default=None, validator=None, mutator=None, nullable=True,
+                 max_length=None, lazy=False):
+        Generic.__init__(
+            self, default=default, validator=validator, mutator=mutator, nullable=nullable
+        )
+        if lazy and not isinstance(self, LazyString):
+            if self.__class__ is String:
+                raise TypeError('lazy must be given by keyword')
+            raise TypeError('{} must subclass LazyString to be lazy'.format(
+                self.__class__.__name__
+            ))
+        self.max_length = max_length
+        self.lazy = bool(lazy)
+        self._defer = self.lazy and validator is None and mutator is None
+        if max_length is not None:
+            self._fast_type = None
+
+    def decode(self, raw):
+        try:
+            return text_type(raw, 'utf-8')
+        except UnicodeDecodeError as ex:
+            raise ValidationError(field=self.name, value=raw, reason='encoding', error=ex)
+
+    def raw_value(self, instance):
+        """Return the field as UTF-8 bytes, without decoding lazy values."""
+        value = instance._fields[self.name]
+        if value.__class__ is LazyText:
+            return value.raw
+        if value is None:
+            return None
+        return value.encode('utf-8')
+
+    def _too_long(self, value):
+        return ValidationError(
+            field=self.name, value=value, reason='length', max_length=self.max_length
+        )
 
     def __set__(self, instance, value):
-        if value is None or isinstance(value, six.text_type):
+        if type(value) is self._fast_type:
+            instance._fields[self.name] = value
+            return value
+        max_length = self.max_length
+        if value is None or isinstance(value, text_type):
             pass
-        elif isinstance(value, six.binary_type):
-            value = value.decode('utf-8')
+        elif isinstance(value, LazyText):
+            value = self.decode(value.raw)
+        elif self._defer and isinstance(value, _BUFFER_TYPES):
+            size = _size(value)
+            # UTF-8 takes one to four bytes per character
+            if max_length is None or size <= max_length:
+                value = LazyText(value)
+                instance._fields[self.name] = value
+                return value
+            if size > 4 * max_length:
+                raise self._too_long(value)
+            value = self.decode(value)
+        elif isinstance(value, binary_type):
+            value = self.decode(value)
         else:
             raise ValidationError(
-                "{!r} is not a string".format(value),
-                self.name
+                field=self.name, value=value, reason='type', expected='a string'
             )
+        if max_length is not None and value is not None and len(value) > max_length:
+            raise self._too_long(value)
+        return Generic.__set__(self, instance, value)
+
+
+class LazyString(String):
+    """A String made with lazy=True, decoding LazyText values when read."""
+
+    def __init__(self, default=None, validator=None, mutator=None, nullable=True,
+                 max_length=None, lazy=True):
+        String.__init__(
+            self, default=default, validator=validator, mutator=mutator, nullable=nullable,
+            max_length=max_length, lazy=lazy
+        )
+
+    def __get__(self, instance, klass=None):
+        if instance is None:
+            return self
+        value = instance._fields[self.name]
+        if value.__class__ is LazyText:
+            value = instance._fields[self.name] = self.decode(value.raw)
+        return value
+
+
+class Bytes(Generic):
+    """
+    This descriptor sets a binary value without copying it.
+
+    bytes, bytearray and memoryview values are stored as they are so the
+    latter two still share their buffer with the caller; note memoryviews
+    cannot be pickled.
+
+    max_length: the most bytes allowed
+    """
+    _exact_type = binary_type
+    _scalar = True
+
+    def __init__(self, default=None, validator=None, mutator=None, nullable=True,
+                 max_length=None):
+        Generic.__init__(
+            self, default=default, validator=validator, mutator=mutator, nullable=nullable
+        )
+        self.max_length = max_length
+        if max_length is not None:
+            self._fast_type = None
+
+    def __set__(self, instance, value):
+        if type(value) is self._fast_type:
+            instance._fields[self.name] = value
+            return value
+        if value is not None:
+            if not isinstance(value, _BUFFER_TYPES):
+                raise ValidationError(
+                    field=self.name, value=value, reason='type', expected='bytes'
+                )
+            max_length = self.max_length
+            if max_length is not None and _size(value) > max_length:
+                raise ValidationError(
+                    field=self.name, value=value, reason='length', max_length=max_length
+                )
         return Generic.__set__(self, instance, value)
 
 
@@ -70,19 +385,22 @@ class _Number(Generic):
 
     _number_type = None
     _number_label = None
+    _scalar = True
 
     def __set__(self, instance, value):
+        if type(value) is self._fast_type:
+            instance._fields[self.name] = value
+            return value
         if value is not None:
-            number_like = isinstance(value, (six.integer_types, float))
+            number_like = isinstance(value, (integer_types, float))
             is_bool = isinstance(value, bool)
 
             if not number_like or is_bool:
                 raise ValidationError(
-                    "{!r} is not {}".format(value, self._number_label),
-                    self.name
+                    field=self.name, value=value, reason='type', expected=self._number_label
                 )
             else:
-                value = int(value)
+                value = self._number_type(value)
         return Generic.__set__(self, instance, value)
 
 
@@ -91,6 +409,7 @@ class Integer(_Number):
 
     _number_type = int
     _number_label = "an int"
+    _exact_type = int
 
 
 class Float(_Number):
@@ -98,40 +417,277 @@ class Float(_Number):
 
     _number_type = float
     _number_label = "a float"
+    _exact_type = float
 
 
 class Bool(Generic):
     """This descriptor attempts to converts any a value to a boolean."""
+    _exact_type = bool
+    _scalar = True
 
     def __set__(self, instance, value):
+        if type(value) is self._fast_type:
+            instance._fields[self.name] = value
+            return value
         if value is not None:
             if value in (0, 1) or isinstance(value, bool):
                 value = bool(value)
             else:
                 raise ValidationError(
-                    "{!r} is not a bool".format(value),
-                    self.name
+                    field=self.name, value=value, reason='type', expected='a bool'
                 )
         return Generic.__set__(self, instance, value)
 
 
+class Choice(Generic):
+    """
+    This descriptor only accepts one of a fixed set of values.
+
+    choices: the canonical values
+    aliases: dict mapping other accepted values to their canonical value
+    case_insensitive: also accept strings differing only in case
+    store_code: store the position of the value in choices instead of the
+                value; the attribute and `__json__` still give the value.
+                Only for fields, not the elements or keys of collections
+
+    Lookup tables are built once so each assignment is a dict lookup, and
+    every record stores the same (interned) object for a choice.  Any
+    mutator and validator run on the canonical value.
+    """
+    _scalar = True
+
+    def __init__(self, choices, aliases=None, case_insensitive=False, store_code=False,
+                 default=None, validator=None, mutator=None, nullable=True):
+        Generic.__init__(
+            self, default=default, validator=validator, mutator=mutator, nullable=nullable
+        )
+        self.choices = tuple(_intern(choice) for choice in choices)
+        self.aliases = dict(aliases or {})
+        self.case_insensitive = case_insensitive
+        self.store_code = store_code
+        if store_code and any(isinstance(choice, integer_types) for choice in self.choices):
+            raise ValueError('store_code cannot be used with integer choices')
+
+        canonical = dict((choice, choice) for choice in self.choices)
+        if len(canonical) != len(self.choices):
+            raise ValueError('choices must be unique')
+        lookup = dict(canonical)
+        for alias, choice in self.aliases.items():
+            if choice not in canonical:
+                raise ValueError('alias {!r} is not for one of the choices'.format(alias))
+            lookup[alias] = canonical[choice]
+        if case_insensitive:
+            for key, choice in list(lookup.items()):
+                if isinstance(key, text_type):
+                    if lookup.setdefault(_fold(key), choice) is not choice:
+                        raise ValueError('{!r} is ambiguous without case'.format(key))
+        self._lookup = lookup
+        if store_code:
+            self._codes = dict((choice, code) for code, choice in enumerate(self.choices))
+            self.json_encoder = self.choices.__getitem__
+            self._encoded = True
+        else:
+            self._codes = None
+        self._plain = validator is None and mutator is None
+
+    def normalize(self, value):
+        """Return the canonical choice for value or raise a ValidationError."""
+        lookup = self._lookup
+        try:
+            return lookup[value]
+        except KeyError:
+            if self.case_insensitive and isinstance(value, text_type):
+                choice = lookup.get(_fold(value))
+                if choice is not None:
+                    return choice
+        except TypeError:
+            # unhashable
+            pass
+        raise ValidationError(
+            field=self.name, value=value, reason='choice', choices=list(self.choices)
+        )
+
+    def _stored(self, choice):
+        if self._codes is None:
+            return choice
+        return self._codes[choice]
+
+    def get_default(self):
+        default = Generic.get_default(self)
+        if default is None:
+            return default
+        return self._stored(self.normalize(default))
+
+    def as_input(self, value):
+        if self._codes is None or value is None:
+            return value
+        return self.choices[value]
+
+    def construct(self, value):
+        if self._codes is None:
+            return self._lookup.get(value, value)
+        return self._codes.get(value, value)
+
+    def __get__(self, instance, klass=None):
+        if instance is None:
+            return self
+        value = instance._fields[self.name]
+        if self._codes is None or value is None:
+            return value
+        return self.choices[value]
+
+    def __set__(self, instance, value):
+        if value is not None:
+            value = self.normalize(value)
+            if self._plain:
+                value = instance._fields[self.name] = self._stored(value)
+                return value
+        value = Generic.__set__(self, instance, value)
+        if value is not None:
+            # a mutator must still produce one of the choices
+            value = instance._fields[self.name] = self._stored(self.normalize(value))
+        return value
+
+
 class DateTime(SimpleType):
-    """This descriptor attempts to set a datetime value."""
+    """
+    This descriptor attempts to set a datetime value.
+
+    parse: other formats to accept, any of 'iso8601' strings and 'epoch' or
+           'epoch_ms' numbers; times with a UTC offset and epoch timestamps
+           become naive UTC datetimes
+    json_format: how `Object.__json__` renders the value; None leaves the
+                 datetime, otherwise one of 'iso8601', 'epoch' or 'epoch_ms'
+    """
 
     _type_klass = datetime
     _type_label = "a datetime"
+    _exact_type = datetime
+    JSON_FORMATS = {
+        'iso8601': _datetime_to_iso8601,
+        'epoch': _datetime_to_epoch,
+        'epoch_ms': _datetime_to_epoch_ms,
+    }
+
+    def __init__(self, default=None, validator=None, mutator=None, nullable=True,
+                 parse=None, json_format=None):
+        SimpleType.__init__(
+            self, default=default, validator=validator, mutator=mutator, nullable=nullable
+        )
+        self.parse = _formats('parse', parse, self.JSON_FORMATS)
+        if 'epoch' in self.parse and 'epoch_ms' in self.parse:
+            raise ValueError('parse may not accept both epoch and epoch_ms')
+        if json_format is not None and json_format not in self.JSON_FORMATS:
+            raise ValueError('unknown json_format {!r}'.format(json_format))
+        self.json_format = json_format
+        self.json_encoder = self.JSON_FORMATS.get(json_format)
+
+    def parse_value(self, value):
+        """Convert value in one of the `parse` formats, returning others as they are."""
+        parse = self.parse
+        try:
+            if isinstance(value, string_types):
+                if 'iso8601' in parse:
+                    return parse_iso_datetime(value)
+            elif _is_number(value):
+                if 'epoch' in parse:
+                    return EPOCH + timedelta(seconds=value)
+                if 'epoch_ms' in parse:
+                    return EPOCH + timedelta(milliseconds=value)
+        except (OverflowError, ValueError):
+            pass
+        return value
+
+    def construct(self, value):
+        # trusted documents may still hold values in a parse format, e.g. JSON
+        if self.parse and value is not None and type(value) is not self._fast_type:
+            return self.parse_value(value)
+        return value
+
+    def __set__(self, instance, value):
+        if type(value) is self._fast_type:
+            instance._fields[self.name] = value
+            return value
+        if self.parse and value is not None:
+            value = self.parse_value(value)
+        return SimpleType.__set__(self, instance, value)
 
 
 class TimeDelta(SimpleType):
-    """This descriptor attempts to set a timedalta value."""
+    """
+    This descriptor attempts to set a timedalta value.
+
+    parse: other formats to accept, any of 'iso8601' duration strings,
+           'seconds' numbers and 'days_seconds' pairs of [days, seconds] with
+           optional microseconds
+    json_format: how `Object.__json__` renders the value; None leaves the
+                 timedelta, otherwise one of the parse formats
+    """
 
     _type_klass = timedelta
     _type_label = "a timedelta"
+    _exact_type = timedelta
+    JSON_FORMATS = {
+        'iso8601': format_iso_duration,
+        'seconds': _timedelta_to_seconds,
+        'days_seconds': _timedelta_to_days_seconds,
+    }
+
+    def __init__(self, default=None, validator=None, mutator=None, nullable=True,
+                 parse=None, json_format=None):
+        SimpleType.__init__(
+            self, default=default, validator=validator, mutator=mutator, nullable=nullable
+        )
+        self.parse = _formats('parse', parse, self.JSON_FORMATS)
+        if json_format is not None and json_format not in self.JSON_FORMATS:
+            raise ValueError('unknown json_format {!r}'.format(json_format))
+        self.json_format = json_format
+        self.json_encoder = self.JSON_FORMATS.get(json_format)
+
+    def parse_value(self, value):
+        """Convert value in one of the `parse` formats, returning others as they are."""
+        parse = self.parse
+        try:
+            if isinstance(value, string_types):
+                if 'iso8601' in parse:
+                    return parse_iso_duration(value)
+            elif _is_number(value):
+                if 'seconds' in parse:
+                    return timedelta(seconds=value)
+            elif isinstance(value, (list, tuple)):
+                if 'days_seconds' in parse and len(value) in (2, 3) and \
+                        all(_is_number(part) for part in value):
+                    return timedelta(*value)
+        except (OverflowError, ValueError):
+            pass
+        return value
+
+    def construct(self, value):
+        # trusted documents may still hold values in a parse format, e.g. JSON
+        if self.parse and value is not None and type(value) is not self._fast_type:
+            return self.parse_value(value)
+        return value
+
+    def __set__(self, instance, value):
+        if type(value) is self._fast_type:
+            instance._fields[self.name] = value
+            return value
+        if self.parse and value is not None:
+            value = self.parse_value(value)
+        return SimpleType.__set__(self, instance, value)
 
 
 NO_DEFAULT = object()
 
 
+def _check_element(descriptor):
+    # collections hand out their elements as stored, so they must be values
+    if descriptor is not None and descriptor._encoded:
+        raise ValueError('{} storing codes cannot be used in a collection'.format(
+            descriptor.__class__.__name__
+        ))
+
+
 class _Collection(Generic):
     _collection_type = object
     _collection_label = None
@@ -144,7 +700,17 @@ class _Collection(Generic):
         )
         if value is not None and not isinstance(value, Generic):
             raise TypeError('value must be None or an instance of Generic')
+        if getattr(value, 'lazy', False) and isinstance(value, EmbeddedObject):
+            # nothing would materialize elements on access
+            value = copy.copy(value)
+            value.lazy = False
+        _check_element(value)
         self.value = value
+        encoder = value.json_encoder if value is not None else None
+        if encoder is not None:
+            def json_encoder(collection):
+                return [element if element is None else encoder(element) for element in collection]
+            self.json_encoder = json_encoder
 
     @staticmethod
     def iterate(collection):
@@ -152,42 +718,203 @@ class _Collection(Generic):
 
     def recursive_validation(self, element):
         """Validate element of collection against `self.value`."""
-        dummy = Object()
         if self.value is not None:
-            try:
-                element = self.value.__set__(dummy, element)
-            except ValidationError as ex:
-                raise ValidationError(
-                    ex.msg,
-                    '{}.{}'.format(self.name, ex.field) if ex.field else self.name
-                )
+            element = self.value.__set__(Object(), element)
         return element
 
+    @staticmethod
+    def element_segment(position, element):
+        """Field path segment for an element which failed validation."""
+        return None
+
     def add_to_collection(self, collection, element):
         raise NotImplementedError("_add_to_collection")
 
+    def construct(self, value):
+        if self.value is None:
+            return self._collection_type(value)
+        construct = self.value.construct
+        return self._collection_type(
+            element if element is None else construct(element) for element in value
+        )
+
+    def collect_element(self, element, errors):
+        """Validate element, adding any errors to errors; returns INVALID on failure."""
+        if self.value is None:
+            return element
+        return self.value.collect(Object(), element, errors)
+
+    def collect(self, instance, value, errors):
+        if value is None or not isinstance(value, self._collection_type):
+            return Generic.collect(self, instance, value, errors)
+        found = len(errors)
+        new_value = self._collection_type()
+        for position, element in enumerate(self.iterate(value)):
+            if errors.exhausted:
+                break
+            nested = errors.nested(self.name, self.element_segment(position, element))
+            element = self.collect_element(element, nested)
+            if element is not INVALID:
+                self.add_to_collection(new_value, element)
+        if len(errors) != found:
+            return INVALID
+        try:
+            return Generic.__set__(self, instance, new_value)
+        except ValidationError as ex:
+            errors.add(ex)
+            return INVALID
+
     def __set__(self, instance, value):
         if value is None:
             value = self._collection_type()
         elif not isinstance(value, self._collection_type):
             raise ValidationError(
-                "{!r} is not {}".format(value, self._collection_label),
-                self.name
+                field=self.name, value=value, reason='type', expected=self._collection_label
             )
 
         new_value = self._collection_type()
         iterable = self.iterate(value)
-        for element in iterable:
-            element = self.recursive_validation(element)
+        for position, element in enumerate(iterable):
+            try:
+                element = self.recursive_validation(element)
+            except ValidationError as ex:
+                ex.push(self.element_segment(position, element))
+                raise ex.push(self.name)
             self.add_to_collection(new_value, element)
         value = new_value
         return Generic.__set__(self, instance, value)
 
 
+class LazyList(MutableSequence):
+    """
+    The list held by a lazy List field.
+
+    Elements are validated by the field's value descriptor, and replaced by
+    what it returns, the first time they are read.  Elements added later are
+    validated the same way.  `validate` checks all of them at once.
+    """
+    __slots__ = ('descriptor', 'items', 'checked')
+
+    def __init__(self, descriptor, items):
+        self.descriptor = descriptor
+        self.items = list(items)
+        # 1 for each element already validated
+        self.checked = bytearray(len(self.items))
+
+    def _element(self, index):
+        if self.checked[index]:
+            return self.items[index]
+        try:
+            element = self.descriptor.recursive_validation(self.items[index])
+        except ValidationError as ex:
+            ex.push(('index', index))
+            raise ex.push(self.descriptor.name)
+        self.items[index] = element
+        self.checked[index] = 1
+        return element
+
+    def validate(self):
+        """Validate every element not read yet."""
+        checked = self.checked
+        index = checked.find(b'\x00')
+        while index != -1:
+            self._element(index)
+            index = checked.find(b'\x00', index + 1)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._element(i) for i in range(*index.indices(len(self.items)))]
+        if index < 0:
+            index += len(self.items)
+        if not 0 <= index < len(self.items):
+            raise IndexError('list index out of range')
+        return self._element(index)
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = list(value)
+            self.items[index] = value
+            self.checked[index] = bytearray(len(value))
+        else:
+            self.items[index] = value
+            self.checked[index] = 0
+
+    def __delitem__(self, index):
+        del self.items[index]
+        del self.checked[index]
+
+    def insert(self, index, value):
+        self.items.insert(index, value)
+        self.checked.insert(index, 0)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        index = 0
+        while index < len(self.items):
+            yield self._element(index)
+            index += 1
+
+    def __eq__(self, other):
+        if isinstance(other, (list, LazyList)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None
+
+    def __json__(self):
+        return [v.__json__() if hasattr(v, '__json__') else v for v in self]
+
+    def __reduce__(self):
+        # pickled, e.g. by transport, as the validated list
+        return list, (list(self),)
+
+    def __repr__(self):
+        return 'LazyList({} elements, {} validated)'.format(
+            len(self.items), self.checked.count(b'\x01')
+        )
+
+
 class List(_Collection):
+    """
+    lazy: keep an assigned list as a LazyList and only validate elements when
+          they are read.  Assigning a list then takes the same time whatever
+          its length, and `Object.validate` still checks every element.
+    """
     _collection_type = list
     _collection_label = "a list"
 
+    def __init__(self, default=NO_DEFAULT, value=None, validator=None, mutator=None,
+                 lazy=False):
+        _Collection.__init__(
+            self, default=default, value=value, validator=validator, mutator=mutator
+        )
+        self.lazy = lazy
+
+    def __set__(self, instance, value):
+        if value.__class__ is LazyList:
+            if value.descriptor is self:
+                value.validate()
+                return Generic.__set__(self, instance, value)
+            value = list(value)
+        if self.lazy and self.value is not None and isinstance(value, list):
+            return Generic.__set__(self, instance, LazyList(self, value))
+        return _Collection.__set__(self, instance, value)
+
+    def collect(self, instance, value, errors):
+        if value.__class__ is LazyList:
+            value = list(value.items)
+        return _Collection.collect(self, instance, value, errors)
+
+    @staticmethod
+    def element_segment(position, element):
+        return ('index', position)
+
     def add_to_collection(self, collection, element):
         collection.append(element)
         return collection
@@ -212,11 +939,28 @@ class Dict(_Collection):
         )
         if key is not None and not isinstance(key, Generic):
             raise TypeError('key must be None or an instance of Generic')
+        _check_element(key)
         self.key = key
+        key_encoder = key.json_encoder if key is not None else None
+        value_encoder = value.json_encoder if value is not None else None
+        if key_encoder is None and value_encoder is None:
+            self.json_encoder = None
+        else:
+            def encode(encoder, element):
+                if encoder is None or element is None:
+                    return element
+                return encoder(element)
+
+            def json_encoder(collection):
+                return dict(
+                    (encode(key_encoder, k), encode(value_encoder, v))
+                    for k, v in collection.items()
+                )
+            self.json_encoder = json_encoder
 
     @staticmethod
     def iterate(collection):
-        return six.iteritems(collection)
+        return collection.items()
 
     def recursive_validation(self, element):
         """Validate element of collection against `self.value`."""
@@ -226,18 +970,23 @@ class Dict(_Collection):
             try:
                 key = self.key.__set__(dummy, key)
             except ValidationError as ex:
-                raise ValidationError(
-                    ex.msg,
-                    "{} key {}".format(self.name, key)
-                )
+                raise ex.push(('key', key))
         if self.value is not None:
             try:
                 value = self.value.__set__(dummy, value)
             except ValidationError as ex:
-                raise ValidationError(
-                    ex.msg,
-                    "{}['{}']".format(self.name, key)
-                )
+                raise ex.push(('item', key))
+        return key, value
+
+    def collect_element(self, element, errors):
+        dummy = Object()
+        key, value = element
+        if self.key is not None:
+            key = self.key.collect(dummy, key, errors.nested(('key', element[0])))
+        if self.value is not None:
+            value = self.value.collect(dummy, value, errors.nested(('item', element[0])))
+        if key is INVALID or value is INVALID:
+            return INVALID
         return key, value
 
     def add_to_collection(self, collection, element):
@@ -245,11 +994,20 @@ class Dict(_Collection):
         collection[key] = value
         return collection
 
+    def construct(self, value):
+        if self.value is None:
+            return dict(value)
+        construct = self.value.construct
+        return dict(
+            (key, element if element is None else construct(element))
+            for key, element in value.items()
+        )
+
 
 def descriptors():
     """Generate list of descriptor class names."""
     return [
-        name for name, value in six.iteritems(globals())
+        name for name, value in list(globals().items())
         if is_descriptor(value) and issubclass(value, Generic)
     ]
 
@@ -257,8 +1015,13 @@ def descriptors():
 def descriptor_classes():
     """Generate list of descriptor classes."""
     return [
-        value for value in six.itervalues(globals())
+        value for value in list(globals().values())
         if is_descriptor(value) and issubclass(value, Generic)
     ]
 
-__all__ = ['descriptor_classes'] + descriptors()
+# kept in sync with descriptors() by the test suite
+__all__ = [
+    'descriptor_classes', 'Generic', 'SimpleType', 'EmbeddedObject', 'String', 'LazyString',
+    'Bytes', '_Number', 'Integer', 'Float', 'Bool', 'Choice', 'DateTime', 'TimeDelta',
+    '_Collection', 'List', 'Set', 'Dict',
+]
@@ -0,0 +1,285 @@
+"""
+Create Object classes from a specification and precompile them.
+
+A specification maps field names to dicts describing each field:
+
+    {
+        'name': {'type': 'string', 'required': True},
+        'age': {'type': 'integer', 'default': 5},
+        'tags': {'type': 'list', 'value': {'type': 'string'}},
+    }
+
+Building the descriptors and class for a spec is done once per process; later
+calls with an equivalent spec return the cached class.  The classes can also be
+written out as Python source to a byte-compiled module so that later processes
+import the finished classes instead of building them again.
+"""
+from __future__ import unicode_literals
+
+import ast
+from datetime import datetime, timedelta
+import hashlib
+import io
+import json
+import os
+import py_compile
+import threading
+
+from ._compat import text_type
+from .base import Object, ObjectMeta, no_mutator, no_validator
+from .descriptors import (
+    Bool, Choice, DateTime, Dict, EmbeddedObject, Float, Integer, LazyString, List, Set,
+    String, TimeDelta, _Collection
+)
+
+
+def fingerprint(name, spec):
+    """Return a stable hash identifying the class built from name and spec."""
+    canonical = json.dumps([name, spec], sort_keys=True, default=repr)
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+
+
+class ObjectPrinter(object):
+    """Generate the source code declaring an Object class."""
+
+    header = (
+        '# generated by valid_model.dynamic; do not edit\n'
+        'import datetime\n'
+        '\n'
+        'from valid_model import Object\n'
+        'from valid_model.descriptors import *\n'
+    )
+
+    @staticmethod
+    def static_str(value):
+        if isinstance(value, type):
+            return value.__name__
+        return repr(value)
+
+    @classmethod
+    def descriptor_str(cls, descriptor):
+        if descriptor.validator is not no_validator:
+            raise TypeError('cannot generate source for a custom validator')
+        if descriptor.mutator is not no_mutator:
+            raise TypeError('cannot generate source for a custom mutator')
+
+        args = []
+        if isinstance(descriptor, EmbeddedObject):
+            args.append(descriptor.class_obj.__name__)
+        elif isinstance(descriptor, _Collection):
+            if descriptor.default is not descriptor._collection_type:
+                args.append('default={}'.format(cls.static_str(descriptor.default)))
+            for attr in ('key', 'value'):
+                nested = getattr(descriptor, attr, None)
+                if nested is not None:
+                    args.append('{}={}'.format(attr, cls.descriptor_str(nested)))
+            if getattr(descriptor, 'lazy', False):
+                args.append('lazy=True')
+        else:
+            if isinstance(descriptor, Choice):
+                args.append('[{}]'.format(', '.join(
+                    cls.static_str(choice) for choice in descriptor.choices
+                )))
+                if descriptor.aliases:
+                    args.append('aliases={!r}'.format(descriptor.aliases))
+                if descriptor.case_insensitive:
+                    args.append('case_insensitive=True')
+                if descriptor.store_code:
+                    args.append('store_code=True')
+            if callable(descriptor.default) and not isinstance(descriptor.default, type):
+                raise TypeError('cannot generate source for a callable default')
+            if descriptor.default is not None:
+                args.append('default={}'.format(cls.static_str(descriptor.default)))
+            if not descriptor.nullable:
+                args.append('nullable=False')
+            if getattr(descriptor, 'parse', None):
+                args.append('parse={!r}'.format(tuple(str(name) for name in descriptor.parse)))
+            if getattr(descriptor, 'json_format', None):
+                args.append('json_format={!r}'.format(str(descriptor.json_format)))
+            if getattr(descriptor, 'max_length', None) is not None:
+                args.append('max_length={!r}'.format(descriptor.max_length))
+            if getattr(descriptor, 'lazy', False):
+                args.append('lazy=True')
+        # String(lazy=True) makes a LazyString
+        klass = String if type(descriptor) is LazyString else descriptor.__class__
+        return '{}({})'.format(klass.__name__, ', '.join(args))
+
+    @classmethod
+    def class_source(cls, klass):
+        if not issubclass(klass, Object):
+            raise TypeError("expected subclass of `Object`")
+        lines = ['class {}(Object):'.format(klass.__name__)]
+        spec_fingerprint = getattr(klass, '__spec_fingerprint__', None)
+        if spec_fingerprint:
+            lines.append('    __spec_fingerprint__ = {!r}'.format(str(spec_fingerprint)))
+        for name in sorted(klass.field_names):
+            lines.append('    {} = {}'.format(name, cls.descriptor_str(getattr(klass, name))))
+        if len(lines) == 1:
+            lines.append('    pass')
+        return '\n'.join(lines) + '\n'
+
+    @classmethod
+    def module_source(cls, classes):
+        parts = [cls.header]
+        parts.extend(cls.class_source(klass) for klass in classes)
+        return '\n\n'.join(parts)
+
+
+# os.rename cannot replace an existing file on Windows
+_replace = getattr(os, 'replace', os.rename)
+
+
+def _load_source(module_name, path):
+    try:
+        from importlib.util import module_from_spec, spec_from_file_location
+    except ImportError:  # pragma: no cover
+        import imp
+        return imp.load_source(module_name, path)
+    module_spec = spec_from_file_location(module_name, path)
+    module = module_from_spec(module_spec)
+    module_spec.loader.exec_module(module)
+    return module
+
+
+class ObjectMaker(object):
+    """Build Object classes from specifications, caching them by fingerprint."""
+
+    KLASS_MAP = {
+        'string': String,
+        'integer': Integer,
+        'float': Float,
+        'boolean': Bool,
+        'datetime': DateTime,
+        'timedelta': TimeDelta,
+        'map': Dict,
+        'list': List,
+        'set': Set,
+    }
+    DEFAULT_MAP = {
+        'string': text_type,
+        'integer': int,
+        'float': float,
+        'boolean': lambda x: x if isinstance(x, bool) else ast.literal_eval(x.title()),
+        'datetime': lambda x: datetime.strptime(x, '%Y-%m-%dT%H:%M:%S'),
+        'timedelta': lambda x: timedelta(seconds=float(x)),
+        'map': dict,
+        'list': list,
+        'set': set,
+    }
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._classes = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def create_class(name, attrs):
+        return ObjectMeta(str(name), (Object,), dict(attrs))
+
+    def descriptor_from_spec(self, spec):
+        klass = self.KLASS_MAP[spec['type']]
+        kwargs = {}
+        if spec.get('default') is not None:
+            kwargs['default'] = self.DEFAULT_MAP[spec['type']](spec['default'])
+        if issubclass(klass, _Collection):
+            for attr in ('key', 'value'):
+                if spec.get(attr):
+                    kwargs[attr] = self.descriptor_from_spec(spec[attr])
+            if 'key' in kwargs and klass is not Dict:
+                raise ValueError('only map fields may have a key spec')
+        elif spec.get('required'):
+            kwargs['nullable'] = False
+        return klass(**kwargs)
+
+    def register(self, klass):
+        """Add a class built from a spec, e.g. from a precompiled module."""
+        with self._lock:
+            return self._classes.setdefault(klass.__spec_fingerprint__, klass)
+
+    def create_class_from_spec(self, name, spec):
+        key = fingerprint(name, spec)
+        klass = self._classes.get(key)
+        if klass is not None:
+            self.hits += 1
+            return klass
+        self.misses += 1
+        attrs = dict(
+            (field, self.descriptor_from_spec(field_spec))
+            for field, field_spec in spec.items()
+        )
+        attrs['__spec_fingerprint__'] = key
+        return self.register(self.create_class(name, attrs))
+
+    @staticmethod
+    def write_module(path, classes):
+        """
+        Write the source for classes to path and byte-compile it.
+
+        The source is written to a temporary file next to path which then
+        replaces it, so processes importing path at the same time see the
+        old module or the new one, never a partly written file.
+        """
+        source = ObjectPrinter.module_source(classes)
+        temp_path = '{}.{}.{}.tmp'.format(path, os.getpid(), threading.current_thread().ident)
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        try:
+            with io.open(fd, 'w', encoding='utf-8') as module_file:
+                module_file.write(source)
+            _replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        py_compile.compile(path, doraise=True)
+        return path
+
+    def load_module(self, path):
+        """Import a module written by write_module and register its classes."""
+        module_name = os.path.splitext(os.path.basename(path))[0]
+        module = _load_source(module_name, path)
+        for value in vars(module).values():
+            if isinstance(value, type) and issubclass(value, Object) and \
+                    getattr(value, '__spec_fingerprint__', None):
+                self.register(value)
+        return module
+
+    def precompiled(self, path, specs):
+        """
+        Return a dict of the classes for specs, a mapping of class name to spec.
+
+        Classes are imported from the module at path when it is up to date,
+        otherwise they are built and the module is written again.
+        """
+        if os.path.exists(path):
+            self.load_module(path)
+        misses = self.misses
+        classes = dict(
+            (name, self.create_class_from_spec(name, spec))
+            for name, spec in specs.items()
+        )
+        if self.misses != misses or not os.path.exists(path):
+            self.write_module(path, [classes[name] for name in sorted(classes)])
+        return classes
+
+    def clear(self):
+        with self._lock:
+            self._classes.clear()
+            self.hits = self.misses = 0
+
+
+default_maker = ObjectMaker()
+
+
+def create_class_from_spec(name, spec):
+    return default_maker.create_class_from_spec(name, spec)
+
+
+def precompiled(path, specs):
+    return default_maker.precompiled(path, specs)
+
+
+__all__ = [
+    'ObjectMaker', 'ObjectPrinter', 'create_class_from_spec', 'fingerprint',
+    'precompiled'
+]
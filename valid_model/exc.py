@@ -1,20 +1,168 @@
 from __future__ import unicode_literals
 
-import six
+from ._compat import python_2_unicode_compatible
 
+_MISSING = object()
 
-@six.python_2_unicode_compatible
+
+def render_path(path):
+    """
+    Render field path segments, outermost first, as a string.
+
+    Segments are field names or (kind, key) tuples for elements of a
+    collection where kind is 'index', 'item' (a dict value) or 'key' (a dict
+    key).
+    """
+    parts = []
+    for segment in path:
+        if isinstance(segment, tuple):
+            kind, key = segment
+            if kind == 'index':
+                parts.append('[{}]'.format(key))
+            elif kind == 'item':
+                parts.append("['{}']".format(key))
+            else:
+                parts.append(' key {}'.format(key))
+        elif parts:
+            parts.append('.{}'.format(segment))
+        else:
+            parts.append('{}'.format(segment))
+    return ''.join(parts) or None
+
+
+@python_2_unicode_compatible
 class ValidationError(TypeError, ValueError):
-    def __init__(self, msg, field=None):
-        super(ValidationError, self).__init__(msg)
-        self.field = field
-        self.msg = msg
+    """
+    Raised when a value fails validation.
+
+    Rather than a formatted message, descriptors pass the offending `value`, a
+    `reason` code and any parameters of the message template for that reason.
+    The message is only rendered when it is displayed, so rejecting large
+    values stays cheap.  Enclosing descriptors `push` their name onto `path`
+    as the error propagates instead of re-raising a new error.
+    """
+    MESSAGES = {
+        'null': '{value!r} is not nullable',
+        'type': '{value!r} is not {expected}',
+        'invalid': '{value!r} failed validation',
+        'mutator': '{error}',
+        'length': 'value is longer than {max_length}',
+        'encoding': 'value is not UTF-8: {error}',
+        'choice': '{value!r} is not one of {choices!r}',
+        'rule': 'rule {rule} failed for {fields}',
+    }
+
+    def __init__(self, msg=None, field=None, value=_MISSING, reason=None, **params):
+        if msg is None:
+            super(ValidationError, self).__init__()
+        else:
+            super(ValidationError, self).__init__(msg)
+        self._msg = msg
+        # innermost segment first so that push is an append
+        self._path = [field] if field else []
+        self.value = value
+        self.reason = reason
+        self.params = params
+
+    def push(self, segment):
+        """Prepend segment to the field path, ignoring unnamed descriptors."""
+        if segment is not None:
+            self._path.append(segment)
+        return self
+
+    @property
+    def path(self):
+        """Field path segments, outermost first."""
+        return self._path[::-1]
+
+    @property
+    def field(self):
+        return render_path(self.path)
+
+    @property
+    def msg(self):
+        if self._msg is None and self.reason is not None:
+            self._msg = self.MESSAGES[self.reason].format(value=self.value, **self.params)
+        return self._msg
 
     def __str__(self):
-        if self.field:
-            return '{}: {}'.format(self.field, self.msg)
+        field = self.field
+        if field:
+            return '{}: {}'.format(field, self.msg)
         else:
             return str(self.msg)
 
     def __repr__(self):
         return 'ValidationError({!r}, {!r})'.format(self.msg, self.field)
+
+
+class ErrorReport(object):
+    """
+    Collects every ValidationError found instead of stopping at the first.
+
+    Once `max_errors` errors have been added the report is `exhausted` and
+    validation stops early, so huge bad payloads cannot use unbounded time.
+    `nested` returns a view onto the same report which prefixes the field path
+    of everything added through it.
+    """
+
+    def __init__(self, max_errors=None):
+        self.max_errors = max_errors
+        self.errors = []
+        self._root = self
+        self._prefix = ()
+
+    def nested(self, *segments):
+        """Return a view of this report for a child at the given path."""
+        view = ErrorReport.__new__(ErrorReport)
+        view._root = self._root
+        view._prefix = self._prefix + tuple(
+            segment for segment in segments if segment is not None
+        )
+        return view
+
+    @property
+    def exhausted(self):
+        root = self._root
+        return root.max_errors is not None and len(root.errors) >= root.max_errors
+
+    def add(self, error):
+        for segment in reversed(self._prefix):
+            error.push(segment)
+        self._root.errors.append(error)
+        return error
+
+    def __len__(self):
+        return len(self._root.errors)
+
+    def __iter__(self):
+        return iter(self._root.errors)
+
+    def __bool__(self):
+        return bool(self._root.errors)
+    __nonzero__ = __bool__
+
+    def as_dict(self):
+        """Map each failing field path to its message."""
+        return dict((error.field, error.msg) for error in self)
+
+    def __json__(self):
+        return [
+            {
+                'field': error.field,
+                'path': error.path,
+                'reason': error.reason,
+                'message': error.msg,
+            }
+            for error in self
+        ]
+
+    def raise_first(self):
+        """Raise the first error collected, if any."""
+        if self._root.errors:
+            raise self._root.errors[0]
+
+    def __repr__(self):
+        return 'ErrorReport({} errors{})'.format(
+            len(self), ', exhausted' if self.exhausted else ''
+        )
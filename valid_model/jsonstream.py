@@ -0,0 +1,172 @@
+"""
+Write Objects as JSON to a file without building their `__json__` dicts.
+
+`json.dump(obj.__json__(), fp)` holds a dict tree of the whole document and
+then its encoding in memory at once.  The functions here walk `_fields`
+instead, apply the same field encoders and `__json__` methods, and write the
+JSON text to fp in pieces as it goes.  The output is what `json.dumps` gives
+for `__json__()` with the same separators.
+
+    with open('export.ndjson', 'w') as fp:
+        dump_ndjson(query_results, fp)
+
+fp needs a `write` method taking text, e.g. a file opened in text mode or
+`socket.makefile('w')`.
+"""
+from __future__ import unicode_literals
+
+from json.encoder import encode_basestring, encode_basestring_ascii
+
+from ._compat import MutableSequence, integer_types, string_types
+from .base import Object
+from .descriptors import LazyObject
+
+_plain_json = Object.__json__
+
+
+class _Writer(object):
+    """Encodes values into a buffer of text which is written out when full."""
+
+    def __init__(self, fp, ensure_ascii=True, separators=None, buffer_size=1024):
+        self.write = fp.write
+        self.parts = []
+        self.string = encode_basestring_ascii if ensure_ascii else encode_basestring
+        self.item_separator, self.key_separator = separators or (', ', ': ')
+        # number of pieces buffered before writing them
+        self.buffer_size = buffer_size
+
+    def flush(self):
+        if self.parts:
+            self.write(''.join(self.parts))
+            del self.parts[:]
+
+    def key(self, key):
+        if isinstance(key, string_types):
+            return self.string(key)
+        if key is True:
+            return '"true"'
+        if key is False:
+            return '"false"'
+        if key is None:
+            return '"null"'
+        if isinstance(key, integer_types):
+            return '"{}"'.format(int(key))
+        if isinstance(key, float):
+            return '"{}"'.format(self.float(key))
+        raise TypeError('keys must be str, int, float, bool or None, not {}'.format(
+            key.__class__.__name__
+        ))
+
+    @staticmethod
+    def float(value):
+        if value != value:
+            return 'NaN'
+        if value == float('inf'):
+            return 'Infinity'
+        if value == -float('inf'):
+            return '-Infinity'
+        return float.__repr__(value)
+
+    def value(self, value):
+        parts = self.parts
+        if value is None:
+            parts.append('null')
+        elif value is True:
+            parts.append('true')
+        elif value is False:
+            parts.append('false')
+        elif isinstance(value, string_types):
+            parts.append(self.string(value))
+        elif isinstance(value, integer_types):
+            parts.append('{}'.format(int(value)))
+        elif isinstance(value, float):
+            parts.append(self.float(value))
+        elif isinstance(value, Object):
+            self.object(value)
+        elif isinstance(value, (list, tuple, MutableSequence)):
+            self.array(value)
+        elif isinstance(value, dict):
+            self.mapping(value.items())
+        elif isinstance(value, LazyObject):
+            self.object(value.materialize())
+        elif hasattr(value, '__json__'):
+            self.value(value.__json__())
+        else:
+            raise TypeError('Object of type {} is not JSON serializable'.format(
+                value.__class__.__name__
+            ))
+        if len(parts) >= self.buffer_size:
+            self.flush()
+
+    def array(self, values):
+        parts = self.parts
+        parts.append('[')
+        separator = ''
+        for value in values:
+            parts.append(separator)
+            self.value(value)
+            separator = self.item_separator
+        parts.append(']')
+
+    def mapping(self, items):
+        parts = self.parts
+        parts.append('{')
+        separator = ''
+        for key, value in items:
+            parts.append(separator)
+            parts.append(self.key(key))
+            parts.append(self.key_separator)
+            self.value(value)
+            separator = self.item_separator
+        parts.append('}')
+
+    def object(self, obj):
+        if type(obj).__json__ is not _plain_json:
+            self.value(obj.__json__())
+            return
+        encoders = obj._json_encoders
+        items = obj._fields.items()
+        if any(value.__class__ is LazyObject for value in obj._fields.values()):
+            # built by the descriptor so errors get the field
+            items = [
+                (key, getattr(obj, key) if value.__class__ is LazyObject else value)
+                for key, value in items
+            ]
+        if not encoders:
+            self.mapping(items)
+            return
+        self.mapping(
+            (key, value if value is None or key not in encoders else encoders[key](value))
+            for key, value in items
+        )
+
+
+def dump(obj, fp, **options):
+    """
+    Write obj, an Object or any value `__json__` could return, to fp as JSON.
+
+    Options are `ensure_ascii` and `separators`, as for `json.dump`.
+    """
+    writer = _Writer(fp, **options)
+    writer.value(obj)
+    writer.flush()
+
+
+def dump_array(objects, fp, **options):
+    """Write each of objects, an iterable, to fp as one JSON array."""
+    writer = _Writer(fp, **options)
+    writer.array(objects)
+    writer.flush()
+
+
+def dump_ndjson(objects, fp, **options):
+    """Write each of objects, an iterable, to fp as JSON on a line of its own."""
+    writer = _Writer(fp, **options)
+    parts = writer.parts
+    for obj in objects:
+        writer.value(obj)
+        parts.append('\n')
+    writer.flush()
+
+
+__all__ = ['dump', 'dump_array', 'dump_ndjson']
@@ -0,0 +1,284 @@
+"""
+Select Objects with expressions built from their descriptors.
+
+As in examples/cassandra_example.py, comparing a descriptor with a value
+gives an expression rather than a bool.  Expressions combine with `&`, `|`
+and `~`:
+
+    adults = (Person.age >= 18) & Person.city.in_(['Lisbon', 'Porto'])
+    select(people, adults)
+    select(people, Person.name.eq('Ana') | ~Person.age.between(18, 65))
+
+`==` and `!=` still compare the descriptors themselves, so that they can be
+used as dict keys; use `eq` and `ne`.  Comparisons other than those two
+never match None.
+
+An expression is compiled once into a single Python function of an
+instance, which is also what calling the expression does.  `select` runs it
+over any iterable of Objects, and over an `ObjectCollection` first narrows
+the instances down with an index when one covers part of the expression.
+"""
+from .base import Generic
+from .collection import ObjectCollection, SortedIndex
+
+_RANGES = ('<', '<=', '>', '>=', 'between')
+
+
+class Expression(object):
+    """A condition on the fields of an Object."""
+
+    _predicate = None
+
+    def __and__(self, other):
+        return And(self, other)
+
+    def __or__(self, other):
+        return Or(self, other)
+
+    def __invert__(self):
+        return Not(self)
+
+    def __bool__(self):
+        raise TypeError('use &, | and ~ to combine expressions, not and, or and not')
+    __nonzero__ = __bool__
+
+    def compile(self):
+        """Return a function of an instance which is True if it matches."""
+        predicate = self._predicate
+        if predicate is None:
+            compiler = _Compiler()
+            source = 'def predicate(obj):\n    fields = obj._fields\n    return {}\n'.format(
+                self.source(compiler)
+            )
+            exec(source, compiler.namespace)
+            predicate = self._predicate = compiler.namespace['predicate']
+        return predicate
+
+    def __call__(self, obj):
+        return self.compile()(obj)
+
+    def source(self, compiler):
+        raise NotImplementedError
+
+
+class Comparison(Expression):
+    """A field compared with a value; made by comparing a descriptor."""
+
+    def __init__(self, descriptor, op, value):
+        if descriptor.name is None:
+            raise ValueError('the descriptor is not a field of a model')
+        self.descriptor = descriptor
+        self.field = descriptor.name
+        self.op = op
+        if op == 'in':
+            try:
+                value = frozenset(value)
+            except TypeError:
+                # unhashable values are looked for one at a time
+                value = tuple(value)
+        self.value = value
+
+    def source(self, compiler):
+        field = compiler.field(self.descriptor)
+        op = self.op
+        if op in ('==', '!=', 'in'):
+            return '{} {} {}'.format(field, op, compiler.value(self.value))
+        if op != 'between':
+            return '({0} is not None and {0} {1} {2})'.format(field, op, compiler.value(self.value))
+        low, high = self.value
+        test = field
+        if low is not None:
+            test = '{} <= {}'.format(compiler.value(low), test)
+        if high is not None:
+            test = '{} <= {}'.format(test, compiler.value(high))
+        return '({} is not None and {})'.format(field, test)
+
+    def bounds(self):
+        """Return (low, high, include_low, include_high) for range comparisons."""
+        op, value = self.op, self.value
+        if op == 'between':
+            return value[0], value[1], True, True
+        if op in ('<', '<='):
+            return None, value, True, op == '<='
+        return value, None, op == '>=', True
+
+    def __repr__(self):
+        value = self.value
+        if self.op == 'between':
+            return '{} between {!r} and {!r}'.format(self.field, value[0], value[1])
+        if self.op == 'in':
+            value = sorted(value, key=repr)
+        return '{} {} {!r}'.format(self.field, self.op, value)
+
+
+class And(Expression):
+    """Matches if all of terms match."""
+    symbol = '&'
+    keyword = 'and'
+
+    def __init__(self, *terms):
+        self.terms = []
+        for term in terms:
+            if not isinstance(term, Expression):
+                raise TypeError('expected an expression, got {!r}'.format(term))
+            if term.__class__ is self.__class__:
+                self.terms.extend(term.terms)
+            else:
+                self.terms.append(term)
+
+    def source(self, compiler):
+        return '({})'.format(
+            ' {} '.format(self.keyword).join(term.source(compiler) for term in self.terms)
+        )
+
+    def __repr__(self):
+        return '({})'.format(' {} '.format(self.symbol).join(repr(term) for term in self.terms))
+
+
+class Or(And):
+    """Matches if any of terms match."""
+    symbol = '|'
+    keyword = 'or'
+
+
+class Not(Expression):
+    """Matches if term does not."""
+
+    def __init__(self, term):
+        if not isinstance(term, Expression):
+            raise TypeError('expected an expression, got {!r}'.format(term))
+        self.term = term
+
+    def source(self, compiler):
+        return '(not {})'.format(self.term.source(compiler))
+
+    def __repr__(self):
+        return '~{!r}'.format(self.term)
+
+
+class _Compiler(object):
+    """Names the values and field getters used by the source of a predicate."""
+
+    def __init__(self):
+        self.namespace = {}
+
+    def _bind(self, prefix, value):
+        name = '{}{}'.format(prefix, len(self.namespace))
+        self.namespace[name] = value
+        return name
+
+    def value(self, value):
+        return self._bind('v', value)
+
+    def field(self, descriptor):
+        if type(descriptor).__get__ is Generic.__get__:
+            return 'fields[{!r}]'.format(descriptor.name)
+        # e.g. Choice storing codes gives back the value
+        return '{}(obj)'.format(self._bind('get', descriptor.__get__))
+
+
+class _Plan(object):
+    """
+    A lookup giving the instances which may match.  rank orders plans from
+    the cheapest: equality, IN, ranges bounded on both sides, then the rest.
+    """
+
+    def __init__(self, rank, lookup, description):
+        self.rank = rank
+        self.lookup = lookup
+        self.description = description
+
+
+def _plan_comparison(collection, term):
+    index = collection.index(term.field)
+    if index is None:
+        return None
+    if term.op == '==':
+        return _Plan(0, lambda: index.get(term.value), repr(term))
+    if term.op == 'in' and isinstance(term.value, frozenset):
+        return _Plan(1, lambda: [obj for value in term.value for obj in index.get(value)],
+                     repr(term))
+    if term.op in _RANGES and isinstance(index, SortedIndex):
+        bounds = term.bounds()
+        rank = 2 if None not in bounds[:2] else 3
+        return _Plan(rank, lambda: index.between(*bounds), repr(term))
+    return None
+
+
+def _plan_range(collection, field, terms):
+    # one lower and one upper bound from the range comparisons on field
+    index = collection.index(field)
+    if not isinstance(index, SortedIndex):
+        return None
+    low = high = None
+    for term in terms:
+        bounds = term.bounds()
+        if low is None and bounds[0] is not None:
+            low = term, bounds
+        if high is None and bounds[1] is not None:
+            high = term, bounds
+    if low is None or high is None or low[0] is high[0]:
+        return None
+
+    def lookup():
+        return index.between(low[1][0], high[1][1], low[1][2], high[1][3])
+    return _Plan(2, lookup, '{!r} & {!r}'.format(low[0], high[0]))
+
+
+def _plan(collection, expression):
+    """Return the cheapest _Plan for expression, or None to scan."""
+    if isinstance(expression, Comparison):
+        return _plan_comparison(collection, expression)
+    if isinstance(expression, Or):
+        plans = [_plan(collection, term) for term in expression.terms]
+        if None in plans:
+            return None
+
+        def lookup():
+            found = {}
+            for plan in plans:
+                for obj in plan.lookup():
+                    found[id(obj)] = obj
+            return list(found.values())
+        return _Plan(
+            max(plan.rank for plan in plans), lookup,
+            ' | '.join(plan.description for plan in plans)
+        )
+    if isinstance(expression, And):
+        plans = [_plan(collection, term) for term in expression.terms]
+        ranges = {}
+        for term in expression.terms:
+            if isinstance(term, Comparison) and term.op in _RANGES:
+                ranges.setdefault(term.field, []).append(term)
+        plans.extend(_plan_range(collection, field, terms) for field, terms in ranges.items())
+        plans = [plan for plan in plans if plan is not None]
+        if plans:
+            return min(plans, key=lambda plan: plan.rank)
+    return None
+
+
+def explain(source, where):
+    """Describe how `select` would find the instances of source matching where."""
+    if isinstance(source, ObjectCollection):
+        plan = _plan(source, where)
+        if plan is not None:
+            return 'index: {}'.format(plan.description)
+    return 'scan'
+
+
+def select(source, where):
+    """
+    Return the instances in source, an iterable or an ObjectCollection,
+    matching the expression where.  The instances of a collection are not
+    in any particular order.
+    """
+    predicate = where.compile()
+    if isinstance(source, ObjectCollection):
+        plan = _plan(source, where)
+        if plan is not None:
+            # the index may only cover part of the expression
+            source = plan.lookup()
+    return [obj for obj in source if predicate(obj)]
+
+
+__all__ = ['And', 'Comparison', 'Expression', 'Not', 'Or', 'explain', 'select']
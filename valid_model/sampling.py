@@ -0,0 +1,124 @@
+"""
+Validate a sample of a high volume stream of trusted records.
+
+When records come from producers which are trusted to send valid data,
+validating every one of them can cost more than it finds.  A `Sampler` fully
+validates a fraction of the records, or every Nth one, and builds the rest
+with `Object.construct`, which stores values without running descriptors.
+It counts failures per field, and once a record fails every record is
+validated until `boost` records in a row have passed.
+
+    sampler = Sampler(Reading, rate=0.01)
+    for doc in stream:
+        store(sampler.build(doc))
+    sampler.failure_rates()  # {'temperature': 0.002}
+
+A Sampler keeps counters without locking, so use one per thread.
+"""
+import random
+
+from .exc import ErrorReport, ValidationError
+
+
+class Sampler(object):
+    """
+    Build or validate instances of model, fully validating only a sample.
+
+    rate: the fraction of records to validate, chosen at random.
+    every: validate every Nth record instead, starting with the first.
+    boost: how many records to validate after a failure before sampling
+           again.
+    """
+
+    def __init__(self, model, rate=None, every=None, boost=1000, seed=None):
+        if (rate is None) == (every is None):
+            raise ValueError('give one of rate or every')
+        if rate is not None and not 0 <= rate <= 1:
+            raise ValueError('rate must be between 0 and 1')
+        if every is not None and every < 1:
+            raise ValueError('every must be at least 1')
+        self.model = model
+        self.rate = rate
+        self.every = every
+        self.boost = boost
+        self._random = random.Random(seed).random
+        # records seen, validated and failed
+        self.seen = 0
+        self.checked = 0
+        self.failed = 0
+        self.field_failures = {}
+        # records left to validate after the last failure
+        self.boosted = 0
+
+    def sampled(self):
+        """Count a record and return whether it should be validated."""
+        seen = self.seen
+        self.seen = seen + 1
+        if self.boosted:
+            self.boosted -= 1
+            return True
+        if self.every is not None:
+            return seen % self.every == 0
+        return self._random() < self.rate
+
+    def _failure(self, fields):
+        self.failed += 1
+        field_failures = self.field_failures
+        for field in fields:
+            field_failures[field] = field_failures.get(field, 0) + 1
+        self.boosted = self.boost
+
+    def build(self, doc):
+        """
+        Create an instance from a dict, validating it if it is sampled.
+
+        A ValidationError is raised for sampled records which are invalid,
+        after counting every field which failed.
+        """
+        if not self.sampled():
+            return self.model.construct(doc)
+        self.checked += 1
+        try:
+            return self.model(**doc)
+        except ValidationError:
+            # find every field that failed, not just the first
+            errors = ErrorReport()
+            self.model.load(doc, errors)
+            self._failure(set(error.path[0] for error in errors if error.path))
+            if not errors:
+                raise
+            errors.raise_first()
+
+    def build_many(self, docs):
+        """Build an instance from each dict in docs."""
+        build = self.build
+        for doc in docs:
+            yield build(doc)
+
+    def validate(self, obj):
+        """Call obj.validate() if it is sampled."""
+        if not self.sampled():
+            return
+        self.checked += 1
+        try:
+            obj.validate()
+        except ValidationError as ex:
+            self._failure(ex.path[:1])
+            raise
+
+    def failure_rates(self):
+        """Map each field which has failed to the fraction of validated records it failed in."""
+        checked = self.checked
+        return dict(
+            (field, float(failures) / checked)
+            for field, failures in self.field_failures.items()
+        )
+
+    def __repr__(self):
+        return 'Sampler({}, {} of {} validated, {} failed{})'.format(
+            self.model.__name__, self.checked, self.seen, self.failed,
+            ', boosted' if self.boosted else ''
+        )
+
+
+__all__ = ['Sampler']
@@ -0,0 +1,117 @@
+"""
+Hand batches of validated instances between processes.
+
+A worker packs the field values of a batch of instances of one model into a
+shared memory block and sends the small `SharedBatch` handle over a queue or
+pipe.  The rows are serialized together as plain tuples in field order so no
+per-row class references or `_fields` dicts are written, and the receiving
+process rebuilds the instances without running any descriptor when the batch
+is marked as validated.
+
+    # worker
+    queue.put(SharedBatch.pack(objects))
+
+    # parent
+    objects = queue.get().unpack()
+
+Shared memory requires Python 3.8+.
+"""
+import pickle
+
+from .base import restore, revalidate
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # pragma: no cover
+    shared_memory = None
+
+
+class SharedBatch(object):
+    """Handle to a batch of model instances stored in shared memory."""
+
+    def __init__(self, model, name, size, count, field_order, validated=True):
+        self.model = model
+        self.name = name
+        self.size = size
+        self.count = count
+        self.field_order = tuple(field_order)
+        self.validated = validated
+
+    def __len__(self):
+        return self.count
+
+    def __repr__(self):
+        return 'SharedBatch({}, {!r}, {} rows, validated={!r})'.format(
+            self.model.__name__, self.name, self.count, self.validated
+        )
+
+    @staticmethod
+    def _shared_memory():
+        if shared_memory is None:
+            raise RuntimeError('SharedBatch requires multiprocessing.shared_memory')
+        return shared_memory
+
+    @classmethod
+    def pack(cls, objects, model=None, validated=True):
+        """
+        Copy objects into a new shared memory block.
+
+        All objects must be instances of the same model.  `validated` tells the
+        receiver whether the rows may be rebuilt without validation.
+        """
+        objects = list(objects)
+        if model is None:
+            if not objects:
+                raise ValueError('model is required to pack an empty batch')
+            model = objects[0].__class__
+        field_order = model._field_order
+        rows = []
+        for obj in objects:
+            if obj.__class__ is not model:
+                raise TypeError('expected an instance of {}'.format(model.__name__))
+            fields = obj._fields
+            rows.append(tuple([fields[name] for name in field_order]))
+
+        payload = pickle.dumps(rows, pickle.HIGHEST_PROTOCOL)
+        block = cls._shared_memory().SharedMemory(create=True, size=max(len(payload), 1))
+        try:
+            block.buf[:len(payload)] = payload
+        finally:
+            block.close()
+        return cls(model, block.name, len(payload), len(rows), field_order, validated)
+
+    def rows(self, release=True):
+        """Return the field value tuples, freeing the block unless release is False."""
+        block = self._shared_memory().SharedMemory(name=self.name)
+        view = block.buf[:self.size]
+        try:
+            rows = pickle.loads(view)
+        finally:
+            view.release()
+            block.close()
+            if release:
+                block.unlink()
+        return rows
+
+    def unpack(self, release=True):
+        """
+        Rebuild the instances in the batch.
+
+        Rows are trusted when the batch was packed as validated and the model
+        still has the same fields; otherwise every row is validated again.
+        """
+        model = self.model
+        rows = self.rows(release)
+        if self.validated and model._field_order == self.field_order:
+            return [restore(model, row) for row in rows]
+        field_order = self.field_order
+        return [revalidate(model, field_order, row) for row in rows]
+
+    def release(self):
+        """Free the shared memory block without reading it."""
+        block = self._shared_memory().SharedMemory(name=self.name)
+        block.close()
+        block.unlink()
+
+
+__all__ = ['SharedBatch']
@@ -1,5 +1,30 @@
 from __future__ import unicode_literals
 
+import re
+from datetime import datetime, timedelta, tzinfo
+
+try:
+    from functools import lru_cache
+except ImportError:  # pragma: no cover
+    def lru_cache(maxsize=128):
+        """Bounded memoization of a function of positional arguments for Python 2."""
+        def decorator(func):
+            cache = {}
+
+            def wrapper(*args):
+                try:
+                    return cache[args]
+                except KeyError:
+                    pass
+                if len(cache) >= maxsize:
+                    cache.clear()
+                value = cache[args] = func(*args)
+                return value
+            wrapper.cache_clear = cache.clear
+            return wrapper
+        return decorator
+
+
 def is_descriptor(obj):
     return all((
         hasattr(obj, 'name'),
@@ -7,3 +32,109 @@ def is_descriptor(obj):
         hasattr(obj, '__get__'),
         hasattr(obj, '__set__')
     ))
+
+
+EPOCH = datetime(1970, 1, 1)
+
+_ISO_DATETIME = re.compile(
+    r'(\d{4})-(\d\d)-(\d\d)'
+    r'(?:[T ](\d\d):(\d\d)(?::(\d\d)(?:[.,](\d{1,6})\d*)?)?)?'
+    r'(Z|[+-]\d\d(?::?\d\d)?)?$'
+)
+_ISO_DURATION = re.compile(
+    r'(-)?P(?:(\d+(?:\.\d+)?)W)?(?:(\d+(?:\.\d+)?)D)?'
+    r'(?:T(?:(\d+(?:\.\d+)?)H)?(?:(\d+(?:\.\d+)?)M)?(?:(\d+(?:\.\d+)?)S)?)?$'
+)
+
+
+class _Offset(tzinfo):
+    """Fixed UTC offset, for Python 2 which has no datetime.timezone."""
+
+    def __init__(self, offset):
+        self._offset = offset
+
+    def utcoffset(self, dt):
+        return self._offset
+
+    def dst(self, dt):
+        return timedelta(0)
+
+
+def _naive_utc(value):
+    offset = value.utcoffset()
+    if offset is None:
+        return value
+    return value.replace(tzinfo=None) - offset
+
+
+@lru_cache(maxsize=4096)
+def parse_iso_datetime(value):
+    """
+    Parse an ISO-8601 date or date and time.
+
+    Times with a UTC offset are converted to naive UTC datetimes, matching
+    `datetime.utcnow` and epoch timestamps.  Raises ValueError if value is not
+    ISO-8601.  Results are cached as feeds tend to repeat the same timestamps.
+    """
+    try:
+        return _naive_utc(datetime.fromisoformat(value))
+    except (AttributeError, ValueError):
+        # Python < 3.11 does not accept Z or every ISO-8601 variant
+        pass
+    match = _ISO_DATETIME.match(value)
+    if match is None:
+        raise ValueError('{!r} is not an ISO-8601 datetime'.format(value))
+    year, month, day, hour, minute, second, fraction, zone = match.groups()
+    parsed = datetime(
+        int(year), int(month), int(day), int(hour or 0), int(minute or 0),
+        int(second or 0), int((fraction or '0').ljust(6, '0'))
+    )
+    if zone and zone != 'Z':
+        zone = zone.replace(':', '')
+        minutes = int(zone[1:3]) * 60 + int(zone[3:5] or 0)
+        if zone[0] == '-':
+            minutes = -minutes
+        parsed = _naive_utc(parsed.replace(tzinfo=_Offset(timedelta(minutes=minutes))))
+    return parsed
+
+
+@lru_cache(maxsize=1024)
+def parse_iso_duration(value):
+    """
+    Parse an ISO-8601 duration of weeks, days, hours, minutes and seconds.
+
+    Years and months have no fixed length and are rejected.  Raises
+    ValueError if value is not such a duration.
+    """
+    match = _ISO_DURATION.match(value)
+    if match is None or value.rstrip('-').endswith(('P', 'T')):
+        raise ValueError('{!r} is not an ISO-8601 duration'.format(value))
+    sign, weeks, days, hours, minutes, seconds = match.groups()
+    duration = timedelta(
+        weeks=float(weeks or 0), days=float(days or 0), hours=float(hours or 0),
+        minutes=float(minutes or 0), seconds=float(seconds or 0)
+    )
+    return -duration if sign else duration
+
+
+def format_iso_duration(value):
+    """Format a timedelta as an ISO-8601 duration, e.g. P1DT2H3M4.5S."""
+    sign = ''
+    if value < timedelta(0):
+        sign, value = '-', -value
+    minutes, seconds = divmod(value.seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    parts = [sign, 'P']
+    if value.days:
+        parts.append('{}D'.format(value.days))
+    if hours or minutes or seconds or value.microseconds or not value.days:
+        parts.append('T')
+        if hours:
+            parts.append('{}H'.format(hours))
+        if minutes:
+            parts.append('{}M'.format(minutes))
+        if value.microseconds:
+            parts.append('{}.{:06d}'.format(seconds, value.microseconds).rstrip('0') + 'S')
+        elif seconds or not (hours or minutes):
+            parts.append('{}S'.format(seconds))
+    return ''.join(parts)
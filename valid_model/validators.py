@@ -13,7 +13,30 @@ any_of(gte(100), lt(20))
 
 # isinstance(x, dict) and (not x or x in ['a', 'b', 'c'])
 all_of(is_instance(dict), any_of(falsey, is_in(['a', 'b', 'c'])))
+
+The string validators, `matches`, `search`, `length_between`, `min_length`,
+`max_length`, `startswith` and `endswith`, are objects exposing what they
+check.  Patterns are compiled once and shared through a bounded cache, and
+`any_of`/`all_of` flatten nested combinators and merge what they can, e.g.
+any_of(startswith('a'), startswith('b')) is a single startswith(('a', 'b')).
+Passing adaptive=True to either learns which order to try the validators in
+from the values seen.
 """
+import re
+import time
+
+from ._compat import string_types
+from .utils import lru_cache
+
+_timer = getattr(time, 'perf_counter', time.time)
+
+
+_compile = lru_cache(maxsize=512)(re.compile)
+
+
+def compile_pattern(pattern, flags=0):
+    """re.compile shared by every validator using the same pattern."""
+    return _compile(pattern, flags)
 
 
 def truthy(value):
@@ -76,9 +99,318 @@ def is_not_in(value):
     return lambda x: x not in value
 
 
-def any_of(value):
-    return lambda x: any(v(x) for v in value)
+class Pattern(object):
+    """Validates strings against `regex` using its match, fullmatch or search method."""
+
+    def __init__(self, regex, method='match'):
+        self.regex = regex
+        self.method = method
+        self._test = getattr(regex, method)
+
+    def __call__(self, value):
+        return isinstance(value, string_types) and self._test(value) is not None
+
+    def __repr__(self):
+        return 'Pattern({!r}, {!r})'.format(self.regex.pattern, self.method)
+
+
+def matches(pattern, flags=0, full=False):
+    """Validate that a string matches pattern at its start, or entirely if full."""
+    regex = compile_pattern(pattern, flags)
+    if full and not hasattr(regex, 'fullmatch'):  # pragma: no cover
+        regex = compile_pattern('(?:{})\\Z'.format(pattern), flags)
+        full = False
+    return Pattern(regex, 'fullmatch' if full else 'match')
+
+
+def search(pattern, flags=0):
+    """Validate that pattern occurs anywhere in a string."""
+    return Pattern(compile_pattern(pattern, flags), 'search')
+
+
+class Length(object):
+    """Validates that len(value) is between `min` and `max`, inclusive."""
+
+    def __init__(self, min=None, max=None):  # pylint: disable=W0622
+        self.min = min
+        self.max = max
+
+    def __call__(self, value):
+        try:
+            length = len(value)
+        except TypeError:
+            return False
+        return (self.min is None or length >= self.min) and \
+            (self.max is None or length <= self.max)
+
+    def __repr__(self):
+        return 'Length({!r}, {!r})'.format(self.min, self.max)
+
+
+def length_between(lo, hi):
+    return Length(lo, hi)
+
+
+def min_length(value):
+    return Length(min=value)
+
+
+def max_length(value):
+    return Length(max=value)
+
+
+class Affix(object):
+    """Validates that a string starts (or ends) with one of `affixes`."""
+
+    def __init__(self, affixes, end=False):
+        if isinstance(affixes, string_types):
+            affixes = (affixes,)
+        self.affixes = tuple(affixes)
+        self.end = end
+
+    def __call__(self, value):
+        if not isinstance(value, string_types):
+            return False
+        if self.end:
+            return value.endswith(self.affixes)
+        return value.startswith(self.affixes)
+
+    def __repr__(self):
+        return '{}({!r})'.format('endswith' if self.end else 'startswith', self.affixes)
+
+
+def startswith(value):
+    return Affix(value)
 
 
-def all_of(value):
-    return lambda x: all(v(x) for v in value)
+def endswith(value):
+    return Affix(value, end=True)
+
+
+def _validators(args):
+    """Accept validators as arguments or, as before, one list of them."""
+    if len(args) == 1 and not callable(args[0]):
+        return tuple(args[0])
+    return args
+
+
+class AnyOf(object):
+    """Passes if any of `validators` does, trying them in order."""
+
+    def __init__(self, validators):
+        flat = []
+        for validator in validators:
+            if isinstance(validator, AnyOf):
+                flat.extend(validator.validators)
+            else:
+                flat.append(validator)
+        # one str.startswith/endswith call checks a tuple of affixes
+        merged = []
+        affixes = {}
+        for validator in flat:
+            if isinstance(validator, Affix):
+                if validator.end in affixes:
+                    position, found = affixes[validator.end]
+                    merged[position] = found = Affix(found.affixes + validator.affixes, found.end)
+                    affixes[validator.end] = (position, found)
+                    continue
+                affixes[validator.end] = (len(merged), validator)
+            merged.append(validator)
+        self.validators = tuple(merged)
+
+    def __call__(self, value):
+        for validator in self.validators:
+            if validator(value):
+                return True
+        return False
+
+    def __repr__(self):
+        return 'any_of({})'.format(', '.join(repr(v) for v in self.validators))
+
+
+class AllOf(object):
+    """Passes if every one of `validators` does, stopping at the first failure."""
+
+    def __init__(self, validators):
+        flat = []
+        for validator in validators:
+            if isinstance(validator, AllOf):
+                flat.extend(validator.validators)
+            else:
+                flat.append(validator)
+        # the intersection of length bounds is a single check
+        merged = []
+        length = None
+        for validator in flat:
+            if isinstance(validator, Length):
+                if length is not None:
+                    position, found = length
+                    bounds = Length(
+                        _bound(max, found.min, validator.min), _bound(min, found.max, validator.max)
+                    )
+                    merged[position] = bounds
+                    length = (position, bounds)
+                    continue
+                length = (len(merged), validator)
+            merged.append(validator)
+        self.validators = tuple(merged)
+
+    def __call__(self, value):
+        for validator in self.validators:
+            if not validator(value):
+                return False
+        return True
+
+    def __repr__(self):
+        return 'all_of({})'.format(', '.join(repr(v) for v in self.validators))
+
+
+def _bound(pick, first, second):
+    if first is None:
+        return second
+    if second is None:
+        return first
+    return pick(first, second)
+
+
+class _Adaptive(object):
+    """
+    Mixin evaluating the children of a combinator cheapest-decisive first.
+
+    Every `sample_every` calls all children are run and timed to estimate
+    each one's cost and how often it decides the result on its own (passes
+    for any_of, fails for all_of).  Every `reorder_every` calls the children
+    are sorted by cost over that probability, which minimizes the expected
+    cost of independent checks, and the statistics are halved so the order
+    follows changes in the data.  A child raising an exception while the
+    learned order is used makes the call run again in declaration order, so
+    validators guarded by an earlier check keep their meaning.  Statistics
+    are updated without a lock; races only make them less precise.
+    """
+    sample_every = 32
+    reorder_every = 1024
+    _decisive = None  # the child result which decides the combinator's
+
+    def __init__(self, validators, sample_every=None, reorder_every=None):
+        super(_Adaptive, self).__init__(validators)
+        if sample_every is not None:
+            self.sample_every = sample_every
+        if reorder_every is not None:
+            self.reorder_every = reorder_every
+        self._calls = 0
+        count = len(self.validators)
+        self._samples = [0] * count
+        self._time = [0.0] * count
+        self._decided = [0] * count
+        self._order = tuple(range(count))
+        self._ordered = self.validators
+
+    @property
+    def ordering(self):
+        """The children in the order they are currently tried."""
+        return self._ordered
+
+    def stats(self):
+        """Sampled cost (seconds) and decisive rate of each child, in declaration order."""
+        return [
+            {
+                'validator': validator,
+                'samples': samples,
+                'cost': time / samples if samples else None,
+                'decisive': decided / float(samples) if samples else None,
+            }
+            for validator, samples, time, decided in zip(
+                self.validators, self._samples, self._time, self._decided
+            )
+        ]
+
+    def reorder(self):
+        """Sort children by expected cost per decision from the samples so far."""
+        samples, time, decided = self._samples, self._time, self._decided
+
+        def cost(position):
+            if not samples[position]:
+                return (0, 0.0, position)
+            if not decided[position]:
+                return (2, time[position] / samples[position], position)
+            return (1, time[position] / decided[position], position)
+        order = tuple(sorted(range(len(self.validators)), key=cost))
+        for position in range(len(samples)):
+            samples[position] //= 2
+            time[position] /= 2
+            decided[position] //= 2
+        self._order = order
+        self._ordered = tuple(self.validators[position] for position in order)
+        return self._ordered
+
+    def _sample(self, value):
+        decisive = self._decisive
+        results = []
+        for position, validator in enumerate(self.validators):
+            start = _timer()
+            try:
+                result = bool(validator(value))
+            except Exception as ex:  # pylint: disable=W0703
+                result = ex
+            self._time[position] += _timer() - start
+            self._samples[position] += 1
+            if result is decisive:
+                self._decided[position] += 1
+            results.append(result)
+        # the result of evaluating in declaration order
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+            if result is decisive:
+                return decisive
+        return not decisive
+
+    def __call__(self, value):
+        self._calls = calls = self._calls + 1
+        if calls % self.reorder_every == 0:
+            self.reorder()
+        if calls % self.sample_every == 0:
+            return self._sample(value)
+        decisive = self._decisive
+        try:
+            for validator in self._ordered:
+                if bool(validator(value)) is decisive:
+                    return decisive
+        except Exception:  # pylint: disable=W0703
+            if self._ordered is self.validators:
+                raise
+            return super(_Adaptive, self).__call__(value)
+        return not decisive
+
+
+class AdaptiveAnyOf(_Adaptive, AnyOf):
+    _decisive = True
+
+
+class AdaptiveAllOf(_Adaptive, AllOf):
+    _decisive = False
+
+
+def _combinator(klass, adaptive_klass, validators, options):
+    adaptive = options.pop('adaptive', False)
+    if not adaptive:
+        if options:
+            raise TypeError('unexpected options {}'.format(', '.join(sorted(options))))
+        return klass(_validators(validators))
+    return adaptive_klass(_validators(validators), **options)
+
+
+def any_of(*validators, **options):
+    """
+    Passes if any validator does.  With adaptive=True the order they are
+    tried in is learned; sample_every and reorder_every tune how.
+    """
+    return _combinator(AnyOf, AdaptiveAnyOf, validators, options)
+
+
+def all_of(*validators, **options):
+    """
+    Passes if every validator does.  With adaptive=True the order they are
+    tried in is learned; sample_every and reorder_every tune how.
+    """
+    return _combinator(AllOf, AdaptiveAllOf, validators, options)